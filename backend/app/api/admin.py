@@ -3,13 +3,14 @@ Admin API endpoints for data management
 Includes endpoints for importing match data
 """
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query
-from typing import Optional
+from typing import List, Optional
+from uuid import UUID
 from pathlib import Path
 import os
 
 from app.core.security import get_current_admin_user, get_current_user
 from app.models.user import User
-from sqlmodel import Session, text
+from sqlmodel import Session, select, text
 from app.core.database import get_session, engine
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
@@ -292,7 +293,7 @@ async def import_match_data(
                 )
             else:
                 raise
-            
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -314,4 +315,104 @@ async def get_import_status(
         "status": "not_implemented",
         "message": "Import status tracking not yet implemented"
     }
+
+
+def _serialize_backtest_run(run) -> dict:
+    return {
+        "id": str(run.id),
+        "status": run.status,
+        "seasons": run.seasons,
+        "completed_seasons": run.completed_seasons,
+        "model_version": run.model_version,
+        "total_fixtures": run.total_fixtures,
+        "metrics": run.metrics,
+        "error": run.error,
+        "started_at": run.started_at.isoformat() if run.started_at else None,
+        "finished_at": run.finished_at.isoformat() if run.finished_at else None,
+        "created_at": run.created_at.isoformat() if run.created_at else None,
+    }
+
+
+@router.post("/backtests")
+async def start_backtest(
+    seasons: List[str] = Query(..., description="Seasons to evaluate (e.g., '2024-2025')"),
+    workers: int = Query(1, ge=1, le=8, description="Worker processes (one season per worker)"),
+    background_tasks: BackgroundTasks = BackgroundTasks(),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """
+    Start a prediction accuracy backtest in the background.
+    Results feed /predictions/accuracy once the run completes.
+    """
+    try:
+        from app.services.backtest_service import BacktestService
+        
+        service = BacktestService(workers=workers)
+        run = service.create_run(seasons)
+        background_tasks.add_task(service.run, run.id)
+        return {
+            "status": "started",
+            "message": f"Backtest started in background for {len(seasons)} season(s)",
+            "run": _serialize_backtest_run(run),
+        }
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to start backtest: {str(e)}"
+        )
+
+
+@router.post("/backtests/{run_id}/resume")
+async def resume_backtest(
+    run_id: UUID,
+    workers: int = Query(1, ge=1, le=8, description="Worker processes (one season per worker)"),
+    background_tasks: BackgroundTasks = BackgroundTasks(),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Resume an interrupted or failed backtest from its last completed season"""
+    from app.core.pl_database import pl_engine
+    from app.models.pl_data import BacktestRun
+    from app.services.backtest_service import BacktestService
+    
+    with Session(pl_engine) as pl_session:
+        run = pl_session.get(BacktestRun, run_id)
+        if not run:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Backtest run not found")
+        if run.status == "completed":
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Backtest run already completed")
+    
+    background_tasks.add_task(BacktestService(workers=workers).run, run_id)
+    return {"status": "started", "message": "Backtest resumed in background", "run_id": str(run_id)}
+
+
+@router.get("/backtests")
+async def list_backtests(
+    limit: int = Query(20, ge=1, le=100),
+    current_user: User = Depends(get_current_admin_user),
+):
+    """List recent backtest runs"""
+    from app.core.pl_database import pl_engine
+    from app.models.pl_data import BacktestRun
+    
+    with Session(pl_engine) as pl_session:
+        runs = pl_session.exec(
+            select(BacktestRun).order_by(BacktestRun.created_at.desc()).limit(limit)
+        ).all()
+        return {"runs": [_serialize_backtest_run(run) for run in runs]}
+
+
+@router.get("/backtests/{run_id}")
+async def get_backtest(
+    run_id: UUID,
+    current_user: User = Depends(get_current_admin_user),
+):
+    """Get status, progress and metrics of a backtest run"""
+    from app.core.pl_database import pl_engine
+    from app.models.pl_data import BacktestRun
+    
+    with Session(pl_engine) as pl_session:
+        run = pl_session.get(BacktestRun, run_id)
+        if not run:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Backtest run not found")
+        return _serialize_backtest_run(run)
 # Force update Sat Dec 27 19:39:44 GMT 2025
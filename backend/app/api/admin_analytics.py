@@ -5,9 +5,11 @@ from typing import Optional
 from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, Query
 from sqlmodel import Session, select, func
+from app.core.cache import cache
 from app.core.database import get_session
 from app.core.security import get_current_admin_user
 from app.models.user import User
+from app.services.fpl_service import fpl_service
 
 router = APIRouter(prefix="/admin/analytics", tags=["Admin - Analytics"])
 
@@ -132,6 +134,8 @@ async def get_system_health(
         "api": {
             "status": "online",
             "timestamp": datetime.utcnow().isoformat()
-        }
+        },
+        "fplCache": fpl_service.get_cache_stats(),
+        "sharedCache": cache.get_stats(),
     }
 
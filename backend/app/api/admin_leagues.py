@@ -13,6 +13,7 @@ from app.models.weekly_picks import (
     WeeklyPicksLeague,
     WeeklyPicksLeagueMember,
 )
+from app.services.weekly_picks_standings import weekly_picks_standings_service
 
 router = APIRouter(prefix="/admin/leagues", tags=["Admin - Leagues"])
 
@@ -218,6 +219,7 @@ async def delete_league(
     ).all()
     for member in members:
         session.delete(member)
+    weekly_picks_standings_service.remove_league(session, league_id)
     
     # Delete the league
     session.delete(league)
@@ -271,6 +273,8 @@ async def add_member(
         user_id=user_id,
     )
     session.add(member)
+    session.flush()
+    weekly_picks_standings_service.add_member(session, league_id, user_id)
     session.commit()
     session.refresh(member)
     
@@ -319,6 +323,7 @@ async def remove_member(
         raise HTTPException(status_code=404, detail="User is not a member of this league")
     
     session.delete(member)
+    weekly_picks_standings_service.remove_member(session, league_id, user_id)
     session.commit()
     
     # Log audit
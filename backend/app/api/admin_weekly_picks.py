@@ -14,6 +14,9 @@ from app.models.weekly_picks import (
     ScorePrediction,
     PlayerPick,
 )
+from app.services.weekly_picks_scoring import weekly_picks_scoring_service
+from app.services.weekly_picks_leaderboard import weekly_picks_leaderboard_service
+from app.services.weekly_picks_standings import weekly_picks_standings_service
 
 router = APIRouter(prefix="/admin/weekly-picks", tags=["Admin - Weekly Picks"])
 
@@ -102,6 +105,32 @@ async def list_weekly_picks(
     }
 
 
+@router.post("/score/{gameweek}")
+async def score_gameweek(
+    gameweek: int,
+    request: Request,
+    session: Session = Depends(get_session),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """Score every user's picks for a gameweek against the latest FPL results"""
+    try:
+        summary = await weekly_picks_scoring_service.score_gameweek(session, gameweek)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Scoring failed: {str(e)}")
+    
+    # Log audit
+    await create_audit_log(
+        session=session,
+        admin_user=current_user,
+        action="weekly_pick.score_gameweek",
+        resource_type="weekly_pick",
+        details={"gameweek": gameweek, **summary},
+        request=request,
+    )
+    
+    return {"message": f"Gameweek {gameweek} scored", "gameweek": gameweek, **summary}
+
+
 @router.get("/{pick_id}")
 async def get_weekly_pick(
     pick_id: int,
@@ -186,10 +215,17 @@ async def adjust_points(
     if not isinstance(new_points, int):
         raise HTTPException(status_code=400, detail="total_points must be an integer")
     
+    # Carry the change into the season standings, which are kept by deltas
     pick.total_points = new_points
     pick.updated_at = datetime.utcnow()
     session.add(pick)
+    session.flush()
+    weekly_picks_standings_service.apply_deltas(session, {pick.user_id: new_points - old_points})
     session.commit()
+    
+    # Re-rank the affected leaderboards
+    weekly_picks_leaderboard_service.rebuild(session, pick.gameweek)
+    weekly_picks_standings_service.refresh(session)
     session.refresh(pick)
     
     # Log audit
@@ -239,10 +275,18 @@ async def delete_weekly_pick(
     for pp in player_picks:
         session.delete(pp)
     
-    # Delete the pick itself
+    # Delete the pick itself, taking its points out of the standings
+    weekly_picks_leaderboard_service.remove_pick(session, pick_id)
+    removed_points = pick.total_points
     session.delete(pick)
+    session.flush()
+    weekly_picks_standings_service.apply_deltas(session, {user_id: -removed_points})
     session.commit()
     
+    # Re-rank the affected leaderboards
+    weekly_picks_leaderboard_service.rebuild(session, gameweek)
+    weekly_picks_standings_service.refresh(session)
+    
     # Log audit
     await create_audit_log(
         session=session,
@@ -49,9 +49,8 @@ async def follow_player(
     
     # Verify player exists in FPL (optional - can be removed if not needed)
     try:
-        bootstrap = await fpl_service.get_bootstrap_static()
-        player_exists = any(p.get('id') == request.player_id for p in bootstrap.get('elements', []))
-        if not player_exists:
+        snapshot = await fpl_service.get_bootstrap_snapshot()
+        if snapshot.get_player(request.player_id) is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Player not found"
@@ -133,16 +132,14 @@ async def get_followed_players_with_stats(
     
     # Get FPL bootstrap data
     try:
-        bootstrap = await fpl_service.get_bootstrap_static()
-        players = bootstrap.get('elements', [])
-        teams = bootstrap.get('teams', [])
+        snapshot = await fpl_service.get_bootstrap_snapshot()
         
         # Map followed players with their stats
         result = []
         for fp in followed_players:
-            player = next((p for p in players if p.get('id') == fp.player_id), None)
+            player = snapshot.get_player(fp.player_id)
             if player:
-                team = next((t for t in teams if t.get('id') == player.get('team')), None)
+                team = snapshot.get_team(player.get('team'))
                 result.append({
                     "followed_player_id": fp.id,
                     "player_id": fp.player_id,
@@ -91,11 +91,8 @@ def _format_fpl_fixture_to_standard(fpl_fixture: Dict[str, Any], teams_map: Dict
 
 async def _get_fpl_teams_map() -> Dict[int, Dict]:
     """Get FPL teams as a map by team ID"""
-    fpl_data = await fpl_service.get_bootstrap_static()
-    teams_map = {}
-    for team in fpl_data.get('teams', []):
-        teams_map[team['id']] = team
-    return teams_map
+    snapshot = await fpl_service.get_bootstrap_snapshot()
+    return snapshot.teams
 
 
 @router.get("/fixtures/today")
@@ -1367,8 +1364,8 @@ async def get_uk_teams():
         
         # 1. Get Premier League teams from FPL API (always available)
         print("[Football API] Fetching Premier League teams from FPL API")
-        fpl_data = await fpl_service.get_bootstrap_static()
-        for team in fpl_data.get('teams', []):
+        snapshot = await fpl_service.get_bootstrap_snapshot()
+        for team in snapshot.teams.values():
             all_teams.append({
                 'id': team['id'],  # FPL team ID
                 'name': team['name'],
@@ -1442,14 +1439,8 @@ async def get_team_news(team_id: int, limit: int = Query(10, description="Maximu
     """Get news for a specific team from RSS feeds"""
     try:
         print(f"[Football API] Fetching team news for team_id {team_id}")
-        fpl_data = await fpl_service.get_bootstrap_static()
-        
-        # Find team in FPL data
-        fpl_team = None
-        for team in fpl_data.get('teams', []):
-            if team['id'] == team_id:
-                fpl_team = team
-                break
+        snapshot = await fpl_service.get_bootstrap_snapshot()
+        fpl_team = snapshot.get_team(team_id)
         
         if not fpl_team:
             return {
@@ -1482,14 +1473,8 @@ async def get_team_news_overview(team_id: int, limit: int = Query(20, descriptio
     """Get analyzed news overview with highlights and big news for a team"""
     try:
         print(f"[Football API] Fetching news overview for team_id {team_id}")
-        fpl_data = await fpl_service.get_bootstrap_static()
-        
-        # Find team in FPL data
-        fpl_team = None
-        for team in fpl_data.get('teams', []):
-            if team['id'] == team_id:
-                fpl_team = team
-                break
+        snapshot = await fpl_service.get_bootstrap_snapshot()
+        fpl_team = snapshot.get_team(team_id)
         
         if not fpl_team:
             return {
@@ -1526,21 +1511,15 @@ async def get_team_info(team_id: int):
     """Get detailed information about a specific team using FPL API"""
     try:
         print(f"[Football API] Fetching team info from FPL API for team_id {team_id}")
-        fpl_data = await fpl_service.get_bootstrap_static()
-        
-        # Find team in FPL data
-        fpl_team = None
-        for team in fpl_data.get('teams', []):
-            if team['id'] == team_id:
-                fpl_team = team
-                break
+        snapshot = await fpl_service.get_bootstrap_snapshot()
+        fpl_team = snapshot.get_team(team_id)
         
         if not fpl_team:
             return {'error': f'Team with ID {team_id} not found in FPL data'}
         
         # Get upcoming fixtures from FPL
         fixtures = await fpl_service.get_fixtures()
-        teams_map = await _get_fpl_teams_map()
+        teams_map = snapshot.teams
         upcoming_fixtures = []
         
         for fixture in fixtures:
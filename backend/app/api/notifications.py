@@ -1,9 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
 from sqlmodel import Session, select
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional
 from datetime import datetime
-import json
 
 from app.core.database import get_session
 from app.core.security import get_current_user
@@ -11,12 +10,15 @@ from app.core.config import settings
 from app.models.user import User
 from app.models.push_subscription import PushSubscription
 from app.services.fpl_service import fpl_service
+from app.services.live_events import LiveEventEngine
+from app.services.live_stats_store import season_of
+from app.services.push_delivery import push_delivery_service
 
 router = APIRouter(prefix="/notifications", tags=["Notifications"])
 
-# In-memory storage for previous stats (resets on server restart)
-# For production, consider using Redis
-previous_stats: Dict[int, Dict[int, Dict[str, Any]]] = {}
+# Player -> subscription index for this process; last-seen live stats are
+# shared through the database (see app.services.live_stats_store)
+live_events = LiveEventEngine()
 
 
 class SubscriptionKeys(BaseModel):
@@ -202,12 +204,10 @@ async def check_for_notifications_get(
 
 async def run_notification_check(session: Session):
     """Run the actual notification check logic"""
-    global previous_stats
-    
     try:
         # Get bootstrap data for current gameweek
-        bootstrap = await fpl_service.get_bootstrap_static()
-        current_event = next((e for e in bootstrap['events'] if e['is_current']), None)
+        snapshot = await fpl_service.get_bootstrap_snapshot()
+        current_event = snapshot.current_event
         
         if not current_event:
             print(f"[{datetime.utcnow()}] No current gameweek")
@@ -221,163 +221,32 @@ async def run_notification_check(session: Session):
         except Exception as e:
             print(f"[{datetime.utcnow()}] Failed to fetch live data: {e}")
             return
-            
-        live_elements = {e['id']: e for e in live_data.get('elements', [])}
-        players_info = {p['id']: p for p in bootstrap.get('elements', [])}
-        teams_info = {t['id']: t for t in bootstrap.get('teams', [])}
-        
-        # Get all active subscriptions
-        subscriptions = session.exec(
-            select(PushSubscription).where(PushSubscription.is_active == True)
-        ).all()
         
-        print(f"[{datetime.utcnow()}] Checking {len(subscriptions)} subscriptions for GW{gameweek}")
-        
-        for subscription in subscriptions:
-            try:
-                await check_user_notifications(
-                    session,
-                    subscription,
-                    gameweek,
-                    live_elements,
-                    players_info,
-                    teams_info
-                )
-            except Exception as e:
-                print(f"[{datetime.utcnow()}] Error for user {subscription.user_id}: {e}")
-                
-    except Exception as e:
-        print(f"[{datetime.utcnow()}] Notification check error: {e}")
-
-
-async def check_user_notifications(
-    session: Session,
-    subscription: PushSubscription,
-    gameweek: int,
-    live_elements: Dict[int, Any],
-    players_info: Dict[int, Any],
-    teams_info: Dict[int, Any]
-):
-    """Check for notifications for a specific user"""
-    global previous_stats
-    
-    # Get user's FPL team ID
-    user = session.exec(select(User).where(User.id == subscription.user_id)).first()
-    if not user or not user.fpl_team_id:
-        return
-    
-    # Get user's picks
-    try:
-        picks_data = await fpl_service.get_user_picks(user.fpl_team_id, gameweek)
-        picks = picks_data.get('picks', [])
-    except:
-        return
-    
-    user_id = user.id
-    if user_id not in previous_stats:
-        previous_stats[user_id] = {}
-    
-    notifications = []
-    
-    for pick in picks:
-        player_id = pick['element']
-        live_stats = live_elements.get(player_id, {}).get('stats', {})
-        player_info = players_info.get(player_id, {})
-        team_info = teams_info.get(player_info.get('team', 0), {})
+        live_elements = {e['id']: e for e in live_data.get('elements', [])}
         
-        player_name = player_info.get('web_name', 'Unknown')
-        team_name = team_info.get('short_name', 'UNK')
+        # Diff the feed once, at player level, against the shared snapshot
+        season = season_of(current_event)
+        live_events.start_gameweek(season, gameweek)
+        events = live_events.diff(session, season, gameweek, live_elements, snapshot.players, snapshot.teams)
         
-        current = {
-            'goals': live_stats.get('goals_scored', 0),
-            'assists': live_stats.get('assists', 0),
-            'yellow_cards': live_stats.get('yellow_cards', 0),
-            'red_cards': live_stats.get('red_cards', 0),
-            'bonus': live_stats.get('bonus', 0),
-            'minutes': live_stats.get('minutes', 0),
+        # Get all active subscriptions
+        subscriptions = {
+            s.id: s for s in session.exec(
+                select(PushSubscription).where(PushSubscription.is_active == True)
+            ).all()
         }
         
-        prev = previous_stats[user_id].get(player_id, {})
+        print(f"[{datetime.utcnow()}] Checking {len(subscriptions)} subscriptions for GW{gameweek}")
         
-        if prev:
-            # Goals
-            if current['goals'] > prev.get('goals', 0) and subscription.notify_goals:
-                notifications.append({
-                    'title': f"⚽ GOAL! {player_name}",
-                    'body': f"{player_name} scored for {team_name}!",
-                })
-            
-            # Assists  
-            if current['assists'] > prev.get('assists', 0) and subscription.notify_assists:
-                notifications.append({
-                    'title': f"🅰️ ASSIST! {player_name}",
-                    'body': f"{player_name} assist for {team_name}!",
-                })
-            
-            # Yellow cards
-            if current['yellow_cards'] > prev.get('yellow_cards', 0) and subscription.notify_yellow_cards:
-                notifications.append({
-                    'title': f"🟨 Yellow: {player_name}",
-                    'body': f"{player_name} booked",
-                })
-            
-            # Red cards
-            if current['red_cards'] > prev.get('red_cards', 0) and subscription.notify_red_cards:
-                notifications.append({
-                    'title': f"🟥 RED! {player_name}",
-                    'body': f"{player_name} sent off!",
-                })
-            
-            # Substitution
-            if (subscription.notify_substitutions and
-                prev.get('minutes', 0) > 0 and
-                prev.get('minutes', 0) < 90 and
-                current['minutes'] == prev.get('minutes') and
-                current['red_cards'] == 0 and
-                not prev.get('subbed')):
-                current['subbed'] = True
-                notifications.append({
-                    'title': f"🔄 Sub: {player_name}",
-                    'body': f"{player_name} off at {current['minutes']}'",
-                })
+        # Index picks only for subscriptions new this gameweek
+        await live_events.refresh_index(session, subscriptions, gameweek)
         
-        previous_stats[user_id][player_id] = current
+        # Sent concurrently on the delivery pool; logs are written in batches
+        await push_delivery_service.deliver(session, [
+            (subscriptions[subscription_id], notif)
+            for subscription_id, notifications in live_events.fan_out(events, subscriptions).items()
+            for notif in notifications
+        ])
     
-    # Send notifications
-    for notif in notifications:
-        await send_push(subscription, notif['title'], notif['body'])
-
-
-async def send_push(subscription: PushSubscription, title: str, body: str):
-    """Send a push notification"""
-    try:
-        from pywebpush import webpush, WebPushException
-        
-        if not settings.VAPID_PRIVATE_KEY:
-            print(f"[{datetime.utcnow()}] VAPID not configured")
-            return
-        
-        payload = json.dumps({
-            'title': title,
-            'body': body,
-            'icon': '/icon-192.png',
-            'badge': '/icon-192.png',
-        })
-        
-        webpush(
-            subscription_info={
-                'endpoint': subscription.endpoint,
-                'keys': {
-                    'p256dh': subscription.p256dh_key,
-                    'auth': subscription.auth_key,
-                }
-            },
-            data=payload,
-            vapid_private_key=settings.VAPID_PRIVATE_KEY,
-            vapid_claims={"sub": f"mailto:{settings.VAPID_EMAIL}"}
-        )
-        
-        print(f"[{datetime.utcnow()}] Sent: {title}")
-        
     except Exception as e:
-        print(f"[{datetime.utcnow()}] Push failed: {e}")
+        print(f"[{datetime.utcnow()}] Notification check error: {e}")
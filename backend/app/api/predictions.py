@@ -4,14 +4,16 @@ Provides AI-powered match score and goal scorer predictions
 """
 from fastapi import APIRouter, Query, HTTPException, status, Depends
 from typing import Optional, List, Dict, Any
-from datetime import datetime, date, timedelta
+from datetime import datetime
 from sqlmodel import Session, select, func, and_, or_
+from sqlalchemy.orm import aliased
 from uuid import UUID
 
 from app.core.pl_database import get_pl_session
-from app.models.pl_data import Match, Team, Player
+from app.models.pl_data import Match, Team, Player, BacktestResult
 from app.services.fpl_service import fpl_service
 from app.services.prediction_service import PredictionService
+from app.services.backtest_service import BacktestService, summarize_metrics
 
 router = APIRouter(prefix="/predictions", tags=["Predictions"])
 
@@ -32,6 +34,15 @@ def _get_db_team_from_fpl_id(fpl_team_id: int, session: Session) -> Optional[Tea
     return session.exec(statement).first()
 
 
+def _get_db_teams_by_fpl_ids(fpl_team_ids, session: Session) -> Dict[int, Team]:
+    """Get database teams for several FPL team IDs in one query"""
+    fbref_ids = {f"fpl_{fpl_id}": fpl_id for fpl_id in fpl_team_ids}
+    if not fbref_ids:
+        return {}
+    statement = select(Team).where(Team.fbref_id.in_(list(fbref_ids)))
+    return {fbref_ids[team.fbref_id]: team for team in session.exec(statement).all()}
+
+
 def _get_db_team_from_name(team_name: str, session: Session) -> Optional[Team]:
     """Get database team from team name"""
     statement = select(Team).where(Team.name == team_name)
@@ -67,8 +78,8 @@ async def get_fixtures_with_predictions(
             fpl_fixtures = await fpl_service.get_fixtures()
         
         # Get teams map
-        bootstrap = await fpl_service.get_bootstrap_static()
-        teams_map = {team['id']: team for team in bootstrap.get('teams', [])}
+        snapshot = await fpl_service.get_bootstrap_snapshot()
+        teams_map = snapshot.teams
         
         # Filter fixtures
         filtered_fixtures = []
@@ -99,81 +110,81 @@ async def get_fixtures_with_predictions(
                     # Only include future fixtures for predictions
                     if fixture_date < today:
                         continue
-                        
+                
                 except:
                     pass
             
             filtered_fixtures.append(fpl_fixture)
         
-        # Generate predictions
-        predictions = []
-        prediction_service = PredictionService(session)
-        
+        # Resolve database teams for all fixtures at once
+        fpl_team_ids = set()
+        for fpl_fixture in filtered_fixtures:
+            fpl_team_ids.update(t for t in (fpl_fixture.get('team_h'), fpl_fixture.get('team_a')) if t)
+        db_teams = _get_db_teams_by_fpl_ids(fpl_team_ids, session)
+        for fpl_id in fpl_team_ids - db_teams.keys():
+            # Try by name as fallback
+            db_team = _get_db_team_from_name(teams_map.get(fpl_id, {}).get('name', ''), session)
+            if db_team:
+                db_teams[fpl_id] = db_team
+        
+        batch = []  # (fpl_fixture, kickoff_time, fixture_date)
+        batch_inputs = []
         for fpl_fixture in filtered_fixtures:
+            home_team = db_teams.get(fpl_fixture.get('team_h'))
+            away_team = db_teams.get(fpl_fixture.get('team_a'))
+            if not home_team or not away_team:
+                continue
+            
+            # Get fixture date
+            kickoff_time = fpl_fixture.get('kickoff_time')
             try:
-                home_fpl_id = fpl_fixture.get('team_h')
-                away_fpl_id = fpl_fixture.get('team_a')
-                
-                if not home_fpl_id or not away_fpl_id:
-                    continue
-                
-                # Get database teams
-                home_team = _get_db_team_from_fpl_id(home_fpl_id, session)
-                away_team = _get_db_team_from_fpl_id(away_fpl_id, session)
-                
-                if not home_team or not away_team:
-                    # Try by name as fallback
-                    home_name = teams_map.get(home_fpl_id, {}).get('name', '')
-                    away_name = teams_map.get(away_fpl_id, {}).get('name', '')
-                    home_team = _get_db_team_from_name(home_name, session)
-                    away_team = _get_db_team_from_name(away_name, session)
-                
-                if not home_team or not away_team:
-                    continue
-                
-                # Get fixture date
-                kickoff_time = fpl_fixture.get('kickoff_time')
-                if kickoff_time:
-                    fixture_date = datetime.fromisoformat(kickoff_time.replace('Z', '+00:00')).date()
-                else:
-                    fixture_date = today
-                
-                # Generate prediction (async method)
-                prediction = await prediction_service.predict_match_score(
-                    str(home_team.id),
-                    str(away_team.id),
-                    season,
-                    fixture_date
-                )
-                
-                # Get actual result if match is finished
-                actual_result = None
-                if fpl_fixture.get('finished'):
-                    actual_result = {
-                        'homeScore': fpl_fixture.get('team_h_score'),
-                        'awayScore': fpl_fixture.get('team_a_score'),
-                    }
-                
-                predictions.append({
-                    'fixture': {
-                        'id': fpl_fixture.get('id'),
-                        'homeTeam': {
-                            'id': home_fpl_id,
-                            'name': teams_map.get(home_fpl_id, {}).get('name', 'Unknown'),
-                        },
-                        'awayTeam': {
-                            'id': away_fpl_id,
-                            'name': teams_map.get(away_fpl_id, {}).get('name', 'Unknown'),
-                        },
-                        'date': kickoff_time or fixture_date.isoformat(),
-                    },
-                    'prediction': prediction,
-                    'actualResult': actual_result,
-                })
-                
-            except Exception as e:
-                print(f"Error generating prediction for fixture {fpl_fixture.get('id')}: {e}")
+                fixture_date = datetime.fromisoformat(kickoff_time.replace('Z', '+00:00')).date() if kickoff_time else today
+            except ValueError:
+                fixture_date = today
+            
+            batch.append((fpl_fixture, kickoff_time, fixture_date))
+            batch_inputs.append({
+                'home_team_id': str(home_team.id),
+                'away_team_id': str(away_team.id),
+                'match_date': fixture_date,
+            })
+        
+        # Generate all predictions in one batch (shared Elo/form/H2H data)
+        prediction_service = PredictionService(session)
+        batch_predictions = await prediction_service.predict_gameweek(batch_inputs, season)
+        
+        predictions = []
+        for (fpl_fixture, kickoff_time, fixture_date), prediction in zip(batch, batch_predictions):
+            if prediction is None:
                 continue
+            
+            home_fpl_id = fpl_fixture.get('team_h')
+            away_fpl_id = fpl_fixture.get('team_a')
+            
+            # Get actual result if match is finished
+            actual_result = None
+            if fpl_fixture.get('finished'):
+                actual_result = {
+                    'homeScore': fpl_fixture.get('team_h_score'),
+                    'awayScore': fpl_fixture.get('team_a_score'),
+                }
+            
+            predictions.append({
+                'fixture': {
+                    'id': fpl_fixture.get('id'),
+                    'homeTeam': {
+                        'id': home_fpl_id,
+                        'name': teams_map.get(home_fpl_id, {}).get('name', 'Unknown'),
+                    },
+                    'awayTeam': {
+                        'id': away_fpl_id,
+                        'name': teams_map.get(away_fpl_id, {}).get('name', 'Unknown'),
+                    },
+                    'date': kickoff_time or fixture_date.isoformat(),
+                },
+                'prediction': prediction,
+                'actualResult': actual_result,
+            })
         
         return {
             "predictions": predictions,
@@ -212,8 +223,8 @@ async def get_match_prediction(
             )
         
         # Get teams
-        bootstrap = await fpl_service.get_bootstrap_static()
-        teams_map = {team['id']: team for team in bootstrap.get('teams', [])}
+        snapshot = await fpl_service.get_bootstrap_snapshot()
+        teams_map = snapshot.teams
         
         home_fpl_id = fpl_fixture.get('team_h')
         away_fpl_id = fpl_fixture.get('team_a')
@@ -320,6 +331,94 @@ async def get_match_prediction(
         )
 
 
+@router.get("/goal-scorers")
+async def get_gameweek_goal_scorer_predictions(
+    gameweek: Optional[int] = Query(None, description="Gameweek (defaults to the next gameweek)"),
+    session: Session = Depends(get_pl_session),
+) -> Dict[str, Any]:
+    """
+    Get predicted goal scorers for every fixture in a gameweek
+    """
+    try:
+        snapshot = await fpl_service.get_bootstrap_snapshot()
+        teams_map = snapshot.teams
+        
+        if not gameweek:
+            next_event = snapshot.next_event or snapshot.current_event
+            gameweek = next_event.get('id') if next_event else None
+        if not gameweek:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="No upcoming gameweek"
+            )
+        
+        fpl_fixtures = await fpl_service.get_gameweek_fixtures(gameweek)
+        
+        # Get season
+        now = datetime.now()
+        if now.month >= 8:
+            season = f"{now.year}-{now.year + 1}"
+        else:
+            season = f"{now.year - 1}-{now.year}"
+        
+        # Resolve database teams for all fixtures at once
+        fpl_team_ids = set()
+        for fpl_fixture in fpl_fixtures:
+            fpl_team_ids.update(t for t in (fpl_fixture.get('team_h'), fpl_fixture.get('team_a')) if t)
+        db_teams = _get_db_teams_by_fpl_ids(fpl_team_ids, session)
+        for fpl_id in fpl_team_ids - db_teams.keys():
+            db_team = _get_db_team_from_name(teams_map.get(fpl_id, {}).get('name', ''), session)
+            if db_team:
+                db_teams[fpl_id] = db_team
+        
+        batch = []
+        batch_inputs = []
+        for fpl_fixture in fpl_fixtures:
+            home_team = db_teams.get(fpl_fixture.get('team_h'))
+            away_team = db_teams.get(fpl_fixture.get('team_a'))
+            if not home_team or not away_team:
+                continue
+            
+            kickoff_time = fpl_fixture.get('kickoff_time')
+            try:
+                fixture_date = datetime.fromisoformat(kickoff_time.replace('Z', '+00:00')).date() if kickoff_time else now.date()
+            except ValueError:
+                fixture_date = now.date()
+            
+            batch.append(fpl_fixture)
+            batch_inputs.append({
+                'home_team_id': str(home_team.id),
+                'away_team_id': str(away_team.id),
+                'match_date': fixture_date,
+            })
+        
+        prediction_service = PredictionService(session)
+        batch_scorers = prediction_service.predict_goal_scorers_batch(batch_inputs, season)
+        
+        fixtures = []
+        for fpl_fixture, scorers in zip(batch, batch_scorers):
+            fixtures.append({
+                "fixture_id": fpl_fixture.get('id'),
+                "homeTeam": teams_map.get(fpl_fixture.get('team_h'), {}).get('name', 'Unknown'),
+                "awayTeam": teams_map.get(fpl_fixture.get('team_a'), {}).get('name', 'Unknown'),
+                "homeScorers": scorers.get('homeScorers', []),
+                "awayScorers": scorers.get('awayScorers', []),
+            })
+        
+        return {
+            "gameweek": gameweek,
+            "fixtures": fixtures,
+            "count": len(fixtures),
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch goal scorer predictions: {str(e)}"
+        )
+
+
 @router.get("/goal-scorers/{fixture_id}")
 async def get_goal_scorer_predictions(
     fixture_id: int,
@@ -340,8 +439,8 @@ async def get_goal_scorer_predictions(
             )
         
         # Get teams
-        bootstrap = await fpl_service.get_bootstrap_static()
-        teams_map = {team['id']: team for team in bootstrap.get('teams', [])}
+        snapshot = await fpl_service.get_bootstrap_snapshot()
+        teams_map = snapshot.teams
         
         home_fpl_id = fpl_fixture.get('team_h')
         away_fpl_id = fpl_fixture.get('team_a')
@@ -404,131 +503,60 @@ async def get_prediction_accuracy(
 ) -> Dict[str, Any]:
     """
     Get prediction accuracy metrics
+    Reads precomputed results of the latest completed backtest run
+    (scripts/run_backtest.py or POST /admin/backtests) instead of
+    re-predicting finished fixtures on every request.
     """
     try:
-        # Get finished fixtures from FPL API
-        fpl_fixtures = await fpl_service.get_fixtures()
-        finished_fixtures = [f for f in fpl_fixtures if f.get('finished')]
-        
-        # Limit to most recent
-        finished_fixtures = sorted(
-            finished_fixtures,
-            key=lambda x: x.get('kickoff_time', ''),
-            reverse=True
-        )[:limit]
-        
-        bootstrap = await fpl_service.get_bootstrap_static()
-        teams_map = {team['id']: team for team in bootstrap.get('teams', [])}
+        run = BacktestService().get_latest_completed_run(session)
+        
+        if not run:
+            return {
+                "metrics": {
+                    "overallAccuracy": 0,
+                    "exactScoreAccuracy": 0,
+                    "outcomeAccuracy": 0,
+                    "goalScorerAccuracy": 0,
+                },
+                "trend": [],
+                "recentPredictions": [],
+                "message": "No completed backtest yet",
+            }
         
-        # Calculate accuracy
-        exact_matches = 0
-        outcome_correct = 0
-        total = 0
+        home_team = aliased(Team)
+        away_team = aliased(Team)
+        rows = session.exec(
+            select(BacktestResult, home_team.name, away_team.name)
+            .join(home_team, BacktestResult.home_team_id == home_team.id)
+            .join(away_team, BacktestResult.away_team_id == away_team.id)
+            .where(BacktestResult.run_id == run.id)
+            .order_by(BacktestResult.match_date.desc())
+            .limit(limit)
+        ).all()
         
         recent_predictions = []
-        accuracy_trend = []
-        
-        prediction_service = PredictionService(session)
-        
-        for fpl_fixture in finished_fixtures:
-            try:
-                home_fpl_id = fpl_fixture.get('team_h')
-                away_fpl_id = fpl_fixture.get('team_a')
-                actual_home = fpl_fixture.get('team_h_score')
-                actual_away = fpl_fixture.get('team_a_score')
-                
-                if actual_home is None or actual_away is None:
-                    continue
-                
-                home_team = _get_db_team_from_fpl_id(home_fpl_id, session)
-                away_team = _get_db_team_from_fpl_id(away_fpl_id, session)
-                
-                if not home_team or not away_team:
-                    continue
-                
-                # Get fixture date (use kickoff time or estimate from finished status)
-                kickoff_time = fpl_fixture.get('kickoff_time')
-                if kickoff_time:
-                    fixture_date = datetime.fromisoformat(kickoff_time.replace('Z', '+00:00')).date()
-                else:
-                    # Estimate date (finished matches are in the past)
-                    fixture_date = datetime.now().date() - timedelta(days=1)
-                
-                # CRITICAL: Use date BEFORE match for prediction (simulate pre-match prediction)
-                # Subtract 1 day to ensure we're using data available before the match
-                prediction_date = fixture_date - timedelta(days=1)
-                
-                # Get season
-                if fixture_date.month >= 8:
-                    season = f"{fixture_date.year}-{fixture_date.year + 1}"
-                else:
-                    season = f"{fixture_date.year - 1}-{fixture_date.year}"
-                
-                # Generate prediction (using date BEFORE match to simulate real prediction)
-                prediction = await prediction_service.predict_match_score(
-                    str(home_team.id),
-                    str(away_team.id),
-                    season,
-                    prediction_date
-                )
-                
-                pred_home = prediction.get('predictedHomeScore', 0)
-                pred_away = prediction.get('predictedAwayScore', 0)
-                
-                # Check accuracy
-                is_exact = (pred_home == actual_home and pred_away == actual_away)
-                is_outcome_correct = (
-                    (pred_home > pred_away and actual_home > actual_away) or
-                    (pred_home < pred_away and actual_home < actual_away) or
-                    (pred_home == pred_away and actual_home == actual_away)
-                )
-                
-                if is_exact:
-                    exact_matches += 1
-                if is_outcome_correct:
-                    outcome_correct += 1
-                
-                total += 1
-                
-                # Store recent prediction
-                home_name = teams_map.get(home_fpl_id, {}).get('name', 'Unknown')
-                away_name = teams_map.get(away_fpl_id, {}).get('name', 'Unknown')
-                
-                accuracy_type = 'exact' if is_exact else ('outcome' if is_outcome_correct else 'wrong')
-                
-                recent_predictions.append({
-                    'fixture': f"{home_name} vs {away_name}",
-                    'predicted': f"{pred_home}-{pred_away}",
-                    'actual': f"{actual_home}-{actual_away}",
-                    'accuracy': accuracy_type,
-                    'date': fixture_date.isoformat(),
-                })
-                
-            except Exception as e:
-                print(f"Error calculating accuracy for fixture {fpl_fixture.get('id')}: {e}")
-                continue
+        for result, home_name, away_name in rows:
+            accuracy_type = 'exact' if result.exact else ('outcome' if result.outcome_correct else 'wrong')
+            recent_predictions.append({
+                'fixture': f"{home_name} vs {away_name}",
+                'predicted': f"{result.predicted_home}-{result.predicted_away}",
+                'actual': f"{result.actual_home}-{result.actual_away}",
+                'accuracy': accuracy_type,
+                'date': result.match_date.isoformat(),
+            })
         
-        # Calculate metrics with improved weighting
-        exact_accuracy = (exact_matches / total * 100) if total > 0 else 0
-        outcome_accuracy = (outcome_correct / total * 100) if total > 0 else 0
-        
-        # Improved overall accuracy calculation:
-        # - Exact score matches are worth 100 points
-        # - Correct outcome (but wrong score) is worth 50 points
-        # - Wrong outcome is worth 0 points
-        # This gives more weight to exact predictions while still rewarding outcome accuracy
-        if total > 0:
-            exact_score_points = exact_matches * 100
-            outcome_only_points = (outcome_correct - exact_matches) * 50
-            total_points = exact_score_points + outcome_only_points
-            overall_accuracy = (total_points / (total * 100)) * 100
-        else:
-            overall_accuracy = 0
+        # Exact score = 100 points, correct outcome only = 50, wrong = 0
+        metrics = summarize_metrics(
+            len(rows),
+            sum(1 for result, _, _ in rows if result.exact),
+            sum(1 for result, _, _ in rows if result.outcome_correct),
+            sum(result.brier for result, _, _ in rows),
+            sum(result.log_loss for result, _, _ in rows),
+        )
         
         # Generate trend (last 10 matches)
         trend_data = []
-        for i in range(min(10, len(recent_predictions))):
-            pred = recent_predictions[i]
+        for pred in recent_predictions[:10]:
             trend_data.append({
                 'date': pred['date'],
                 'accuracy': 100 if pred['accuracy'] == 'exact' else (50 if pred['accuracy'] == 'outcome' else 0),
@@ -538,13 +566,22 @@ async def get_prediction_accuracy(
         
         return {
             "metrics": {
-                "overallAccuracy": round(overall_accuracy, 1),
-                "exactScoreAccuracy": round(exact_accuracy, 1),
-                "outcomeAccuracy": round(outcome_accuracy, 1),
+                "overallAccuracy": metrics['overallAccuracy'],
+                "exactScoreAccuracy": metrics['exactScoreAccuracy'],
+                "outcomeAccuracy": metrics['outcomeAccuracy'],
                 "goalScorerAccuracy": 0,  # TODO: Implement goal scorer accuracy tracking
+                "brierScore": metrics['brierScore'],
+                "logLoss": metrics['logLoss'],
             },
             "trend": trend_data,
             "recentPredictions": recent_predictions[:10],
+            "backtest": {
+                "runId": str(run.id),
+                "seasons": run.seasons,
+                "modelVersion": run.model_version,
+                "finishedAt": run.finished_at.isoformat() if run.finished_at else None,
+                "overall": (run.metrics or {}).get('overall'),
+            },
         }
     except Exception as e:
         raise HTTPException(
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Body
+from sqlalchemy import insert, delete
 from sqlmodel import Session, select, func
 from typing import Optional, List
 from datetime import datetime, timezone
@@ -17,6 +18,15 @@ from app.models.weekly_picks import (
     WeeklyPicksLeagueMember,
 )
 from app.services.fpl_service import fpl_service
+from app.services.weekly_picks_scoring import weekly_picks_scoring_service
+from app.services.weekly_picks_leaderboard import (
+    weekly_picks_leaderboard_service,
+    OVERALL,
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+)
+from app.services.weekly_picks_standings import weekly_picks_standings_service
+from app.services.weekly_picks_repository import weekly_picks_repository
 
 router = APIRouter(prefix="/weekly-picks", tags=["Weekly Picks"])
 
@@ -44,8 +54,8 @@ class SubmitPicksRequest(BaseModel):
 async def get_valid_gameweeks():
     """Get current gameweek and valid gameweeks for submission"""
     try:
-        bootstrap = await fpl_service.get_bootstrap_static()
-        events = bootstrap.get("events", [])
+        snapshot = await fpl_service.get_bootstrap_snapshot()
+        events = snapshot.events
         
         if not events:
             return {
@@ -55,7 +65,7 @@ async def get_valid_gameweeks():
             }
         
         # Get current gameweek
-        current_event = next((e for e in events if e.get("is_current")), None)
+        current_event = snapshot.current_event
         if not current_event:
             return {
                 "current_gameweek": None,
@@ -67,14 +77,14 @@ async def get_valid_gameweeks():
         
         # Valid gameweeks are current and next
         valid_gameweeks = [current_gameweek]
-        next_event = next((e for e in events if e["id"] == current_gameweek + 1), None)
+        next_event = snapshot.get_event(current_gameweek + 1)
         if next_event:
             valid_gameweeks.append(current_gameweek + 1)
         
         # Get deadlines for valid gameweeks
         gameweek_info = []
         for gw in valid_gameweeks:
-            event = next((e for e in events if e["id"] == gw), None)
+            event = snapshot.get_event(gw)
             if event:
                 deadline_time = event.get("deadline_time")
                 gameweek_info.append({
@@ -103,67 +113,6 @@ def generate_league_code(length: int = 6) -> str:
     return ''.join(secrets.choice(alphabet) for _ in range(length))
 
 
-# Scoring logic
-def calculate_score_prediction_points(
-    predicted_home: int,
-    predicted_away: int,
-    actual_home: int,
-    actual_away: int,
-) -> dict:
-    """
-    Calculate points for a score prediction:
-    - Exact score: 4 points
-    - Correct result (win/draw): 2 points
-    - Correct home goals: 1 point
-    - Correct away goals: 1 point
-    Maximum: 4 points (exact score includes all bonuses)
-    """
-    points = 0
-    breakdown = {
-        "home_goals": 0,
-        "away_goals": 0,
-        "result": 0,
-        "exact_score": 0,
-    }
-    
-    # Exact score
-    if predicted_home == actual_home and predicted_away == actual_away:
-        points = 4
-        breakdown["exact_score"] = 4
-        breakdown["home_goals"] = 1
-        breakdown["away_goals"] = 1
-        breakdown["result"] = 2
-    else:
-        # Correct result (win/draw)
-        predicted_result = "home" if predicted_home > predicted_away else ("away" if predicted_away > predicted_home else "draw")
-        actual_result = "home" if actual_home > actual_away else ("away" if actual_away > actual_home else "draw")
-        
-        if predicted_result == actual_result:
-            points += 2
-            breakdown["result"] = 2
-        
-        # Correct home goals
-        if predicted_home == actual_home:
-            points += 1
-            breakdown["home_goals"] = 1
-        
-        # Correct away goals
-        if predicted_away == actual_away:
-            points += 1
-            breakdown["away_goals"] = 1
-    
-    return {"points": points, "breakdown": breakdown}
-
-
-def calculate_player_pick_points(fpl_points: Optional[int]) -> int:
-    """
-    Calculate points for a player pick:
-    - Points = FPL points scored (1:1 ratio)
-    - Minimum: 0 points
-    """
-    return max(0, fpl_points or 0)
-
-
 async def validate_gameweek_for_submission(gameweek: int) -> dict:
     """
     Validate that picks can be submitted for the given gameweek.
@@ -178,8 +127,8 @@ async def validate_gameweek_for_submission(gameweek: int) -> dict:
     """
     try:
         # Get bootstrap data
-        bootstrap = await fpl_service.get_bootstrap_static()
-        events = bootstrap.get("events", [])
+        snapshot = await fpl_service.get_bootstrap_snapshot()
+        events = snapshot.events
         
         if not events:
             return {
@@ -189,27 +138,22 @@ async def validate_gameweek_for_submission(gameweek: int) -> dict:
             }
         
         # Find target gameweek in events
-        target_event = next((e for e in events if e["id"] == gameweek), None)
+        target_event = snapshot.get_event(gameweek)
         if not target_event:
-            # Try to get current gameweek for error message
-            current_event = next((e for e in events if e.get("is_current")), None)
-            max_gameweek = max((e["id"] for e in events), default=0)
             return {
                 "valid": False,
-                "error": f"Gameweek {gameweek} not found. Valid gameweeks are 1-{max_gameweek}",
-                "current_gameweek": current_event["id"] if current_event else None,
+                "error": f"Gameweek {gameweek} not found. Valid gameweeks are 1-{snapshot.max_gameweek}",
+                "current_gameweek": snapshot.current_gameweek,
             }
         
         # Get current gameweek
-        current_event = next((e for e in events if e.get("is_current")), None)
+        current_event = snapshot.current_event
         if not current_event:
             # If no current gameweek, check if season has ended or not started
-            finished_events = [e for e in events if e.get("finished")]
-            if finished_events:
-                last_finished = max(finished_events, key=lambda e: e["id"])
+            if snapshot.last_finished_gameweek is not None:
                 return {
                     "valid": False,
-                    "error": f"Season appears to have ended. Last finished gameweek was {last_finished['id']}",
+                    "error": f"Season appears to have ended. Last finished gameweek was {snapshot.last_finished_gameweek}",
                     "current_gameweek": None,
                 }
             else:
@@ -236,32 +180,26 @@ async def validate_gameweek_for_submission(gameweek: int) -> dict:
                 "current_gameweek": current_gameweek,
             }
         
-        # Check if deadline has passed (check first fixture kickoff time)
+        # Check if deadline has passed (first fixture kickoff time, served from cache)
         try:
-            fixtures = await fpl_service.get_gameweek_fixtures(gameweek)
-            if fixtures:
-                # Get first fixture by kickoff time
-                fixtures_with_time = [f for f in fixtures if f.get("kickoff_time")]
-                if fixtures_with_time:
-                    first_fixture = min(fixtures_with_time, key=lambda f: f["kickoff_time"])
-                    kickoff_time_str = first_fixture.get("kickoff_time")
-                    if kickoff_time_str:
-                        # Parse kickoff time (format: "2024-12-21T15:00:00Z")
-                        if kickoff_time_str.endswith('Z'):
-                            deadline = datetime.fromisoformat(kickoff_time_str.replace('Z', '+00:00'))
-                        else:
-                            deadline = datetime.fromisoformat(kickoff_time_str)
-                        if not deadline.tzinfo:
-                            deadline = deadline.replace(tzinfo=timezone.utc)
-                        now = datetime.now(timezone.utc)
-                        if now > deadline:
-                            deadline_str = deadline.strftime("%Y-%m-%d %H:%M UTC")
-                            return {
-                                "valid": False,
-                                "error": f"Submission deadline for gameweek {gameweek} has passed (deadline: {deadline_str})",
-                                "current_gameweek": current_gameweek,
-                                "deadline": deadline_str,
-                            }
+            kickoff_time_str = await fpl_service.get_gameweek_first_kickoff(gameweek)
+            if kickoff_time_str:
+                # Parse kickoff time (format: "2024-12-21T15:00:00Z")
+                if kickoff_time_str.endswith('Z'):
+                    deadline = datetime.fromisoformat(kickoff_time_str.replace('Z', '+00:00'))
+                else:
+                    deadline = datetime.fromisoformat(kickoff_time_str)
+                if not deadline.tzinfo:
+                    deadline = deadline.replace(tzinfo=timezone.utc)
+                now = datetime.now(timezone.utc)
+                if now > deadline:
+                    deadline_str = deadline.strftime("%Y-%m-%d %H:%M UTC")
+                    return {
+                        "valid": False,
+                        "error": f"Submission deadline for gameweek {gameweek} has passed (deadline: {deadline_str})",
+                        "current_gameweek": current_gameweek,
+                        "deadline": deadline_str,
+                    }
         except Exception as e:
             # If we can't get fixtures, log but don't fail validation
             print(f"[Weekly Picks] Warning: Could not check deadline for gameweek {gameweek}: {e}")
@@ -423,6 +361,9 @@ async def submit_picks(
             )
         print(f"[Weekly Picks] Input counts validated")
         
+        # Everything below runs in one transaction with set-based statements
+        now = datetime.now(timezone.utc)
+        
         # Check if picks already exist
         step = "check_existing_picks"
         print(f"[Weekly Picks] Step: {step}")
@@ -437,84 +378,69 @@ async def submit_picks(
         if existing_pick:
             step = "update_existing_picks"
             print(f"[Weekly Picks] Step: {step}")
-            # Update existing picks
+            # Replace old predictions and picks (one DELETE each)
             weekly_pick = existing_pick
-            # Delete old predictions and picks
-            old_score_preds = session.exec(
-                select(ScorePrediction).where(ScorePrediction.weekly_pick_id == weekly_pick.id)
-            ).all()
-            print(f"[Weekly Picks] Found {len(old_score_preds)} old score predictions to delete")
-            for sp in old_score_preds:
-                session.delete(sp)
-            
-            old_player_picks = session.exec(
-                select(PlayerPick).where(PlayerPick.weekly_pick_id == weekly_pick.id)
-            ).all()
-            print(f"[Weekly Picks] Found {len(old_player_picks)} old player picks to delete")
-            for pp in old_player_picks:
-                session.delete(pp)
-            
-            step = "commit_deletions"
-            print(f"[Weekly Picks] Step: {step}")
-            session.commit()
-            print(f"[Weekly Picks] Old picks deleted successfully")
+            session.execute(delete(ScorePrediction).where(ScorePrediction.weekly_pick_id == weekly_pick.id))
+            session.execute(delete(PlayerPick).where(PlayerPick.weekly_pick_id == weekly_pick.id))
+            weekly_pick.updated_at = now
+            session.add(weekly_pick)
         else:
             step = "create_new_weekly_pick"
             print(f"[Weekly Picks] Step: {step}")
-            # Create new picks
             weekly_pick = WeeklyPick(
                 user_id=current_user.id,
                 gameweek=gameweek,
                 total_points=0,
+                created_at=now,
+                updated_at=now,
             )
             session.add(weekly_pick)
-            step = "commit_new_weekly_pick"
-            print(f"[Weekly Picks] Step: {step}")
-            session.commit()
-            session.refresh(weekly_pick)
-            print(f"[Weekly Picks] New weekly pick created with id: {weekly_pick.id}")
+        # Assigns the id of a new pick without committing
+        session.flush()
         
-        # Add score predictions
+        # Add score predictions (points are calculated when results are available)
         step = "add_score_predictions"
         print(f"[Weekly Picks] Step: {step}")
-        total_points = 0
-        for idx, sp in enumerate(scorePredictions):
-            print(f"[Weekly Picks] Adding score prediction {idx+1}: fixture={sp.fixtureId}, home_team={sp.homeTeamId}, away_team={sp.awayTeamId}")
-            score_pred = ScorePrediction(
-                weekly_pick_id=weekly_pick.id,
-                fixture_id=sp.fixtureId,
-                home_team_id=sp.homeTeamId or 0,
-                away_team_id=sp.awayTeamId or 0,
-                predicted_home_score=sp.homeScore,
-                predicted_away_score=sp.awayScore,
-                points=0,  # Will be calculated when results are available
-            )
-            session.add(score_pred)
-        print(f"[Weekly Picks] All score predictions added")
+        session.execute(insert(ScorePrediction), [
+            {
+                "weekly_pick_id": weekly_pick.id,
+                "fixture_id": sp.fixtureId,
+                "home_team_id": sp.homeTeamId or 0,
+                "away_team_id": sp.awayTeamId or 0,
+                "predicted_home_score": sp.homeScore,
+                "predicted_away_score": sp.awayScore,
+                "points": 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for sp in scorePredictions
+        ])
         
         # Add player picks
         step = "add_player_picks"
         print(f"[Weekly Picks] Step: {step}")
-        for idx, pp in enumerate(playerPicks):
-            print(f"[Weekly Picks] Adding player pick {idx+1}: player={pp.playerId}, fixture={pp.fixtureId}")
-            player_pick = PlayerPick(
-                weekly_pick_id=weekly_pick.id,
-                player_id=pp.playerId,
-                fixture_id=pp.fixtureId,
-                points=0,  # Will be calculated when results are available
-            )
-            session.add(player_pick)
-        print(f"[Weekly Picks] All player picks added")
+        session.execute(insert(PlayerPick), [
+            {
+                "weekly_pick_id": weekly_pick.id,
+                "player_id": pp.playerId,
+                "fixture_id": pp.fixtureId,
+                "points": 0,
+                "created_at": now,
+                "updated_at": now,
+            }
+            for pp in playerPicks
+        ])
         
-        step = "final_commit"
+        step = "commit"
         print(f"[Weekly Picks] Step: {step}")
+        weekly_pick_id = weekly_pick.id
         session.commit()
-        print(f"[Weekly Picks] Final commit successful")
+        print(f"[Weekly Picks] Picks saved for pick {weekly_pick_id}")
         
         return {
             "success": True,
             "message": "Picks submitted successfully",
-            "weekly_pick_id": weekly_pick.id,
+            "weekly_pick_id": weekly_pick_id,
         }
     except HTTPException:
         raise
@@ -542,7 +468,7 @@ async def submit_picks(
         )
 
 
-@router.get("/{gameweek}")
+@router.get("/{gameweek:int}")
 async def get_picks(
     gameweek: int,
     current_user: User = Depends(get_current_user),
@@ -604,11 +530,8 @@ async def get_picks(
         # Get fixture and team info from FPL - handle errors gracefully
         teams = {}
         try:
-            bootstrap = await fpl_service.get_bootstrap_static()
-            if bootstrap and isinstance(bootstrap, dict):
-                teams_list = bootstrap.get("teams", [])
-                if isinstance(teams_list, list):
-                    teams = {t.get("id"): t for t in teams_list if isinstance(t, dict) and "id" in t}
+            snapshot = await fpl_service.get_bootstrap_snapshot()
+            teams = snapshot.teams
         except Exception as bootstrap_error:
             print(f"[Weekly Picks] Warning: Could not fetch bootstrap data for gameweek {gameweek}: {bootstrap_error}")
             traceback.print_exc()
@@ -673,7 +596,7 @@ async def get_picks(
         }
 
 
-@router.get("/{gameweek}/results")
+@router.get("/{gameweek:int}/results")
 async def get_results(
     gameweek: int,
     current_user: User = Depends(get_current_user),
@@ -694,53 +617,20 @@ async def get_results(
                 detail="No picks found for this gameweek"
             )
         
-        # Get score predictions with results
-        score_predictions = session.exec(
-            select(ScorePrediction).where(ScorePrediction.weekly_pick_id == weekly_pick.id)
-        ).all()
+        # Score this pick against the latest fixture/live data (bulk engine, one transaction)
+        await weekly_picks_scoring_service.score_gameweek(session, gameweek, weekly_pick_ids=[weekly_pick.id])
         
-        # Get player picks with results
-        player_picks = session.exec(
-            select(PlayerPick).where(PlayerPick.weekly_pick_id == weekly_pick.id)
-        ).all()
+        # Reload the scored pick with its score predictions and player picks
+        weekly_pick = weekly_picks_repository.get_user_pick(session, current_user.id, gameweek)
+        score_predictions = weekly_pick.score_predictions
+        player_picks = weekly_pick.player_picks
         
         # Get fixture and team info from FPL
-        bootstrap = await fpl_service.get_bootstrap_static()
-        teams = {t["id"]: t for t in bootstrap.get("teams", [])}
-        
-        # Get fixtures to get actual scores
-        fixtures_data = await fpl_service.get_gameweek_fixtures(gameweek)
-        fixtures = {f["id"]: f for f in fixtures_data}
-        
-        # Get live data for player points
-        try:
-            live_data = await fpl_service.get_live_gameweek(gameweek)
-            live_elements = {e["id"]: e for e in live_data.get("elements", [])}
-        except:
-            live_elements = {}
+        snapshot = await fpl_service.get_bootstrap_snapshot()
+        teams = snapshot.teams
         
         score_pred_results = []
         for sp in score_predictions:
-            fixture = fixtures.get(sp.fixture_id, {})
-            actual_home = fixture.get("team_h_score")
-            actual_away = fixture.get("team_a_score")
-            
-            # Update actual scores if available
-            if actual_home is not None and actual_away is not None:
-                sp.actual_home_score = actual_home
-                sp.actual_away_score = actual_away
-                
-                # Calculate points
-                scoring = calculate_score_prediction_points(
-                    sp.predicted_home_score,
-                    sp.predicted_away_score,
-                    actual_home,
-                    actual_away,
-                )
-                sp.points = scoring["points"]
-                sp.breakdown = scoring["breakdown"]
-                session.add(sp)
-            
             score_pred_results.append({
                 "homeTeam": teams.get(sp.home_team_id, {}).get("short_name", "TBD"),
                 "awayTeam": teams.get(sp.away_team_id, {}).get("short_name", "TBD"),
@@ -759,20 +649,7 @@ async def get_results(
         player_pick_results = []
         for pp in player_picks:
             # Get player info
-            player_data = None
-            for p in bootstrap.get("elements", []):
-                if p["id"] == pp.player_id:
-                    player_data = p
-                    break
-            
-            # Get FPL points from live data
-            live_element = live_elements.get(pp.player_id, {})
-            fpl_points = live_element.get("stats", {}).get("total_points", 0)
-            
-            if fpl_points > 0:
-                pp.fpl_points = fpl_points
-                pp.points = calculate_player_pick_points(fpl_points)
-                session.add(pp)
+            player_data = snapshot.get_player(pp.player_id)
             
             player_pick_results.append({
                 "player": {
@@ -783,13 +660,7 @@ async def get_results(
                 "points": pp.points,
             })
         
-        session.commit()
-        
-        # Recalculate total points
-        total_points = sum(sp.points for sp in score_predictions) + sum(pp.points for pp in player_picks)
-        weekly_pick.total_points = total_points
-        session.add(weekly_pick)
-        session.commit()
+        total_points = weekly_pick.total_points
         
         return {
             "scorePredictions": score_pred_results,
@@ -809,66 +680,25 @@ async def get_results(
 async def get_leaderboard(
     gameweek: Optional[int] = None,
     league_id: Optional[int] = None,
+    after_rank: int = Query(0, ge=0, description="Return entries ranked after this rank (keyset cursor)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
-    """Get leaderboard for a gameweek or league"""
+    """Get a page of the leaderboard for a gameweek or league, in rank order"""
     try:
-        # If league_id is provided, filter by league members
-        user_ids = None
-        if league_id:
-            members = session.exec(
-                select(WeeklyPicksLeagueMember).where(
-                    WeeklyPicksLeagueMember.league_id == league_id
-                )
-            ).all()
-            user_ids = [m.user_id for m in members]
-        
         # Get current gameweek if not specified
         if not gameweek:
-            bootstrap = await fpl_service.get_bootstrap_static()
-            current_event = next(
-                (e for e in bootstrap.get("events", []) if e.get("is_current")),
-                None
-            )
-            if current_event:
-                gameweek = current_event["id"]
-            else:
-                gameweek = 1
-        
-        # Query weekly picks
-        query = select(WeeklyPick).where(WeeklyPick.gameweek == gameweek)
-        if user_ids:
-            query = query.where(WeeklyPick.user_id.in_(user_ids))
-        
-        picks = session.exec(query).all()
-        
-        # Get user info
-        user_ids_list = [p.user_id for p in picks]
-        users = session.exec(
-            select(User).where(User.id.in_(user_ids_list))
-        ).all()
-        user_map = {u.id: u for u in users}
-        
-        # Sort by total points (descending)
-        picks_sorted = sorted(picks, key=lambda p: p.total_points, reverse=True)
-        
-        # Calculate ranks and movements (simplified - would need previous week data for movement)
-        leaderboard = []
-        for idx, pick in enumerate(picks_sorted):
-            user = user_map.get(pick.user_id)
-            if not user:
-                continue
-            
-            leaderboard.append({
-                "userId": user.id,
-                "userName": user.username,
-                "rank": idx + 1,
-                "points": pick.total_points,
-                "movement": None,  # Would need to compare with previous week
-            })
-        
-        return leaderboard
+            snapshot = await fpl_service.get_bootstrap_snapshot()
+            gameweek = snapshot.current_gameweek or 1
+        
+        return weekly_picks_leaderboard_service.get_page(
+            session,
+            gameweek,
+            league_id=league_id or OVERALL,
+            after_rank=after_rank,
+            limit=limit,
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -876,6 +706,64 @@ async def get_leaderboard(
         )
 
 
+@router.get("/leaderboard/around-me")
+async def get_leaderboard_around_me(
+    gameweek: Optional[int] = None,
+    league_id: Optional[int] = None,
+    radius: int = Query(5, ge=0, le=50),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Get the current user's leaderboard position with the entries either side"""
+    try:
+        if not gameweek:
+            snapshot = await fpl_service.get_bootstrap_snapshot()
+            gameweek = snapshot.current_gameweek or 1
+        
+        entries = weekly_picks_leaderboard_service.get_around(
+            session,
+            gameweek,
+            current_user.id,
+            league_id=league_id or OVERALL,
+            radius=radius,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch leaderboard: {str(e)}"
+        )
+    
+    if entries is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"No leaderboard entry for gameweek {gameweek}"
+        )
+    return entries
+
+
+@router.get("/standings")
+async def get_standings(
+    league_id: Optional[int] = None,
+    after_rank: int = Query(0, ge=0, description="Return entries ranked after this rank (keyset cursor)"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Get a page of the season standings, overall or for a league, in rank order"""
+    try:
+        return weekly_picks_standings_service.get_page(
+            session,
+            league_id=league_id or OVERALL,
+            after_rank=after_rank,
+            limit=limit,
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to fetch standings: {str(e)}"
+        )
+
+
 @router.post("/leagues")
 async def create_league(
     name: str,
@@ -910,6 +798,8 @@ async def create_league(
             user_id=current_user.id,
         )
         session.add(member)
+        session.flush()
+        weekly_picks_standings_service.add_member(session, league.id, current_user.id)
         session.commit()
         
         return {
@@ -948,25 +838,24 @@ async def get_leagues(
             select(WeeklyPicksLeague).where(WeeklyPicksLeague.id.in_(league_ids))
         ).all()
         
-        # Get member counts and user ranks
+        # Get member counts and user ranks (one query each)
+        member_counts = dict(session.exec(
+            select(WeeklyPicksLeagueMember.league_id, func.count(WeeklyPicksLeagueMember.id))
+            .where(WeeklyPicksLeagueMember.league_id.in_(league_ids))
+            .group_by(WeeklyPicksLeagueMember.league_id)
+        ).all())
+        ranks = weekly_picks_standings_service.get_user_ranks(session, current_user.id, league_ids)
+        
         result = []
         for league in leagues:
-            all_members = session.exec(
-                select(WeeklyPicksLeagueMember).where(
-                    WeeklyPicksLeagueMember.league_id == league.id
-                )
-            ).all()
-            
-            # Calculate user's rank in league (simplified - would need to calculate based on points)
-            # For now, just return member count
             result.append({
                 "id": league.id,
                 "name": league.name,
                 "description": league.description,
                 "code": league.code,
                 "type": league.type,
-                "memberCount": len(all_members),
-                "yourRank": 1,  # Would need to calculate based on points
+                "memberCount": member_counts.get(league.id, 0),
+                "yourRank": ranks.get(league.id),
             })
         
         return result
@@ -1071,6 +960,8 @@ async def join_league(
             user_id=current_user.id,
         )
         session.add(member)
+        session.flush()
+        weekly_picks_standings_service.add_member(session, league.id, current_user.id)
         session.commit()
         
         return {
@@ -1098,12 +989,10 @@ async def get_statistics(
 ):
     """Get user's statistics"""
     try:
-        # Get all user's picks
-        picks = session.exec(
-            select(WeeklyPick).where(WeeklyPick.user_id == current_user.id)
-        ).all()
+        stats = weekly_picks_repository.get_user_statistics(session, current_user.id)
+        gameweeks = stats["gameweeks"]
         
-        if not picks:
+        if not gameweeks:
             return {
                 "totalPoints": 0,
                 "averagePoints": 0,
@@ -1122,45 +1011,32 @@ async def get_statistics(
                 "rankOverTime": [],
             }
         
-        total_points = sum(p.total_points for p in picks)
-        avg_points = total_points / len(picks) if picks else 0
+        total_points = sum(gw["points"] for gw in gameweeks)
+        avg_points = total_points / len(gameweeks)
         
         # Get best rank
-        best_rank = min((p.rank for p in picks if p.rank), default=None)
+        best_rank = min((gw["rank"] for gw in gameweeks if gw["rank"]), default=None)
         
         # Score prediction stats
-        all_score_predictions = []
-        for pick in picks:
-            score_preds = session.exec(
-                select(ScorePrediction).where(ScorePrediction.weekly_pick_id == pick.id)
-            ).all()
-            all_score_predictions.extend(score_preds)
-        
-        exact_scores = sum(1 for sp in all_score_predictions if sp.breakdown and sp.breakdown.get("exact_score", 0) > 0)
-        score_accuracy = (exact_scores / len(all_score_predictions) * 100) if all_score_predictions else 0
-        avg_score_points = sum(sp.points for sp in all_score_predictions) / len(all_score_predictions) if all_score_predictions else 0
+        predictions = stats["score_predictions"]
+        exact_scores = stats["exact_scores"]
+        score_accuracy = (exact_scores / predictions * 100) if predictions else 0
+        avg_score_points = stats["score_prediction_points"] / predictions if predictions else 0
         
         # Player pick stats
-        all_player_picks = []
-        for pick in picks:
-            player_picks = session.exec(
-                select(PlayerPick).where(PlayerPick.weekly_pick_id == pick.id)
-            ).all()
-            all_player_picks.extend(player_picks)
-        
-        successful_picks = sum(1 for pp in all_player_picks if pp.fpl_points and pp.fpl_points > 0)
-        success_rate = (successful_picks / len(all_player_picks) * 100) if all_player_picks else 0
-        avg_fpl_points = sum(pp.fpl_points or 0 for pp in all_player_picks) / len(all_player_picks) if all_player_picks else 0
+        player_picks = stats["player_picks"]
+        success_rate = (stats["successful_player_picks"] / player_picks * 100) if player_picks else 0
+        avg_fpl_points = stats["fpl_points"] / player_picks if player_picks else 0
         
         # Points and rank over time
         points_over_time = [
-            {"gameweek": p.gameweek, "points": p.total_points}
-            for p in sorted(picks, key=lambda x: x.gameweek)
+            {"gameweek": gw["gameweek"], "points": gw["points"]}
+            for gw in gameweeks
         ]
         rank_over_time = [
-            {"gameweek": p.gameweek, "rank": p.rank}
-            for p in sorted(picks, key=lambda x: x.gameweek)
-            if p.rank
+            {"gameweek": gw["gameweek"], "rank": gw["rank"]}
+            for gw in gameweeks
+            if gw["rank"]
         ]
         
         return {
@@ -1175,7 +1051,7 @@ async def get_statistics(
             "playerPickStats": {
                 "avgFplPoints": round(avg_fpl_points, 1),
                 "successRate": round(success_rate, 1),
-                "totalPicks": len(all_player_picks),
+                "totalPicks": player_picks,
             },
             "pointsOverTime": points_over_time,
             "rankOverTime": rank_over_time,
@@ -1194,26 +1070,17 @@ async def get_history(
 ):
     """Get user's pick history"""
     try:
-        picks = session.exec(
-            select(WeeklyPick).where(WeeklyPick.user_id == current_user.id)
-            .order_by(WeeklyPick.gameweek.desc())
-        ).all()
+        # Picks with their score predictions and player picks (three queries)
+        picks = weekly_picks_repository.get_user_picks(session, current_user.id)
+        if not picks:
+            return []
+        
+        # Get team and player info once for all gameweeks
+        snapshot = await fpl_service.get_bootstrap_snapshot()
+        teams = snapshot.teams
         
         result = []
         for pick in picks:
-            # Get score predictions and player picks
-            score_preds = session.exec(
-                select(ScorePrediction).where(ScorePrediction.weekly_pick_id == pick.id)
-            ).all()
-            
-            player_picks = session.exec(
-                select(PlayerPick).where(PlayerPick.weekly_pick_id == pick.id)
-            ).all()
-            
-            # Get team info
-            bootstrap = await fpl_service.get_bootstrap_static()
-            teams = {t["id"]: t for t in bootstrap.get("teams", [])}
-            
             result.append({
                 "gameweek": pick.gameweek,
                 "totalPoints": pick.total_points,
@@ -1232,17 +1099,17 @@ async def get_history(
                         } if sp.actual_home_score is not None else None,
                         "points": sp.points,
                     }
-                    for sp in score_preds
+                    for sp in pick.score_predictions
                 ],
                 "playerPicks": [
                     {
                         "player": {
-                            "name": "Unknown",  # Would need to fetch from bootstrap
+                            "name": (snapshot.get_player(pp.player_id) or {}).get("web_name", "Unknown"),
                             "fplPoints": pp.fpl_points or 0,
                         },
                         "points": pp.points,
                     }
-                    for pp in player_picks
+                    for pp in pick.player_picks
                 ],
             })
         
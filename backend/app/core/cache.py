@@ -0,0 +1,495 @@
+"""
+Shared cache
+Two-tier cache: an in-process LRU in front of an optional Redis tier.
+
+The local tier keeps hot objects per worker (no serialization cost); the
+Redis tier lets every uvicorn worker / deploy share warm data so upstream
+load doesn't multiply with the number of processes. Redis is opt-in via
+REDIS_CACHE_ENABLED; when it's disabled or unreachable the cache silently
+degrades to local-only.
+
+Values cross the Redis boundary as zlib-compressed JSON, so only
+JSON-compatible data (API payloads, prediction dicts, ratings) should be
+cached here. Cached objects are shared between callers - treat as read-only.
+
+Entries can carry tags (e.g. "team:<season>:<id>") so dependent data can be
+evicted precisely with invalidate_tags() instead of clearing a namespace.
+The local tier is bounded both by entry count and by the size of its
+values: the caller's size hint (e.g. the upstream response's length) or the
+encoded size when the value is encoded for Redis anyway. Values are never
+encoded just to be measured.
+
+Async code uses aget/aset: local hits and local writes stay inline, and the
+Redis round-trips (a blocking client) run in a worker thread so a slow
+Redis never stalls the event loop.
+"""
+import asyncio
+import fnmatch
+import json
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+from app.core.config import settings
+
+# Default TTL per namespace (callers may override per entry)
+NAMESPACE_TTLS: Dict[str, timedelta] = {
+    'fpl': timedelta(minutes=5),
+    'football': timedelta(hours=1),
+    'predictions': timedelta(hours=1),
+}
+DEFAULT_TTL = timedelta(minutes=5)
+
+# Key prefix so several apps/environments can share one Redis
+KEY_PREFIX = 'fplc'
+
+# Payloads smaller than this are stored uncompressed
+COMPRESS_MIN_BYTES = 512
+_RAW = b'\x00'
+_ZLIB = b'\x01'
+
+# After a Redis error, skip the remote tier for this long
+REDIS_RETRY_AFTER = 30.0
+
+
+def _json_default(value: Any) -> Any:
+    """Fallback encoder for numpy scalars, dates and other stragglers"""
+    if hasattr(value, 'item'):
+        return value.item()
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def encode(value: Any) -> bytes:
+    """Compact JSON encoding (its length is the cache's size estimate for a value)"""
+    return json.dumps(value, separators=(',', ':'), default=_json_default).encode('utf-8')
+
+
+def serialize(value: Any, data: Optional[bytes] = None) -> bytes:
+    """Encode a value as compact JSON, zlib-compressed when worthwhile"""
+    if data is None:
+        data = encode(value)
+    if len(data) >= COMPRESS_MIN_BYTES:
+        return _ZLIB + zlib.compress(data, 6)
+    return _RAW + data
+
+
+def deserialize(blob: bytes) -> Any:
+    """Decode bytes produced by serialize()"""
+    header, body = blob[:1], blob[1:]
+    if header == _ZLIB:
+        body = zlib.decompress(body)
+    return json.loads(body.decode('utf-8'))
+
+
+class LocalLRUCache:
+    """
+    Thread-safe in-process LRU with per-entry expiry, size accounting and tags.
+    Eviction is O(1) per entry (OrderedDict order = recency).
+    """
+    
+    def __init__(self, max_entries: int = 4096, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        # key -> (value, expires_at monotonic, size, tags)
+        self._data: 'OrderedDict[str, Tuple[Any, float, int, Tuple[str, ...]]]' = OrderedDict()
+        # tag -> keys carrying it
+        self._tags: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+    
+    def _remove(self, key: str):
+        """Drop an entry and its tag/size bookkeeping (lock held)"""
+        _, _, size, tags = self._data.pop(key)
+        self.bytes -= size
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+    
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.monotonic():
+                self._remove(key)
+                return None
+            self._data.move_to_end(key)
+            return entry[0]
+    
+    def set(self, key: str, value: Any, ttl_seconds: float, size: int = 0, tags: Iterable[str] = ()):
+        tags = tuple(tags)
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, time.monotonic() + ttl_seconds, size, tags)
+            self.bytes += size
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._data) > self.max_entries or (
+                self.max_bytes is not None and self.bytes > self.max_bytes and len(self._data) > 1
+            ):
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+    
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+    
+    def clear_prefix(self, prefix: str) -> int:
+        with self._lock:
+            keys = [k for k in self._data if k.startswith(prefix)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+    
+    def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Drop every entry carrying any of the tags"""
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tags.get(tag, ()))
+            for key in keys:
+                if key in self._data:
+                    self._remove(key)
+            return len(keys)
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class FakeRedis:
+    """
+    Minimal in-memory stand-in for redis.Redis (get/set/delete/scan/pttl).
+    Used when REDIS_URL is "memory://" and in tests.
+    """
+    
+    def __init__(self):
+        self._data: Dict[str, Tuple[bytes, Optional[float]]] = {}
+        self._lock = threading.Lock()
+    
+    def _live(self, key: str) -> Optional[Tuple[bytes, Optional[float]]]:
+        entry = self._data.get(key)
+        if entry and entry[1] is not None and entry[1] <= time.monotonic():
+            del self._data[key]
+            return None
+        return entry
+    
+    def ping(self) -> bool:
+        return True
+    
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._live(key)
+            return entry[0] if entry else None
+    
+    def set(self, key: str, value: bytes, px: Optional[int] = None) -> bool:
+        with self._lock:
+            expires = time.monotonic() + px / 1000.0 if px else None
+            self._data[key] = (value, expires)
+            return True
+    
+    def pttl(self, key: str) -> int:
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                return -2
+            if entry[1] is None:
+                return -1
+            return int((entry[1] - time.monotonic()) * 1000)
+    
+    def delete(self, *keys: str) -> int:
+        with self._lock:
+            return sum(1 for key in keys if self._data.pop(key, None) is not None)
+    
+    def pexpire(self, key: str, ms: int) -> bool:
+        with self._lock:
+            entry = self._live(key)
+            if entry is None:
+                return False
+            self._data[key] = (entry[0], time.monotonic() + ms / 1000.0)
+            return True
+    
+    def sadd(self, key: str, *members: str) -> int:
+        with self._lock:
+            entry = self._live(key)
+            current = entry[0] if entry else set()
+            added = len(set(members) - current)
+            self._data[key] = (current | set(members), entry[1] if entry else None)
+            return added
+    
+    def smembers(self, key: str) -> Set[bytes]:
+        with self._lock:
+            entry = self._live(key)
+            return {m.encode('utf-8') for m in entry[0]} if entry else set()
+    
+    def scan_iter(self, match: str = '*', count: int = 100):
+        with self._lock:
+            keys = [k for k in self._data if fnmatch.fnmatchcase(k, match)]
+        return iter(keys)
+    
+    def pipeline(self, transaction: bool = False) -> '_FakePipeline':
+        return _FakePipeline(self)
+
+
+class _FakePipeline:
+    """Queued commands for FakeRedis, executed in order"""
+    
+    def __init__(self, client: FakeRedis):
+        self._client = client
+        self._calls: List[Tuple[str, tuple, Dict[str, Any]]] = []
+    
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+        return queue
+    
+    def execute(self) -> List[Any]:
+        results = [getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in self._calls]
+        self._calls = []
+        return results
+
+
+class TieredCache:
+    """
+    Namespaced cache: local LRU first, then the shared Redis tier.
+    A remote hit is promoted into the local tier for its remaining TTL.
+    """
+    
+    def __init__(self, remote: Optional[Any] = None, local_max_entries: int = 4096, local_max_bytes: Optional[int] = None):
+        self.local = LocalLRUCache(local_max_entries, local_max_bytes)
+        self.remote = remote
+        self._remote_down_until = 0.0
+        self.stats: Dict[str, int] = {
+            'local_hits': 0, 'remote_hits': 0, 'misses': 0, 'sets': 0, 'remote_errors': 0, 'invalidated': 0,
+        }
+    
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{KEY_PREFIX}:{namespace}:{key}"
+    
+    def _tag_key(self, namespace: str, tag: str) -> str:
+        # Outside the namespace's key prefix so clear_namespace() scans don't hit tag sets
+        return f"{KEY_PREFIX}-tags:{namespace}:{tag}"
+    
+    def ttl_for(self, namespace: str) -> timedelta:
+        return NAMESPACE_TTLS.get(namespace.split(':', 1)[0], DEFAULT_TTL)
+    
+    def _remote_ok(self) -> bool:
+        return self.remote is not None and time.monotonic() >= self._remote_down_until
+    
+    def _remote_failed(self, action: str, error: Exception):
+        self.stats['remote_errors'] += 1
+        self._remote_down_until = time.monotonic() + REDIS_RETRY_AFTER
+        print(f"[Cache] Redis {action} failed, using local cache only for {REDIS_RETRY_AFTER:.0f}s: {error}")
+    
+    def _get_local(self, full_key: str) -> Optional[Any]:
+        value = self.local.get(full_key)
+        if value is not None:
+            self.stats['local_hits'] += 1
+        return value
+    
+    def _get_remote(self, namespace: str, full_key: str) -> Optional[Any]:
+        """Redis lookup, promoting a hit into the local tier (blocking)"""
+        try:
+            blob, pttl = self.remote.pipeline(transaction=False).get(full_key).pttl(full_key).execute()
+        except Exception as e:
+            self._remote_failed('get', e)
+            return None
+        if blob is None:
+            return None
+        value = deserialize(blob)
+        remaining = pttl / 1000.0 if pttl and pttl > 0 else self.ttl_for(namespace).total_seconds()
+        # Remote-promoted entries are untagged locally; tag invalidation also clears the remote tier
+        self.local.set(full_key, value, remaining, size=len(blob))
+        self.stats['remote_hits'] += 1
+        return value
+    
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Get a cached value, or None on miss"""
+        full_key = self._key(namespace, key)
+        value = self._get_local(full_key)
+        if value is None and self._remote_ok():
+            value = self._get_remote(namespace, full_key)
+        if value is None:
+            self.stats['misses'] += 1
+        return value
+    
+    async def aget(self, namespace: str, key: str) -> Optional[Any]:
+        """get() for async code: the Redis lookup runs in a worker thread"""
+        full_key = self._key(namespace, key)
+        value = self._get_local(full_key)
+        if value is None and self._remote_ok():
+            value = await asyncio.to_thread(self._get_remote, namespace, full_key)
+        if value is None:
+            self.stats['misses'] += 1
+        return value
+    
+    def _set_local(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        ttl: Optional[timedelta],
+        tags: Iterable[str],
+        size: Optional[int],
+    ) -> Optional[Tuple[str, Optional[bytes], timedelta, Tuple[str, ...]]]:
+        """Store in the local tier; returns what the remote write needs (None if there's none to do)"""
+        if value is None:
+            return None
+        ttl = ttl or self.ttl_for(namespace)
+        tags = tuple(tags)
+        full_key = self._key(namespace, key)
+        # Encoded here only when Redis needs the bytes anyway; its length then doubles as the size
+        data = encode(value) if self._remote_ok() else None
+        if size is None:
+            size = len(data) if data is not None else 0
+        self.local.set(full_key, value, ttl.total_seconds(), size=size, tags=tags)
+        self.stats['sets'] += 1
+        return (full_key, data, ttl, tags) if data is not None else None
+    
+    def _set_remote(self, namespace: str, value: Any, pending: Tuple[str, bytes, timedelta, Tuple[str, ...]]):
+        full_key, data, ttl, tags = pending
+        ttl_ms = int(ttl.total_seconds() * 1000)
+        try:
+            pipe = self.remote.pipeline(transaction=False)
+            pipe.set(full_key, serialize(value, data), px=ttl_ms)
+            for tag in tags:
+                tag_key = self._tag_key(namespace, tag)
+                pipe.sadd(tag_key, full_key)
+                # Tag sets outlive their newest member
+                pipe.pexpire(tag_key, ttl_ms)
+            pipe.execute()
+        except Exception as e:
+            self._remote_failed('set', e)
+    
+    def set(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        ttl: Optional[timedelta] = None,
+        tags: Iterable[str] = (),
+        size: Optional[int] = None,
+    ):
+        """
+        Store a value in both tiers (ttl defaults to the namespace TTL).
+        `size` is the caller's estimate of the value's size in bytes, if known.
+        """
+        pending = self._set_local(namespace, key, value, ttl, tags, size)
+        if pending is not None:
+            self._set_remote(namespace, value, pending)
+    
+    async def aset(
+        self,
+        namespace: str,
+        key: str,
+        value: Any,
+        ttl: Optional[timedelta] = None,
+        tags: Iterable[str] = (),
+        size: Optional[int] = None,
+    ):
+        """set() for async code: the Redis write runs in a worker thread"""
+        pending = self._set_local(namespace, key, value, ttl, tags, size)
+        if pending is not None:
+            await asyncio.to_thread(self._set_remote, namespace, value, pending)
+    
+    def delete(self, namespace: str, key: str):
+        full_key = self._key(namespace, key)
+        self.local.delete(full_key)
+        if self._remote_ok():
+            try:
+                self.remote.delete(full_key)
+            except Exception as e:
+                self._remote_failed('delete', e)
+    
+    def clear_namespace(self, namespace: str) -> int:
+        """Remove every entry in a namespace (and its sub-namespaces) from both tiers"""
+        prefix = f"{KEY_PREFIX}:{namespace}:"
+        removed = self.local.clear_prefix(prefix)
+        if self._remote_ok():
+            try:
+                keys = list(self.remote.scan_iter(match=f"{prefix}*", count=500))
+                if keys:
+                    removed += self.remote.delete(*keys)
+            except Exception as e:
+                self._remote_failed('clear', e)
+        return removed
+    
+    def invalidate_tags(self, namespace: str, tags: Iterable[str]) -> int:
+        """Remove every entry in a namespace carrying any of the tags, from both tiers"""
+        tags = list(tags)
+        if not tags:
+            return 0
+        removed = self.local.invalidate_tags(tags)
+        if self._remote_ok():
+            try:
+                tag_keys = [self._tag_key(namespace, tag) for tag in tags]
+                pipe = self.remote.pipeline(transaction=False)
+                for tag_key in tag_keys:
+                    pipe.smembers(tag_key)
+                keys = set()
+                for members in pipe.execute():
+                    keys.update(m.decode('utf-8') if isinstance(m, bytes) else m for m in members)
+                # Also drops local copies promoted from Redis (they carry no tags)
+                for key in keys:
+                    self.local.delete(key)
+                removed = max(removed, len(keys))
+                self.remote.delete(*keys, *tag_keys)
+            except Exception as e:
+                self._remote_failed('invalidate', e)
+        self.stats['invalidated'] += removed
+        return removed
+    
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats['local_hits'] + self.stats['remote_hits'] + self.stats['misses']
+        hits = self.stats['local_hits'] + self.stats['remote_hits']
+        return {
+            **self.stats,
+            'hit_rate': round(hits / lookups, 3) if lookups else 0,
+            'local_entries': len(self.local),
+            'local_bytes': self.local.bytes,
+            'local_evictions': self.local.evictions,
+            'remote': type(self.remote).__name__ if self.remote is not None else None,
+            'remote_available': self._remote_ok(),
+        }
+
+
+def _create_remote() -> Optional[Any]:
+    """Build the Redis tier from settings (None when disabled)"""
+    if not settings.REDIS_CACHE_ENABLED:
+        return None
+    if settings.REDIS_URL.startswith('memory://'):
+        return FakeRedis()
+    if not REDIS_AVAILABLE:
+        print("[Cache] redis package not installed, using local cache only")
+        return None
+    # Short timeouts: a slow Redis must never be slower than a cache miss
+    return redis.Redis.from_url(
+        settings.REDIS_URL,
+        socket_timeout=0.25,
+        socket_connect_timeout=0.25,
+    )
+
+
+# Singleton instance
+cache = TieredCache(
+    remote=_create_remote(),
+    local_max_entries=settings.CACHE_LOCAL_MAX_ENTRIES,
+    local_max_bytes=settings.CACHE_LOCAL_MAX_BYTES or None,
+)
@@ -12,6 +12,12 @@ class Settings(BaseSettings):
     
     # Redis
     REDIS_URL: str = "redis://localhost:6379"
+    # Share cached data between workers via Redis ("memory://" = in-process fake)
+    REDIS_CACHE_ENABLED: bool = False
+    # Max entries in each worker's in-process cache tier
+    CACHE_LOCAL_MAX_ENTRIES: int = 4096
+    # Max encoded size of values in each worker's in-process cache tier (0 = unbounded)
+    CACHE_LOCAL_MAX_BYTES: int = 64 * 1024 * 1024
     
     # JWT
     SECRET_KEY: str = "your-secret-key-change-in-production"
@@ -4,13 +4,15 @@ from app.core.config import settings
 
 # Import all models to ensure tables are created
 from app.models.user import User
-from app.models.push_subscription import PushSubscription, NotificationLog
+from app.models.push_subscription import PushSubscription, NotificationLog, LiveStatsSnapshot
 from app.models.weekly_picks import (
     WeeklyPick,
     ScorePrediction,
     PlayerPick,
     WeeklyPicksLeague,
     WeeklyPicksLeagueMember,
+    WeeklyPicksLeaderboardEntry,
+    WeeklyPicksStanding,
 )
 from app.models.audit_log import AuditLog
 from app.models.followed_player import FollowedPlayer
@@ -23,6 +23,10 @@ try:
         MatchEvent,
         Lineup,
         TeamStats,
+        BacktestRun,
+        BacktestResult,
+        TeamFormSnapshot,
+        ImportManifest,
     )
 except Exception as import_error:
     # If there's an import error, log it but continue
@@ -101,6 +105,12 @@ else:
     )
 
 
+# Tables that belong to the PL database
+PL_TABLES = [
+    "teams", "players", "matches", "match_player_stats", "match_events", "lineups", "team_stats",
+    "backtest_runs", "backtest_results", "team_form_snapshots", "import_manifest",
+]
+
 # Track if tables have been created to avoid multiple calls
 _pl_tables_created = False
 
@@ -120,7 +130,7 @@ def create_pl_db_and_tables():
         existing_tables = inspector.get_table_names()
         
         # Only create tables if they don't exist
-        expected_tables = ["teams", "players", "matches", "match_player_stats", "match_events", "lineups", "team_stats"]
+        expected_tables = PL_TABLES
         missing_tables = set(expected_tables) - set(existing_tables)
         
         if missing_tables:
@@ -163,7 +173,7 @@ def create_pl_db_and_tables():
         tables = inspector.get_table_names()
         print(f"[PL DB] Existing tables: {tables}")
         
-        expected_tables = ["teams", "players", "matches", "match_player_stats", "match_events", "lineups", "team_stats"]
+        expected_tables = PL_TABLES
         missing = set(expected_tables) - set(tables)
         if missing:
             print(f"[PL DB] WARNING: Missing tables: {missing}")
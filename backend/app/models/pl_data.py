@@ -6,7 +6,7 @@ from typing import Optional, List, Dict, Any, Callable
 from datetime import datetime, date as date_type, timezone
 from uuid import UUID, uuid4
 from sqlmodel import SQLModel, Field, Relationship, JSON, Column
-from sqlalchemy import Text, Index, Date
+from sqlalchemy import Text, Index, Date, UniqueConstraint
 
 
 def get_utc_now() -> datetime:
@@ -196,3 +196,119 @@ class TeamStats(SQLModel, table=True):
         {'extend_existing': True}
     )
 
+
+
+class BacktestRun(SQLModel, table=True):
+    """A prediction-model backtest over one or more seasons"""
+    __tablename__ = "backtest_runs"
+    __table_args__ = {'extend_existing': True}
+    
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    seasons: List[str] = Field(sa_column=Column(JSON))  # e.g. ["2023-2024", "2024-2025"]
+    status: str = Field(default="pending", index=True)  # pending, running, completed, failed
+    model_version: str = Field(default="v2")
+    
+    # Checkpoint: seasons whose results are fully stored (resume skips them)
+    completed_seasons: List[str] = Field(default_factory=list, sa_column=Column(JSON))
+    total_fixtures: int = Field(default=0)
+    
+    # Aggregate metrics: {"overall": {...}, "seasons": {"2024-2025": {...}}}
+    metrics: Optional[Dict[str, Any]] = Field(default=None, sa_column=Column(JSON))
+    error: Optional[str] = Field(default=None, sa_column=Column(Text))
+    
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    created_at: datetime = Field(default_factory=get_utc_now)
+    updated_at: datetime = Field(default_factory=get_utc_now)
+
+
+class BacktestResult(SQLModel, table=True):
+    """Pre-match prediction vs actual result for one fixture in a backtest run"""
+    __tablename__ = "backtest_results"
+    
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    run_id: UUID = Field(foreign_key="backtest_runs.id", index=True)
+    match_id: UUID = Field(foreign_key="matches.id", index=True)
+    season: str = Field(index=True)
+    match_date: date_type = Field(sa_column=Column(Date))
+    home_team_id: UUID = Field(foreign_key="teams.id")
+    away_team_id: UUID = Field(foreign_key="teams.id")
+    
+    predicted_home: int
+    predicted_away: int
+    actual_home: int
+    actual_away: int
+    home_win_prob: float
+    draw_prob: float
+    away_win_prob: float
+    
+    exact: bool
+    outcome_correct: bool
+    brier: float  # Multi-class Brier score over home/draw/away
+    log_loss: float  # -log(probability given to the actual outcome)
+    
+    created_at: datetime = Field(default_factory=get_utc_now)
+    
+    __table_args__ = (
+        UniqueConstraint("run_id", "match_id", name="uq_backtest_run_match"),
+        Index("idx_backtest_run_date", "run_id", "match_date"),
+        {'extend_existing': True}
+    )
+
+
+class TeamFormSnapshot(SQLModel, table=True):
+    """
+    Rolling form of a team after its match on as_of_date.
+    Applies to predictions for any date after as_of_date (until the team's next match).
+    """
+    __tablename__ = "team_form_snapshots"
+    
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    team_id: UUID = Field(foreign_key="teams.id", index=True)
+    season: str = Field(index=True)
+    venue: str  # "all", "home" or "away"
+    as_of_date: date_type = Field(sa_column=Column(Date))
+    
+    # Weighted averages over the last matches_played matches (most recent weighted highest)
+    avg_goals_for: float
+    avg_goals_against: float
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    matches_played: int = 0
+    
+    # Window of recent matches, most recent first:
+    # [{"match_id", "date", "opponent_id", "is_home", "goals_for", "goals_against"}]
+    recent: List[Dict[str, Any]] = Field(default_factory=list, sa_column=Column(JSON))
+    
+    created_at: datetime = Field(default_factory=get_utc_now)
+    updated_at: datetime = Field(default_factory=get_utc_now)
+    
+    __table_args__ = (
+        UniqueConstraint("team_id", "season", "venue", "as_of_date", name="uq_team_form_snapshot"),
+        Index("idx_team_form_lookup", "team_id", "season", "venue", "as_of_date"),
+        {'extend_existing': True}
+    )
+
+
+class ImportManifest(SQLModel, table=True):
+    """
+    One imported match file: its content hash, the match it produced and the
+    rows it wrote per table. Re-imports skip files whose hash is unchanged.
+    """
+    __tablename__ = "import_manifest"
+    __table_args__ = {'extend_existing': True}
+    
+    id: UUID = Field(default_factory=uuid4, primary_key=True)
+    path: str = Field(unique=True, index=True)  # Relative to the data directory, e.g. "2024-2025/matches/x.json"
+    season: str = Field(index=True)
+    content_hash: str  # sha256 of the file's bytes
+    match_id: UUID = Field(foreign_key="matches.id", index=True)
+    
+    # {"lineups": 2, "events": 7, "player_stats": 32, "team_stats": 2}
+    row_counts: Dict[str, int] = Field(default_factory=dict, sa_column=Column(JSON))
+    missing: List[str] = Field(default_factory=list, sa_column=Column(JSON))  # e.g. ["scores", "events"]
+    is_complete: bool = Field(default=True, index=True)
+    
+    created_at: datetime = Field(default_factory=get_utc_now)
+    updated_at: datetime = Field(default_factory=get_utc_now)
@@ -1,4 +1,5 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Column, LargeBinary
 from typing import Optional
 from datetime import datetime
 
@@ -44,3 +45,20 @@ class NotificationLog(SQLModel, table=True):
     success: bool = Field(default=True)
     error_message: Optional[str] = Field(default=None)
 
+
+
+class LiveStatsSnapshot(SQLModel, table=True):
+    """
+    Last-seen live stats for a gameweek, shared by every notification checker.
+    `stats` is a zlib-compressed int16 array indexed by player id with fixed
+    stat columns (see app.services.live_stats_store); `version` is bumped on
+    every write so writers can compare-and-swap. Keyed by season as well,
+    since gameweek numbers and player ids are reused every season.
+    """
+    __tablename__ = "live_stats_snapshots"
+    
+    season: str = Field(primary_key=True)  # e.g. "2024-2025"
+    gameweek: int = Field(primary_key=True)
+    version: int = Field(default=1)
+    stats: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
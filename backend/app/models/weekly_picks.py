@@ -1,7 +1,7 @@
 from typing import Optional, List
 from datetime import datetime
 from sqlmodel import SQLModel, Field, Relationship, Column, JSON
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import ForeignKey, UniqueConstraint, Index
 
 
 class WeeklyPick(SQLModel, table=True):
@@ -98,3 +98,46 @@ class WeeklyPicksLeagueMember(SQLModel, table=True):
         UniqueConstraint("league_id", "user_id", name="unique_league_member"),
     )
 
+
+
+class WeeklyPicksLeaderboardEntry(SQLModel, table=True):
+    """
+    Materialized leaderboard row for one user in one gameweek, overall or per league.
+    Built by the scoring job (see weekly_picks_leaderboard); read by rank range.
+    """
+    __tablename__ = "weekly_picks_leaderboard"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    gameweek: int
+    league_id: int = Field(default=0)  # 0 = overall leaderboard
+    user_id: int = Field(foreign_key="users.id", index=True)
+    weekly_pick_id: int = Field(foreign_key="weekly_picks.id")
+    points: int = Field(default=0)  # Gameweek points
+    season_points: int = Field(default=0)  # Cumulative points up to and including this gameweek
+    rank: int
+    previous_rank: Optional[int] = None  # Rank on the previous gameweek's leaderboard
+    movement: Optional[int] = None  # previous_rank - rank (positive = climbed)
+    
+    __table_args__ = (
+        UniqueConstraint("gameweek", "league_id", "user_id", name="unique_leaderboard_entry"),
+        Index("idx_leaderboard_rank", "gameweek", "league_id", "rank"),
+    )
+
+
+class WeeklyPicksStanding(SQLModel, table=True):
+    """
+    Season standings row for one user, overall or per league.
+    Totals are maintained incrementally from scoring deltas (see weekly_picks_standings).
+    """
+    __tablename__ = "weekly_picks_standings"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    league_id: int = Field(default=0)  # 0 = overall standings
+    user_id: int = Field(foreign_key="users.id", index=True)
+    total_points: int = Field(default=0)  # Sum of total_points over the user's weekly picks
+    rank: Optional[int] = None  # None until the next ranking pass
+    
+    __table_args__ = (
+        UniqueConstraint("league_id", "user_id", name="unique_standing"),
+        Index("idx_standings_rank", "league_id", "rank"),
+    )
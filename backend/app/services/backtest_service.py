@@ -0,0 +1,275 @@
+"""
+Backtest Service
+Offline evaluation of the match prediction model against finished results.
+
+Each season is evaluated as one vectorized batch: model inputs for every
+finished match come from PredictionService.prepare_batch_inputs (a fixed
+number of queries), expected goals feed one score_model call, and the
+metrics are computed with NumPy. Seasons run in parallel in a process pool.
+A season's results are written in one transaction and then recorded on the
+run, so an interrupted run resumes from the first unfinished season.
+
+Player availability is taken as 1.0: only current FPL availability exists,
+and using it for past fixtures would leak information into the backtest.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Dict, List, Optional, Any
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import insert, delete, case
+from sqlmodel import Session, select, func, and_
+
+from app.core.pl_database import pl_engine
+from app.models.pl_data import Match, BacktestRun, BacktestResult, get_utc_now
+from app.services import score_model
+
+MODEL_VERSION = "v2"
+
+# Probabilities are clipped before taking logs
+LOG_LOSS_EPS = 1e-15
+
+
+def _init_worker():
+    """Pool initializer: don't reuse connections inherited from the parent process"""
+    pl_engine.dispose(close=False)
+
+
+def evaluate_season(season: str) -> List[Dict[str, Any]]:
+    """
+    Predict every finished match of a season as of its match date and score it.
+    Opens its own session, so it can run in a worker process.
+    """
+    from app.services.prediction_service import PredictionService
+    
+    with Session(pl_engine) as session:
+        matches = session.exec(
+            select(Match).where(
+                and_(
+                    Match.season == season,
+                    Match.status == "finished",
+                    Match.score_home.is_not(None),
+                    Match.score_away.is_not(None),
+                )
+            ).order_by(Match.match_date.asc())
+        ).all()
+        if not matches:
+            return []
+        
+        prediction_service = PredictionService(session)
+        prepared = prediction_service.prepare_batch_inputs(
+            [
+                {'home_team_id': m.home_team_id, 'away_team_id': m.away_team_id, 'match_date': m.match_date}
+                for m in matches
+            ],
+            season,
+        )
+        evaluated = [(m, inputs) for m, inputs in zip(matches, prepared) if inputs is not None]
+        if not evaluated:
+            return []
+        
+        expected_goals = np.array([
+            prediction_service._calculate_expected_goals(
+                inputs['home_elo'], inputs['away_elo'],
+                inputs['home_form'], inputs['away_form'],
+                1.0, 1.0,
+                inputs['h2h'],
+            )
+            for _, inputs in evaluated
+        ])
+    
+    matrices = score_model.score_matrix(expected_goals[:, 0], expected_goals[:, 1])
+    
+    # Outcome probabilities, renormalized over the truncated score grid
+    outcomes = score_model.outcome_probabilities(matrices)
+    outcomes /= outcomes.sum(axis=1, keepdims=True)
+    
+    best = matrices.reshape(len(matrices), -1).argmax(axis=1)
+    predicted_home, predicted_away = np.divmod(best, matrices.shape[-1])
+    actual_home = np.array([m.score_home for m, _ in evaluated])
+    actual_away = np.array([m.score_away for m, _ in evaluated])
+    
+    # Outcome index: 0 = home win, 1 = draw, 2 = away win
+    actual_outcome = 1 - np.sign(actual_home - actual_away)
+    predicted_outcome = 1 - np.sign(predicted_home - predicted_away)
+    
+    one_hot = np.eye(3)[actual_outcome]
+    brier = ((outcomes - one_hot) ** 2).sum(axis=1)
+    log_loss = -np.log(np.clip(outcomes[np.arange(len(outcomes)), actual_outcome], LOG_LOSS_EPS, 1.0))
+    exact = (predicted_home == actual_home) & (predicted_away == actual_away)
+    outcome_correct = predicted_outcome == actual_outcome
+    
+    return [
+        {
+            'match_id': match.id,
+            'season': season,
+            'match_date': match.match_date,
+            'home_team_id': match.home_team_id,
+            'away_team_id': match.away_team_id,
+            'predicted_home': int(predicted_home[i]),
+            'predicted_away': int(predicted_away[i]),
+            'actual_home': int(actual_home[i]),
+            'actual_away': int(actual_away[i]),
+            'home_win_prob': float(outcomes[i, 0]),
+            'draw_prob': float(outcomes[i, 1]),
+            'away_win_prob': float(outcomes[i, 2]),
+            'exact': bool(exact[i]),
+            'outcome_correct': bool(outcome_correct[i]),
+            'brier': float(brier[i]),
+            'log_loss': float(log_loss[i]),
+        }
+        for i, (match, _) in enumerate(evaluated)
+    ]
+
+
+def summarize_metrics(fixtures: int, exact: int, outcome_correct: int, brier_sum: float, log_loss_sum: float) -> Dict[str, Any]:
+    """
+    Aggregate metrics in the shape used by /predictions/accuracy.
+    Overall accuracy: exact score = 100 points, correct outcome only = 50, wrong = 0.
+    """
+    if not fixtures:
+        return {
+            'fixtures': 0,
+            'overallAccuracy': 0,
+            'exactScoreAccuracy': 0,
+            'outcomeAccuracy': 0,
+            'brierScore': None,
+            'logLoss': None,
+        }
+    points = exact * 100 + (outcome_correct - exact) * 50
+    return {
+        'fixtures': fixtures,
+        'overallAccuracy': round(points / fixtures, 1),
+        'exactScoreAccuracy': round(exact / fixtures * 100, 1),
+        'outcomeAccuracy': round(outcome_correct / fixtures * 100, 1),
+        'brierScore': round(brier_sum / fixtures, 4),
+        'logLoss': round(log_loss_sum / fixtures, 4),
+    }
+
+
+class BacktestService:
+    """Creates, runs and resumes backtest runs"""
+    
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+    
+    def create_run(self, seasons: List[str]) -> BacktestRun:
+        with Session(pl_engine) as session:
+            run = BacktestRun(seasons=list(seasons), model_version=MODEL_VERSION)
+            session.add(run)
+            session.commit()
+            session.refresh(run)
+            return run
+    
+    def run(self, run_id: UUID) -> Dict[str, Any]:
+        """Evaluate every season of the run not yet checkpointed, then store aggregates"""
+        with Session(pl_engine) as session:
+            run = session.get(BacktestRun, run_id)
+            if not run:
+                raise ValueError(f"Backtest run {run_id} not found")
+            remaining = [s for s in run.seasons if s not in (run.completed_seasons or [])]
+            run.status = "running"
+            run.error = None
+            run.started_at = run.started_at or get_utc_now()
+            run.updated_at = get_utc_now()
+            session.add(run)
+            session.commit()
+        
+        print(f"[Backtest] Run {run_id}: {len(remaining)} season(s) to evaluate: {remaining}")
+        
+        try:
+            if self.workers > 1 and len(remaining) > 1:
+                with ProcessPoolExecutor(
+                    max_workers=min(self.workers, len(remaining)), initializer=_init_worker,
+                ) as pool:
+                    futures = {pool.submit(evaluate_season, season): season for season in remaining}
+                    for future in as_completed(futures):
+                        self._store_season(run_id, futures[future], future.result())
+            else:
+                for season in remaining:
+                    self._store_season(run_id, season, evaluate_season(season))
+            
+            metrics = self.compute_metrics(run_id)
+        except Exception as e:
+            print(f"[Backtest] Run {run_id} failed: {e}")
+            with Session(pl_engine) as session:
+                run = session.get(BacktestRun, run_id)
+                run.status = "failed"
+                run.error = str(e)
+                run.updated_at = get_utc_now()
+                session.add(run)
+                session.commit()
+            raise
+        
+        with Session(pl_engine) as session:
+            run = session.get(BacktestRun, run_id)
+            run.status = "completed"
+            run.metrics = metrics
+            run.total_fixtures = metrics['overall']['fixtures']
+            run.finished_at = get_utc_now()
+            run.updated_at = run.finished_at
+            session.add(run)
+            session.commit()
+        
+        print(f"[Backtest] Run {run_id} completed: {metrics['overall']}")
+        return metrics
+    
+    def _store_season(self, run_id: UUID, season: str, rows: List[Dict[str, Any]]):
+        """Replace a season's results and checkpoint it, in one transaction"""
+        with Session(pl_engine) as session:
+            session.exec(
+                delete(BacktestResult).where(
+                    and_(BacktestResult.run_id == run_id, BacktestResult.season == season)
+                )
+            )
+            if rows:
+                session.exec(insert(BacktestResult), params=[{'run_id': run_id, **row} for row in rows])
+            
+            run = session.get(BacktestRun, run_id)
+            run.completed_seasons = [*(run.completed_seasons or []), season]
+            run.total_fixtures = (run.total_fixtures or 0) + len(rows)
+            run.updated_at = get_utc_now()
+            session.add(run)
+            session.commit()
+        print(f"[Backtest] Run {run_id}: stored {len(rows)} results for {season}")
+    
+    def compute_metrics(self, run_id: UUID) -> Dict[str, Any]:
+        """Per-season and overall aggregates for a run (one grouped query)"""
+        with Session(pl_engine) as session:
+            rows = session.exec(
+                select(
+                    BacktestResult.season,
+                    func.count(BacktestResult.id),
+                    func.sum(case((BacktestResult.exact == True, 1), else_=0)),
+                    func.sum(case((BacktestResult.outcome_correct == True, 1), else_=0)),
+                    func.sum(BacktestResult.brier),
+                    func.sum(BacktestResult.log_loss),
+                )
+                .where(BacktestResult.run_id == run_id)
+                .group_by(BacktestResult.season)
+            ).all()
+        
+        seasons = {}
+        totals = [0, 0, 0, 0.0, 0.0]
+        for season, *values in rows:
+            values = [v or 0 for v in values]
+            seasons[season] = summarize_metrics(*values)
+            totals = [t + v for t, v in zip(totals, values)]
+        
+        return {'overall': summarize_metrics(*totals), 'seasons': seasons}
+    
+    def get_latest_completed_run(self, session: Session) -> Optional[BacktestRun]:
+        """Most recently finished completed run (None before the first backtest)"""
+        return session.exec(
+            select(BacktestRun)
+            .where(BacktestRun.status == "completed")
+            .order_by(BacktestRun.finished_at.desc())
+        ).first()
+
+
+def run_backtest(seasons: List[str], workers: Optional[int] = None) -> Dict[str, Any]:
+    """Create and run a backtest (used by the CLI and the admin background task)"""
+    service = BacktestService(workers=workers)
+    run = service.create_run(seasons)
+    return service.run(run.id)
@@ -0,0 +1,74 @@
+"""
+Bootstrap Snapshot
+Indexed, pre-parsed view over one FPL bootstrap-static payload.
+
+Built once per bootstrap refresh (see FPLService.get_bootstrap_snapshot) so
+handlers get O(1) lookups instead of rebuilding id maps on every request.
+"""
+from typing import Dict, List, Optional, Any
+
+
+class BootstrapSnapshot:
+    """Lookup indexes for players, teams and events from bootstrap-static"""
+    
+    def __init__(self, bootstrap: Dict[str, Any]):
+        self.raw = bootstrap
+        self.events: List[Dict[str, Any]] = bootstrap.get('events', []) or []
+        self.teams_list: List[Dict[str, Any]] = bootstrap.get('teams', []) or []
+        self.players_list: List[Dict[str, Any]] = bootstrap.get('elements', []) or []
+        
+        self.teams: Dict[int, Dict[str, Any]] = {
+            t['id']: t for t in self.teams_list if isinstance(t, dict) and 'id' in t
+        }
+        self.players: Dict[int, Dict[str, Any]] = {
+            p['id']: p for p in self.players_list if isinstance(p, dict) and 'id' in p
+        }
+        self.events_by_id: Dict[int, Dict[str, Any]] = {
+            e['id']: e for e in self.events if isinstance(e, dict) and 'id' in e
+        }
+        
+        self.players_by_team: Dict[int, List[Dict[str, Any]]] = {}
+        for player in self.players.values():
+            self.players_by_team.setdefault(player.get('team'), []).append(player)
+        
+        self.current_event: Optional[Dict[str, Any]] = next(
+            (e for e in self.events if e.get('is_current')), None
+        )
+        self.next_event: Optional[Dict[str, Any]] = next(
+            (e for e in self.events if e.get('is_next')), None
+        )
+        if self.next_event is None and self.current_event is not None:
+            self.next_event = self.events_by_id.get(self.current_event['id'] + 1)
+        
+        finished = [e['id'] for e in self.events_by_id.values() if e.get('finished')]
+        self.last_finished_gameweek: Optional[int] = max(finished) if finished else None
+        self.max_gameweek: int = max(self.events_by_id, default=0)
+    
+    @property
+    def current_gameweek(self) -> Optional[int]:
+        """ID of the current gameweek, if the season is in progress"""
+        return self.current_event['id'] if self.current_event else None
+    
+    def get_player(self, player_id: int) -> Optional[Dict[str, Any]]:
+        """Player (element) by FPL ID"""
+        return self.players.get(player_id)
+    
+    def get_team(self, team_id: int) -> Optional[Dict[str, Any]]:
+        """Team by FPL ID"""
+        return self.teams.get(team_id)
+    
+    def get_event(self, gameweek: int) -> Optional[Dict[str, Any]]:
+        """Event (gameweek) by ID"""
+        return self.events_by_id.get(gameweek)
+    
+    def get_team_players(self, team_id: int) -> List[Dict[str, Any]]:
+        """All players registered to a team"""
+        return self.players_by_team.get(team_id, [])
+    
+    def team_name(self, team_id: Optional[int], default: str = 'Unknown') -> str:
+        team = self.teams.get(team_id)
+        return team.get('name', default) if team else default
+    
+    def team_short_name(self, team_id: Optional[int], default: str = 'TBD') -> str:
+        team = self.teams.get(team_id)
+        return team.get('short_name', default) if team else default
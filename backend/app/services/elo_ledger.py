@@ -0,0 +1,271 @@
+"""
+Elo Ledger
+Incremental Elo ratings, snapshotted after every match date of a season.
+
+Instead of replaying the whole season for every "ratings before date D"
+request, each season is replayed once into a sorted list of match dates and
+the ratings after each of them. A lookup is then a binary search. New results
+for a later date are appended incrementally; anything that rewrites history
+(an older or re-scored match) just invalidates the season.
+
+Ledgers are kept per process and revalidated against a cheap fingerprint of
+the season (finished-match count + last update) so results imported by other
+processes (CLI scripts, other workers) are picked up.
+
+Listeners (see add_listener) are told which teams' ratings changed, so data
+derived from ratings - cached predictions - can be evicted precisely.
+"""
+import threading
+from bisect import bisect_left
+from datetime import date, datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set, Tuple, Any
+
+from sqlmodel import Session, select, func, and_
+
+from app.models.pl_data import Match
+
+# Base Elo rating for new teams
+BASE_ELO = 1500
+# K-factor for Elo updates (higher = more volatile)
+ELO_K_FACTOR = 32
+# Home advantage in Elo points
+HOME_ELO_ADVANTAGE = 65
+
+# Share of the distance to BASE_ELO a team loses between seasons when carrying over
+CARRY_OVER_REGRESSION = 0.33
+
+# How often a ledger re-checks the database for results written elsewhere
+REVALIDATE_AFTER = timedelta(minutes=1)
+
+
+def apply_elo_result(ratings: Dict[str, float], match: Match):
+    """Update ratings in place with the result of one finished match"""
+    home_id = str(match.home_team_id)
+    away_id = str(match.away_team_id)
+    
+    # Initialize ratings if not exists
+    if home_id not in ratings:
+        ratings[home_id] = BASE_ELO
+    if away_id not in ratings:
+        ratings[away_id] = BASE_ELO
+    
+    # Get current ratings (with home advantage)
+    home_rating = ratings[home_id] + HOME_ELO_ADVANTAGE
+    away_rating = ratings[away_id]
+    
+    # Calculate expected scores
+    home_expected = 1 / (1 + 10 ** ((away_rating - home_rating) / 400))
+    away_expected = 1 - home_expected
+    
+    # Get actual result (1 = win, 0.5 = draw, 0 = loss)
+    home_score = match.score_home or 0
+    away_score = match.score_away or 0
+    
+    if home_score > away_score:
+        home_actual, away_actual = 1.0, 0.0
+    elif home_score < away_score:
+        home_actual, away_actual = 0.0, 1.0
+    else:
+        home_actual, away_actual = 0.5, 0.5
+    
+    # Update ratings
+    ratings[home_id] += ELO_K_FACTOR * (home_actual - home_expected)
+    ratings[away_id] += ELO_K_FACTOR * (away_actual - away_expected)
+
+
+def changed_teams(old: 'SeasonLedger', new: 'SeasonLedger') -> Set[str]:
+    """Teams whose end-of-ledger rating differs between two builds of a season"""
+    return {
+        team_id for team_id in set(old.final) | set(new.final)
+        if old.final.get(team_id) != new.final.get(team_id)
+    }
+
+
+def previous_season(season: str) -> Optional[str]:
+    """'2024-2025' -> '2023-2024'"""
+    try:
+        start, end = (int(part) for part in season.split('-'))
+    except ValueError:
+        return None
+    return f"{start - 1}-{end - 1}"
+
+
+class SeasonLedger:
+    """Ratings after each match date of one season"""
+    
+    def __init__(self, season: str, initial: Dict[str, float], fingerprint: Tuple[Any, ...]):
+        self.season = season
+        self.initial = initial
+        self.dates: List[date] = []
+        self.snapshots: List[Dict[str, float]] = []
+        self.fingerprint = fingerprint
+        self.checked_at = datetime.now()
+    
+    def replay(self, matches: List[Match]):
+        """Build snapshots from matches sorted by date"""
+        ratings = dict(self.initial)
+        for match in matches:
+            if self.dates and match.match_date == self.dates[-1]:
+                apply_elo_result(ratings, match)
+                self.snapshots[-1] = dict(ratings)
+            else:
+                apply_elo_result(ratings, match)
+                self.dates.append(match.match_date)
+                self.snapshots.append(dict(ratings))
+    
+    def append(self, match: Match) -> bool:
+        """Add a result dated after every known date; False if history would change"""
+        if self.dates and match.match_date <= self.dates[-1]:
+            return False
+        ratings = dict(self.snapshots[-1]) if self.snapshots else dict(self.initial)
+        apply_elo_result(ratings, match)
+        self.dates.append(match.match_date)
+        self.snapshots.append(ratings)
+        return True
+    
+    def ratings_before(self, before_date: date) -> Dict[str, float]:
+        """Ratings from all matches strictly before the date"""
+        idx = bisect_left(self.dates, before_date)
+        return self.snapshots[idx - 1] if idx else self.initial
+    
+    @property
+    def final(self) -> Dict[str, float]:
+        return self.snapshots[-1] if self.snapshots else self.initial
+
+
+class EloLedger:
+    """Per-season Elo snapshots with O(log n) "as of date" lookups"""
+    
+    def __init__(self, carry_over: bool = False, regression: float = CARRY_OVER_REGRESSION):
+        # Carry ratings across seasons (regressed toward the mean) instead of resetting to BASE_ELO
+        self.carry_over = carry_over
+        self.regression = regression
+        self._seasons: Dict[str, SeasonLedger] = {}
+        self._listeners: List[Callable[[Optional[str], Optional[Set[str]]], None]] = []
+        self._lock = threading.RLock()
+    
+    def add_listener(self, callback: Callable[[Optional[str], Optional[Set[str]]], None]):
+        """
+        Register callback(season, team_ids) for rating changes.
+        team_ids is None when every team may be affected; season is None for all seasons.
+        """
+        self._listeners.append(callback)
+    
+    def _notify(self, season: Optional[str], team_ids: Optional[Set[str]]):
+        for callback in self._listeners:
+            try:
+                callback(season, team_ids)
+            except Exception as e:
+                print(f"[Elo] Change listener failed: {e}")
+    
+    def _fingerprint(self, session: Session, season: str) -> Tuple[Any, ...]:
+        count, last_update = session.exec(
+            select(func.count(Match.id), func.max(Match.updated_at)).where(
+                and_(Match.season == season, Match.status == "finished")
+            )
+        ).one()
+        return (count, str(last_update))
+    
+    def _initial_ratings(self, session: Session, season: str) -> Dict[str, float]:
+        if not self.carry_over:
+            return {}
+        prior = previous_season(season)
+        if not prior:
+            return {}
+        # Don't recurse further back than needed: an empty prior season yields {}
+        prior_ledger = self._get_season(session, prior)
+        return {
+            team_id: BASE_ELO + (1 - self.regression) * (rating - BASE_ELO)
+            for team_id, rating in prior_ledger.final.items()
+        }
+    
+    def _build(self, session: Session, season: str) -> SeasonLedger:
+        fingerprint = self._fingerprint(session, season)
+        ledger = SeasonLedger(season, {}, fingerprint)
+        if fingerprint[0]:
+            ledger.initial = self._initial_ratings(session, season)
+            matches = session.exec(
+                select(Match).where(
+                    and_(Match.season == season, Match.status == "finished")
+                ).order_by(Match.match_date.asc(), Match.id.asc())
+            ).all()
+            ledger.replay(matches)
+        return ledger
+    
+    def _get_season(self, session: Session, season: str) -> SeasonLedger:
+        with self._lock:
+            ledger = self._seasons.get(season)
+            if ledger is not None and datetime.now() - ledger.checked_at >= REVALIDATE_AFTER:
+                if self._fingerprint(session, season) != ledger.fingerprint:
+                    # Results changed in another process
+                    return self._rebuild(session, season)
+                ledger.checked_at = datetime.now()
+            if ledger is None:
+                ledger = self._build(session, season)
+                self._seasons[season] = ledger
+            return ledger
+    
+    def _rebuild(self, session: Session, season: str) -> SeasonLedger:
+        """Replace a loaded season and report the teams whose ratings moved"""
+        if self.carry_over:
+            # Later seasons start from this one's ratings; drop everything
+            self.invalidate()
+            return self._get_season(session, season)
+        old = self._seasons.get(season)
+        ledger = self._build(session, season)
+        self._seasons[season] = ledger
+        self._notify(season, changed_teams(old, ledger) if old is not None else None)
+        return ledger
+    
+    def refresh(self, session: Session, season: str):
+        """
+        Revalidate an already loaded season (at most once per REVALIDATE_AFTER).
+        Cheap enough to call before serving data derived from ratings.
+        """
+        with self._lock:
+            if season in self._seasons:
+                self._get_season(session, season)
+    
+    def ratings_as_of(self, session: Session, season: str, before_date: date) -> Dict[str, float]:
+        """
+        Ratings for every team from the season's finished matches before the date.
+        The returned dict is shared - treat as read-only.
+        """
+        return self._get_season(session, season).ratings_before(before_date)
+    
+    def record_match(self, session: Session, match: Match):
+        """
+        Feed a newly committed finished result into the ledger.
+        Appends incrementally when it's later than every known date, otherwise
+        rebuilds the season.
+        """
+        if match.status != "finished":
+            return
+        with self._lock:
+            ledger = self._seasons.get(match.season)
+            if ledger is None:
+                # Nothing to update here, but ratings cached downstream are stale;
+                # without a ledger we can't tell which teams moved
+                self._notify(None if self.carry_over else match.season, None)
+                return
+            if ledger.append(match):
+                # Keep the fingerprint in step so this write doesn't force a rebuild
+                ledger.fingerprint = self._fingerprint(session, match.season)
+                self._notify(match.season, {str(match.home_team_id), str(match.away_team_id)})
+            else:
+                self._rebuild(session, match.season)
+    
+    def invalidate(self, season: Optional[str] = None):
+        """Drop one season (and later ones when carrying over), or everything"""
+        with self._lock:
+            if season is None or self.carry_over:
+                # Carried-over seasons depend on earlier ones; rebuild all
+                self._seasons.clear()
+                self._notify(None, None)
+            else:
+                self._seasons.pop(season, None)
+                self._notify(season, None)
+
+
+# Singleton instance (ratings reset each season, as before)
+elo_ledger = EloLedger()
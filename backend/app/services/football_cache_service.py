@@ -5,14 +5,19 @@ Football Cache Service - Caches football data to reduce API calls
 import asyncio
 from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional
+from app.core.cache import cache
 from app.services.football_api_service import football_api_service
 
+# Namespace in the shared cache
+CACHE_NAMESPACE = 'football'
+
 
 class FootballCacheService:
     """Service for caching football data with TTL"""
     
     def __init__(self):
-        self.cache: Dict[str, Dict[str, Any]] = {}
+        # Entries live in the shared two-tier cache so all workers see them
+        self.cache = cache
         self.cache_ttl = {
             'today': timedelta(minutes=5),  # Today's fixtures - refresh every 5 min
             'upcoming': timedelta(hours=1),  # Upcoming fixtures - refresh hourly
@@ -28,20 +33,6 @@ class FootballCacheService:
             key_parts.append(f'team:{team_id}')
         return ':'.join(key_parts)
     
-    def _is_cache_valid(self, cache_entry: Dict[str, Any], ttl: timedelta) -> bool:
-        """Check if cache entry is still valid"""
-        if not cache_entry:
-            return False
-        
-        cached_at = cache_entry.get('cached_at')
-        if not cached_at:
-            return False
-        
-        if isinstance(cached_at, str):
-            cached_at = datetime.fromisoformat(cached_at)
-        
-        return datetime.now() - cached_at < ttl
-    
     async def get_todays_fixtures(
         self,
         league_id: Optional[int] = None,
@@ -50,19 +41,16 @@ class FootballCacheService:
     ) -> List[Dict[str, Any]]:
         """Get today's fixtures with caching"""
         cache_key = self._get_cache_key('today', league_id, team_id)
-        cached = self.cache.get(cache_key)
+        cached = None if force_refresh else await self.cache.aget(CACHE_NAMESPACE, cache_key)
         
-        if not force_refresh and cached and self._is_cache_valid(cached, self.cache_ttl['today']):
-            return cached['data']
+        if cached is not None:
+            return cached
         
         # Fetch fresh data
         data = await football_api_service.get_todays_fixtures(league_id, team_id)
         
         # Update cache
-        self.cache[cache_key] = {
-            'data': data,
-            'cached_at': datetime.now(),
-        }
+        await self.cache.aset(CACHE_NAMESPACE, cache_key, data, ttl=self.cache_ttl['today'])
         
         return data
     
@@ -75,19 +63,16 @@ class FootballCacheService:
     ) -> List[Dict[str, Any]]:
         """Get upcoming fixtures with caching"""
         cache_key = self._get_cache_key(f'upcoming:{days}', league_id, team_id)
-        cached = self.cache.get(cache_key)
+        cached = None if force_refresh else await self.cache.aget(CACHE_NAMESPACE, cache_key)
         
-        if not force_refresh and cached and self._is_cache_valid(cached, self.cache_ttl['upcoming']):
-            return cached['data']
+        if cached is not None:
+            return cached
         
         # Fetch fresh data
         data = await football_api_service.get_upcoming_fixtures(days, league_id, team_id)
         
         # Update cache
-        self.cache[cache_key] = {
-            'data': data,
-            'cached_at': datetime.now(),
-        }
+        await self.cache.aset(CACHE_NAMESPACE, cache_key, data, ttl=self.cache_ttl['upcoming'])
         
         return data
     
@@ -100,28 +85,25 @@ class FootballCacheService:
     ) -> List[Dict[str, Any]]:
         """Get recent results with caching"""
         cache_key = self._get_cache_key(f'results:{days}', league_id, team_id)
-        cached = self.cache.get(cache_key)
+        cached = None if force_refresh else await self.cache.aget(CACHE_NAMESPACE, cache_key)
         
-        if not force_refresh and cached and self._is_cache_valid(cached, self.cache_ttl['results']):
-            return cached['data']
+        if cached is not None:
+            return cached
         
         # Fetch fresh data
         data = await football_api_service.get_recent_results(days, league_id, team_id)
         
         # Update cache
-        self.cache[cache_key] = {
-            'data': data,
-            'cached_at': datetime.now(),
-        }
+        await self.cache.aset(CACHE_NAMESPACE, cache_key, data, ttl=self.cache_ttl['results'])
         
         return data
     
     def clear_cache(self, cache_key: Optional[str] = None):
         """Clear cache (all or specific key)"""
         if cache_key:
-            self.cache.pop(cache_key, None)
+            self.cache.delete(CACHE_NAMESPACE, cache_key)
         else:
-            self.cache.clear()
+            self.cache.clear_namespace(CACHE_NAMESPACE)
 
 
 # Singleton instance
@@ -1,6 +1,14 @@
+import asyncio
 import httpx
-from typing import Optional, Dict, Any, List
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Dict, Any, List, Iterable
+from urllib.parse import urlencode
+from app.core.cache import cache
 from app.core.config import settings
+from app.services.bootstrap_snapshot import BootstrapSnapshot
+
+# Namespace prefix in the shared cache (one sub-namespace per endpoint)
+CACHE_NAMESPACE = 'fpl'
 
 
 class FPLService:
@@ -9,8 +17,129 @@ class FPLService:
     def __init__(self):
         self.base_url = settings.FPL_BASE_URL
         self.client = httpx.AsyncClient(timeout=30.0)
+        
+        # Responses are cached in the shared two-tier cache (local LRU + optional Redis)
+        # under "fpl:<endpoint>". Payloads are shared between callers - treat as read-only.
+        # Requests currently on the wire: request key -> task fetching the payload
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self.cache_ttl = {
+            'bootstrap': timedelta(minutes=5),       # Players, teams, events
+            'fixtures': timedelta(minutes=5),        # Season / gameweek fixtures
+            'kickoff': timedelta(hours=1),           # First kickoff per gameweek (picks deadline)
+            'live': timedelta(seconds=30),           # Live gameweek stats
+            'element_summary': timedelta(minutes=10),
+            'entry': timedelta(minutes=1),           # User team info
+            'picks': timedelta(minutes=5),           # Picks are fixed after the deadline
+            'history': timedelta(minutes=10),
+            'transfers': timedelta(minutes=1),
+            'league': timedelta(minutes=2),
+        }
+        # Indexed view of the most recent bootstrap payload
+        self._bootstrap_snapshot: Optional[BootstrapSnapshot] = None
+        self.cache_stats: Dict[str, Dict[str, int]] = {
+            endpoint: {'hits': 0, 'misses': 0, 'coalesced': 0, 'errors': 0}
+            for endpoint in self.cache_ttl
+        }
+    
+    def _cache_key(self, path: str, params: Optional[Dict[str, Any]]) -> str:
+        """Build the cache key for a request (full URL including sorted query params)"""
+        url = f"{self.base_url}{path}"
+        if params:
+            url = f"{url}?{urlencode(sorted(params.items()))}"
+        return url
     
-    async def get_bootstrap_static(self) -> Dict[str, Any]:
+    async def _get_json(
+        self,
+        endpoint: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        force_refresh: bool = False,
+        ttl: Optional[timedelta] = None,
+    ) -> Any:
+        """
+        GET an FPL endpoint through the response cache.
+        
+        Fresh cached payloads are returned directly. Otherwise the first caller
+        starts the upstream request in its own task and any concurrent callers
+        for the same key await that task instead of issuing their own. Every
+        caller awaits it through a shield, so a cancelled caller (the first
+        included) only cancels itself.
+        """
+        cache_key = self._cache_key(path, params)
+        namespace = f"{CACHE_NAMESPACE}:{endpoint}"
+        stats = self.cache_stats[endpoint]
+        
+        if not force_refresh:
+            cached = await cache.aget(namespace, cache_key)
+            if cached is not None:
+                stats['hits'] += 1
+                return cached
+        
+        inflight = self._inflight.get(cache_key)
+        if inflight is not None:
+            stats['coalesced'] += 1
+        else:
+            stats['misses'] += 1
+            inflight = asyncio.ensure_future(
+                self._fetch(endpoint, path, params, namespace, cache_key, ttl)
+            )
+            self._inflight[cache_key] = inflight
+            inflight.add_done_callback(lambda task: self._fetch_done(cache_key, task))
+        
+        return await asyncio.shield(inflight)
+    
+    async def _fetch(
+        self,
+        endpoint: str,
+        path: str,
+        params: Optional[Dict[str, Any]],
+        namespace: str,
+        cache_key: str,
+        ttl: Optional[timedelta],
+    ) -> Any:
+        """Issue one upstream request and cache its payload (runs as the in-flight task)"""
+        try:
+            response = await self.client.get(f"{self.base_url}{path}", params=params)
+            response.raise_for_status()
+            data = response.json()
+        except Exception:
+            self.cache_stats[endpoint]['errors'] += 1
+            raise
+        await cache.aset(
+            namespace, cache_key, data, ttl=ttl or self.cache_ttl[endpoint], size=len(response.content)
+        )
+        return data
+    
+    def _fetch_done(self, cache_key: str, task: asyncio.Task):
+        if self._inflight.get(cache_key) is task:
+            del self._inflight[cache_key]
+        # Mark the exception as retrieved in case every caller was cancelled
+        if not task.cancelled():
+            task.exception()
+    
+    def clear_cache(self, endpoint: Optional[str] = None):
+        """Clear cached responses (all, or only those for one endpoint)"""
+        if not endpoint:
+            cache.clear_namespace(CACHE_NAMESPACE)
+            return
+        cache.clear_namespace(f"{CACHE_NAMESPACE}:{endpoint}")
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss/coalesced counters per endpoint plus totals"""
+        totals = {'hits': 0, 'misses': 0, 'coalesced': 0, 'errors': 0}
+        for counters in self.cache_stats.values():
+            for name, value in counters.items():
+                totals[name] += value
+        lookups = totals['hits'] + totals['misses'] + totals['coalesced']
+        return {
+            'totals': totals,
+            'upstream_requests': totals['misses'],
+            'hit_rate': round((totals['hits'] + totals['coalesced']) / lookups, 3) if lookups else 0,
+            'endpoints': {name: dict(counters) for name, counters in self.cache_stats.items()},
+            'inflight': len(self._inflight),
+        }
+    
+    async def get_bootstrap_static(self, force_refresh: bool = False) -> Dict[str, Any]:
         """
         Get all static FPL data including:
         - All players (elements)
@@ -18,66 +147,119 @@ class FPLService:
         - All events (gameweeks)
         - Game settings
         """
-        response = await self.client.get(f"{self.base_url}/bootstrap-static/")
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json('bootstrap', '/bootstrap-static/', force_refresh=force_refresh)
+    
+    async def get_bootstrap_snapshot(self, force_refresh: bool = False) -> BootstrapSnapshot:
+        """
+        Get bootstrap-static as an indexed BootstrapSnapshot.
+        The snapshot is rebuilt only when a new bootstrap payload has been fetched.
+        """
+        bootstrap = await self.get_bootstrap_static(force_refresh=force_refresh)
+        snapshot = self._bootstrap_snapshot
+        if snapshot is None or snapshot.raw is not bootstrap:
+            snapshot = BootstrapSnapshot(bootstrap)
+            self._bootstrap_snapshot = snapshot
+        return snapshot
     
     async def get_player_summary(self, player_id: int) -> Dict[str, Any]:
         """Get detailed player data including fixture and history"""
-        response = await self.client.get(f"{self.base_url}/element-summary/{player_id}/")
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json('element_summary', f"/element-summary/{player_id}/")
     
-    async def get_fixtures(self) -> List[Dict[str, Any]]:
+    async def get_fixtures(self, force_refresh: bool = False) -> List[Dict[str, Any]]:
         """Get all fixtures for the season"""
-        response = await self.client.get(f"{self.base_url}/fixtures/")
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json('fixtures', '/fixtures/', force_refresh=force_refresh)
     
-    async def get_gameweek_fixtures(self, gameweek: int) -> List[Dict[str, Any]]:
+    async def get_gameweek_fixtures(self, gameweek: int, force_refresh: bool = False) -> List[Dict[str, Any]]:
         """Get fixtures for a specific gameweek"""
-        response = await self.client.get(f"{self.base_url}/fixtures/?event={gameweek}")
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json(
+            'fixtures', '/fixtures/', params={'event': gameweek}, force_refresh=force_refresh
+        )
+    
+    async def get_gameweek_first_kickoff(self, gameweek: int) -> Optional[str]:
+        """
+        Kickoff time of a gameweek's first fixture, or None if none is scheduled.
+        Kept far longer than the fixtures payload so deadline checks on the
+        submission path are served from cache.
+        """
+        namespace = f"{CACHE_NAMESPACE}:kickoff"
+        stats = self.cache_stats['kickoff']
+        cached = await cache.aget(namespace, str(gameweek))
+        if cached is not None:
+            stats['hits'] += 1
+            return cached
+        
+        stats['misses'] += 1
+        fixtures = await self.get_gameweek_fixtures(gameweek)
+        kickoff_times = [f["kickoff_time"] for f in fixtures if f.get("kickoff_time")]
+        if not kickoff_times:
+            return None
+        first_kickoff = min(kickoff_times)
+        await cache.aset(namespace, str(gameweek), first_kickoff, ttl=self.cache_ttl['kickoff'])
+        return first_kickoff
     
-    async def get_live_gameweek(self, gameweek: int) -> Dict[str, Any]:
+    async def get_live_gameweek(self, gameweek: int, force_refresh: bool = False) -> Dict[str, Any]:
         """Get live scores for a gameweek"""
-        response = await self.client.get(f"{self.base_url}/event/{gameweek}/live/")
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json('live', f"/event/{gameweek}/live/", force_refresh=force_refresh)
     
     async def get_user_team(self, team_id: int) -> Dict[str, Any]:
         """Get basic info about a user's FPL team"""
-        response = await self.client.get(f"{self.base_url}/entry/{team_id}/")
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json('entry', f"/entry/{team_id}/")
     
-    async def get_user_picks(self, team_id: int, gameweek: int) -> Dict[str, Any]:
+    async def get_user_picks(self, team_id: int, gameweek: int, ttl: Optional[timedelta] = None) -> Dict[str, Any]:
         """Get a user's squad picks for a specific gameweek"""
-        response = await self.client.get(f"{self.base_url}/entry/{team_id}/event/{gameweek}/picks/")
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json('picks', f"/entry/{team_id}/event/{gameweek}/picks/", ttl=ttl)
+    
+    async def get_gameweek_picks(
+        self,
+        team_ids: Iterable[int],
+        gameweek: int,
+        max_concurrency: int = 10,
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Picks of many FPL teams for one gameweek: team_id -> picks.
+        At most max_concurrency requests are on the wire at once. Picks are
+        fixed once the deadline has passed, so they are cached until the next
+        gameweek's deadline. Teams whose fetch fails are left out.
+        """
+        ttl = self.cache_ttl['picks']
+        snapshot = await self.get_bootstrap_snapshot()
+        next_event = snapshot.events_by_id.get(gameweek + 1)
+        if next_event and next_event.get('deadline_time'):
+            deadline = datetime.fromisoformat(next_event['deadline_time'].replace('Z', '+00:00'))
+            ttl = max(ttl, deadline - datetime.now(timezone.utc))
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def fetch(team_id: int):
+            async with semaphore:
+                data = await self.get_user_picks(team_id, gameweek, ttl=ttl)
+            return team_id, data.get('picks', [])
+        
+        results = await asyncio.gather(*(fetch(team_id) for team_id in set(team_ids)), return_exceptions=True)
+        picks = {}
+        for result in results:
+            if isinstance(result, BaseException):
+                print(f"[FPL] Picks fetch failed: {result}")
+                continue
+            team_id, team_picks = result
+            picks[team_id] = team_picks
+        return picks
     
     async def get_user_history(self, team_id: int) -> Dict[str, Any]:
         """Get a user's history (past seasons, chips, etc)"""
-        response = await self.client.get(f"{self.base_url}/entry/{team_id}/history/")
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json('history', f"/entry/{team_id}/history/")
     
     async def get_user_transfers(self, team_id: int) -> List[Dict[str, Any]]:
         """Get a user's transfer history"""
-        response = await self.client.get(f"{self.base_url}/entry/{team_id}/transfers/")
-        response.raise_for_status()
-        return response.json()
+        return await self._get_json('transfers', f"/entry/{team_id}/transfers/")
     
     async def get_classic_league(self, league_id: int, page: int = 1) -> Dict[str, Any]:
         """Get classic league standings"""
-        response = await self.client.get(
-            f"{self.base_url}/leagues-classic/{league_id}/standings/",
-            params={"page_standings": page}
+        return await self._get_json(
+            'league',
+            f"/leagues-classic/{league_id}/standings/",
+            params={"page_standings": page},
         )
-        response.raise_for_status()
-        return response.json()
     
     async def close(self):
         """Close the HTTP client"""
@@ -86,4 +268,3 @@ class FPLService:
 
 # Singleton instance
 fpl_service = FPLService()
-
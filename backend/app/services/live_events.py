@@ -0,0 +1,251 @@
+"""
+Live Events
+Player-level event detection and fan-out for live push notifications.
+
+The live feed is diffed once per poll, as a NumPy array, against the
+last-seen snapshot shared through live_stats_store, producing goal, assist,
+card, substitution and bonus events for the players that changed. Events reach subscribers through an inverted index of player_id ->
+subscription ids built from each subscription's picks, so a poll costs one
+pass over the feed plus one index lookup per event, however many
+subscribers share a player. Picks are fixed once the deadline has passed,
+so the index is kept for the whole gameweek and only subscriptions that
+appear or disappear are added or dropped.
+"""
+from collections import defaultdict
+from typing import Dict, List, Optional, Any, Iterable, Set
+
+import numpy as np
+from sqlmodel import Session, select
+
+from app.models.push_subscription import PushSubscription
+from app.models.user import User
+from app.services.fpl_service import fpl_service
+from app.services.live_stats_store import live_stats_store, from_live, pad_rows, COL, OBSERVED_COLUMNS
+
+# Picks requests on the wire at once when indexing new subscriptions
+PICKS_CONCURRENCY = 10
+
+# Stats whose increase is an event
+EVENT_STATS = ('goals', 'assists', 'yellow_cards', 'red_cards', 'bonus')
+EVENT_COLUMNS = [COL[name] for name in EVENT_STATS]
+
+# Columns that only rise within a gameweek (bonus can dip while provisional,
+# but a dip is not an event, and neither is winning the point back)
+MONOTONIC_COLUMNS = [COL[name] for name in ('present',) + EVENT_STATS + ('minutes',)]
+
+# Event type -> PushSubscription preference that enables it
+EVENT_PREFERENCES = {
+    'goal': 'notify_goals',
+    'assist': 'notify_assists',
+    'yellow': 'notify_yellow_cards',
+    'red': 'notify_red_cards',
+    'substitution': 'notify_substitutions',
+    'bonus': 'notify_bonus_points',
+}
+
+
+class LiveEventEngine:
+    """Diffs live stats against the shared snapshot; holds the player -> subscription index"""
+    
+    def __init__(self):
+        self.season: Optional[str] = None
+        self.gameweek: Optional[int] = None
+        self.picks_by_subscription: Dict[int, Set[int]] = {}  # subscription_id -> player_ids
+        self.subscribers_by_player: Dict[int, Set[int]] = defaultdict(set)  # player_id -> subscription_ids
+    
+    def start_gameweek(self, season: str, gameweek: int):
+        """Reset the index when the gameweek (or season) changes"""
+        if (season, gameweek) == (self.season, self.gameweek):
+            return
+        self.season = season
+        self.gameweek = gameweek
+        self.picks_by_subscription.clear()
+        self.subscribers_by_player.clear()
+    
+    # ==================== Subscription Index ====================
+    
+    def sync_subscriptions(self, active_ids: Iterable[int]) -> List[int]:
+        """Drop subscriptions no longer active; return active ids not yet indexed"""
+        active_ids = set(active_ids)
+        for subscription_id in list(self.picks_by_subscription):
+            if subscription_id not in active_ids:
+                self.drop_subscription(subscription_id)
+        return sorted(active_ids - self.picks_by_subscription.keys())
+    
+    def index_subscription(self, subscription_id: int, player_ids: Iterable[int]):
+        """Record the players a subscription follows this gameweek"""
+        self.drop_subscription(subscription_id)
+        players = set(player_ids)
+        self.picks_by_subscription[subscription_id] = players
+        for player_id in players:
+            self.subscribers_by_player[player_id].add(subscription_id)
+    
+    async def refresh_index(
+        self,
+        session: Session,
+        subscriptions: Dict[int, PushSubscription],
+        gameweek: int,
+    ) -> int:
+        """
+        Bring the index in line with the active subscriptions and return how
+        many were added. Users of new subscriptions are loaded in one query and
+        picks are fetched once per distinct FPL team, concurrently; once every
+        subscription is indexed this makes no queries or upstream calls.
+        """
+        new_ids = self.sync_subscriptions(subscriptions)
+        if not new_ids:
+            return 0
+        
+        user_ids = {subscriptions[subscription_id].user_id for subscription_id in new_ids}
+        team_by_user = {
+            user_id: team_id for user_id, team_id in session.exec(
+                select(User.id, User.fpl_team_id).where(User.id.in_(user_ids))
+            ).all() if team_id
+        }
+        picks_by_team = await fpl_service.get_gameweek_picks(
+            team_by_user.values(), gameweek, max_concurrency=PICKS_CONCURRENCY
+        )
+        
+        # Subscriptions without a team or whose picks failed are retried next poll
+        indexed = 0
+        for subscription_id in new_ids:
+            picks = picks_by_team.get(team_by_user.get(subscriptions[subscription_id].user_id))
+            if picks is None:
+                continue
+            self.index_subscription(subscription_id, [pick['element'] for pick in picks])
+            indexed += 1
+        return indexed
+    
+    def drop_subscription(self, subscription_id: int):
+        for player_id in self.picks_by_subscription.pop(subscription_id, ()):
+            subscribers = self.subscribers_by_player.get(player_id)
+            if subscribers is not None:
+                subscribers.discard(subscription_id)
+                if not subscribers:
+                    del self.subscribers_by_player[player_id]
+    
+    # ==================== Diff ====================
+    
+    def diff(
+        self,
+        session: Session,
+        season: str,
+        gameweek: int,
+        live_elements: Dict[int, Any],
+        players_info: Dict[int, Any],
+        teams_info: Dict[int, Any],
+    ) -> List[Dict[str, Any]]:
+        """
+        Compare the live feed with the shared last-seen snapshot and return
+        player events. The new snapshot is compare-and-swapped in first; if
+        another checker already advanced it, this poll returns no events.
+        The first poll of a gameweek only records state.
+        
+        The stored snapshot never moves backwards: each checker caches the
+        feed on its own, so a poll may see an older payload than the one
+        stored, and the cumulative columns are kept at their highest value
+        seen rather than rolled back (which would make the next fresh feed
+        announce everything since again).
+        
+        Delivery is at most once: the swap commits before the caller indexes
+        subscriptions and delivers, so if either step fails the events of
+        this transition are lost rather than sent twice.
+        """
+        version, prev = live_stats_store.load(session, season, gameweek)
+        current = from_live(live_elements)
+        
+        if prev is None:
+            live_stats_store.compare_and_swap(session, season, gameweek, 0, current)
+            return []
+        
+        rows = max(len(current), len(prev))
+        current, prev = pad_rows(current, rows), pad_rows(prev, rows)
+        
+        # An identical feed (e.g. the same cached payload seen by two checkers)
+        # carries no news - in particular it must not read as everyone stalling
+        if np.array_equal(current[:, OBSERVED_COLUMNS], prev[:, OBSERVED_COLUMNS]):
+            return []
+        
+        seen = (current[:, COL['present']] == 1) & (prev[:, COL['present']] == 1)
+        
+        gains = (current[:, EVENT_COLUMNS] > prev[:, EVENT_COLUMNS]) & seen[:, None]
+        
+        # Minutes stopped short of full time without a red card: subbed off.
+        # The flag is carried while minutes stay flat so it fires once.
+        minutes, prev_minutes = current[:, COL['minutes']], prev[:, COL['minutes']]
+        subbed_off = (
+            seen &
+            (minutes == prev_minutes) &
+            (prev_minutes > 0) & (prev_minutes < 90) &
+            (current[:, COL['red_cards']] == 0)
+        )
+        current[:, COL['subbed_off']] = subbed_off
+        new_subs = subbed_off & (prev[:, COL['subbed_off']] == 0)
+        
+        # Rows from an older feed keep what has already been seen
+        behind = (current[:, MONOTONIC_COLUMNS] < prev[:, MONOTONIC_COLUMNS]).any(axis=1)
+        current[behind, COL['subbed_off']] = prev[behind, COL['subbed_off']]
+        current[:, MONOTONIC_COLUMNS] = np.maximum(current[:, MONOTONIC_COLUMNS], prev[:, MONOTONIC_COLUMNS])
+        if np.array_equal(current, prev):
+            return []
+        
+        if not live_stats_store.compare_and_swap(session, season, gameweek, version, current):
+            print(f"[Notifications] GW{gameweek} live snapshot already advanced by another checker, skipping")
+            return []
+        
+        events = []
+        for player_id in np.flatnonzero(gains.any(axis=1) | new_subs).tolist():
+            player_info = players_info.get(player_id, {})
+            team_info = teams_info.get(player_info.get('team', 0), {})
+            player_name = player_info.get('web_name', 'Unknown')
+            team_name = team_info.get('short_name', 'UNK')
+            gained = dict(zip(EVENT_STATS, gains[player_id].tolist()))
+            
+            def event(event_type: str, title: str, body: str) -> Dict[str, Any]:
+                return {
+                    'type': event_type,
+                    'title': title,
+                    'body': body,
+                    'player_id': player_id,
+                    'player_name': player_name,
+                }
+            
+            if gained['goals']:
+                events.append(event('goal', f"⚽ GOAL! {player_name}", f"{player_name} has scored for {team_name}!"))
+            if gained['assists']:
+                events.append(event('assist', f"🅰️ ASSIST! {player_name}", f"{player_name} provided an assist for {team_name}!"))
+            if gained['yellow_cards']:
+                events.append(event('yellow', f"🟨 Yellow Card: {player_name}", f"{player_name} ({team_name}) has been booked"))
+            if gained['red_cards']:
+                events.append(event('red', f"🟥 RED CARD! {player_name}", f"{player_name} ({team_name}) has been sent off!"))
+            if new_subs[player_id]:
+                events.append(event(
+                    'substitution',
+                    f"🔄 Subbed Off: {player_name}",
+                    f"{player_name} ({team_name}) substituted at {int(minutes[player_id])}'",
+                ))
+            if gained['bonus']:
+                events.append(event(
+                    'bonus',
+                    f"⭐ Bonus: {player_name}",
+                    f"{player_name} ({team_name}) now has {int(current[player_id, COL['bonus']])} bonus point(s)",
+                ))
+        
+        return events
+    
+    # ==================== Fan-out ====================
+    
+    def fan_out(
+        self,
+        events: List[Dict[str, Any]],
+        subscriptions: Dict[int, Any],
+    ) -> Dict[int, List[Dict[str, Any]]]:
+        """Group events by subscription id, honouring each subscription's preferences"""
+        deliveries: Dict[int, List[Dict[str, Any]]] = defaultdict(list)
+        for event in events:
+            preference = EVENT_PREFERENCES[event['type']]
+            for subscription_id in self.subscribers_by_player.get(event['player_id'], ()):
+                subscription = subscriptions.get(subscription_id)
+                if subscription is not None and getattr(subscription, preference, True):
+                    deliveries[subscription_id].append(event)
+        return deliveries
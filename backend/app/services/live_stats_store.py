@@ -0,0 +1,143 @@
+"""
+Live Stats Store
+Shared, versioned last-seen live stats per gameweek.
+
+A snapshot is an int16 array with one row per player id (row index = id)
+and the fixed columns in COLUMNS, stored zlib-compressed in
+live_stats_snapshots, so diffing two polls is a handful of vectorised
+comparisons. Every checker - the worker, the cron endpoint on any web
+instance, a freshly restarted process - diffs the live feed against the
+stored snapshot and then compare-and-swaps its own snapshot in
+(UPDATE ... WHERE version = <version it read>). Only the checker whose swap
+succeeds sends the events for that transition, so polls are idempotent
+across processes and restarts.
+
+Snapshots are keyed by (season, gameweek): FPL reuses gameweek numbers and
+reassigns player ids every season. The first snapshot stored for a season
+deletes the previous seasons' rows.
+"""
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, Optional, Any, Tuple
+
+import numpy as np
+from sqlalchemy import insert, update, delete
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.models.push_subscription import LiveStatsSnapshot
+
+COLUMNS = ('present', 'goals', 'assists', 'yellow_cards', 'red_cards', 'bonus', 'minutes', 'subbed_off')
+COL = {name: idx for idx, name in enumerate(COLUMNS)}
+
+# Stat column -> key in the live feed's stats
+FEED_KEYS = {
+    'goals': 'goals_scored',
+    'assists': 'assists',
+    'yellow_cards': 'yellow_cards',
+    'red_cards': 'red_cards',
+    'bonus': 'bonus',
+    'minutes': 'minutes',
+}
+FEED_COLUMNS = [COL[name] for name in FEED_KEYS]
+# Columns taken straight from the feed (everything but derived flags)
+OBSERVED_COLUMNS = [COL['present']] + FEED_COLUMNS
+
+DTYPE = np.int16
+
+
+def from_live(live_elements: Dict[int, Any]) -> np.ndarray:
+    """Snapshot array for a live feed (players absent from the feed have present = 0)"""
+    stats = np.zeros((max(live_elements, default=0) + 1, len(COLUMNS)), dtype=DTYPE)
+    if not live_elements:
+        return stats
+    player_ids = np.fromiter(live_elements, dtype=np.int64, count=len(live_elements))
+    values = [
+        [(element.get('stats', {}).get(key, 0) or 0) for key in FEED_KEYS.values()]
+        for element in live_elements.values()
+    ]
+    stats[player_ids, COL['present']] = 1
+    stats[np.ix_(player_ids, FEED_COLUMNS)] = np.asarray(values, dtype=DTYPE)
+    return stats
+
+
+def season_of(event: Dict[str, Any]) -> str:
+    """FPL season of a bootstrap event, e.g. "2024-2025", from its deadline (seasons start in August)"""
+    deadline = event.get('deadline_time')
+    deadline = datetime.fromisoformat(deadline.replace('Z', '+00:00')) if deadline else datetime.now(timezone.utc)
+    start = deadline.year if deadline.month >= 7 else deadline.year - 1
+    return f"{start}-{start + 1}"
+
+
+def pad_rows(stats: np.ndarray, rows: int) -> np.ndarray:
+    """The array grown to `rows` player rows (new rows are absent players)"""
+    if len(stats) >= rows:
+        return stats
+    return np.vstack([stats, np.zeros((rows - len(stats), len(COLUMNS)), dtype=DTYPE)])
+
+
+def encode(stats: np.ndarray) -> bytes:
+    return zlib.compress(np.ascontiguousarray(stats, dtype=DTYPE).tobytes(), 6)
+
+
+def decode(blob: bytes) -> np.ndarray:
+    return np.frombuffer(zlib.decompress(blob), dtype=DTYPE).reshape(-1, len(COLUMNS)).copy()
+
+
+class LiveStatsStore:
+    """Reads and compare-and-swaps live_stats_snapshots rows"""
+    
+    def load(self, session: Session, season: str, gameweek: int) -> Tuple[int, Optional[np.ndarray]]:
+        """(version, stats) for a gameweek; (0, None) if nothing is stored yet"""
+        row = session.exec(
+            select(LiveStatsSnapshot.version, LiveStatsSnapshot.stats)
+            .where(LiveStatsSnapshot.season == season, LiveStatsSnapshot.gameweek == gameweek)
+        ).first()
+        if row is None:
+            return 0, None
+        version, blob = row
+        return version, decode(blob)
+    
+    def compare_and_swap(
+        self,
+        session: Session,
+        season: str,
+        gameweek: int,
+        expected_version: int,
+        stats: np.ndarray,
+    ) -> bool:
+        """
+        Store `stats` if the gameweek's snapshot is still at `expected_version`
+        (0 = not stored yet). Commits; returns False if another writer got there first.
+        """
+        now = datetime.now(timezone.utc)
+        blob = encode(stats)
+        
+        if expected_version == 0:
+            try:
+                # Earlier seasons' snapshots are never read again
+                session.execute(delete(LiveStatsSnapshot).where(LiveStatsSnapshot.season != season))
+                session.execute(insert(LiveStatsSnapshot).values(
+                    season=season, gameweek=gameweek, version=1, stats=blob, updated_at=now,
+                ))
+                session.commit()
+                return True
+            except IntegrityError:
+                session.rollback()
+                return False
+        
+        result = session.execute(
+            update(LiveStatsSnapshot)
+            .where(
+                LiveStatsSnapshot.season == season,
+                LiveStatsSnapshot.gameweek == gameweek,
+                LiveStatsSnapshot.version == expected_version,
+            )
+            .values(version=expected_version + 1, stats=blob, updated_at=now)
+        )
+        session.commit()
+        return result.rowcount == 1
+
+
+# Singleton instance
+live_stats_store = LiveStatsStore()
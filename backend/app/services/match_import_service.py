@@ -2,16 +2,43 @@
 Match Import Service
 Service for importing match data from JSON files
 Can be used by scripts or API endpoints
+
+run(bulk=True) imports a whole season set-based: a process pool reads and
+normalises the match files while a single writer, with teams, players and
+the season's existing matches pre-loaded into dicts, assigns UUIDs
+client-side and accumulates rows per table, writing one executemany INSERT
+per table every `batch_size` matches (one transaction per batch). Team
+form and Elo are rebuilt once at the end instead of per match.
+
+Bulk imports are incremental: the import_manifest table records each
+file's content hash, match id and rows per table. Files whose hash is
+unchanged are skipped without parsing; changed files (and matches
+imported before the manifest existed) keep their match id and have their
+child rows replaced in the batch's transaction. Incomplete matches are
+read from the manifest rather than counted per match. Per-match runs record
+their files too (record_file, with rows counted after the import); matches
+imported through import_match alone have no entry and are counted instead
+(unrecorded_incomplete_matches).
+
+run(from_index=True) streams a season's index.json one match at a time
+(see season_index) instead of reading per-match files.
 """
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from sqlmodel import Session, select
-from uuid import uuid4
+from typing import Dict, Any, List, Optional, Callable, Iterator, Set, Tuple
+from sqlmodel import Session, select, func
+from sqlalchemy import insert, update, delete, inspect, exists
+from uuid import UUID, uuid4
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import hashlib
 import json
+import os
+import time
 
 from app.core.pl_database import pl_engine, create_pl_db_and_tables
 from app.models.pl_data import (
+    get_utc_now,
     Team,
     Player,
     Match,
@@ -19,7 +46,35 @@ from app.models.pl_data import (
     MatchEvent,
     Lineup,
     TeamStats,
+    ImportManifest,
 )
+from app.services.elo_ledger import elo_ledger
+from app.services.season_index import iter_index_matches, transform_match_data
+from app.services.team_form_service import team_form_service
+
+# Matches written per transaction in bulk mode
+DEFAULT_BATCH_SIZE = 50
+# Files handed to a parser process at a time
+PARSE_CHUNKSIZE = 8
+
+# Tables in insertion (foreign key) order
+BULK_TABLES = [Team, Player, Match, Lineup, MatchEvent, MatchPlayerStats, TeamStats, ImportManifest]
+
+# Per-match tables -> name used in manifest row counts and missing lists
+CHILD_TABLES = {
+    MatchPlayerStats: "player_stats",
+    TeamStats: "team_stats",
+    MatchEvent: "events",
+    Lineup: "lineups",
+}
+
+
+def _missing(row_counts: Dict[str, int], score_home: Optional[int], score_away: Optional[int]) -> List[str]:
+    """What a match lacks: "scores" and any per-match table without rows"""
+    missing = [name for name, count in row_counts.items() if count == 0]
+    if score_home is None or score_away is None:
+        missing.insert(0, "scores")
+    return missing
 
 
 class MatchImportService:
@@ -33,6 +88,15 @@ class MatchImportService:
         self.players_cache: Dict[str, Player] = {}
         self.stats_imported = 0
         self.errors: List[str] = []
+        # Bulk mode: fbref_id -> id, (date, home, away) -> match id, manifest path -> (hash, match id)
+        self.team_ids: Dict[str, UUID] = {}
+        self.player_ids: Dict[str, UUID] = {}
+        self.known_matches: Dict[Tuple[Any, UUID, UUID], UUID] = {}
+        self.manifest: Dict[str, Tuple[str, UUID]] = {}
+        self.run_match_ids: set = set()  # matches written by this run
+        # Pending rows per model, and existing matches to update (child rows are replaced)
+        self.pending: Dict[type, List[Dict[str, Any]]] = {model: [] for model in BULK_TABLES}
+        self.replaced: Dict[UUID, Dict[str, Any]] = {}
     
     def _parse_minute(self, minute_str: Any) -> Optional[int]:
         """Parse minute string, handling injury time notation like '90+2'"""
@@ -48,13 +112,17 @@ class MatchImportService:
             return int(minute_str)
         except (ValueError, TypeError):
             return None
-        
+    
+    def _team_key(self, name: str, fbref_id: Optional[str]) -> str:
+        """fbref_id, or a name-based hash when it's missing"""
+        if not fbref_id or not fbref_id.strip():
+            return hashlib.md5(name.lower().encode()).hexdigest()[:8]
+        return fbref_id
+    
     def get_or_create_team(self, session: Session, name: str, fbref_id: Optional[str] = None) -> Team:
         """Get existing team or create new one"""
         # Generate fallback fbref_id if missing (use name-based hash)
-        if not fbref_id or not fbref_id.strip():
-            import hashlib
-            fbref_id = hashlib.md5(name.lower().encode()).hexdigest()[:8]
+        fbref_id = self._team_key(name, fbref_id)
         
         cache_key = fbref_id
         if cache_key in self.teams_cache:
@@ -101,9 +169,44 @@ class MatchImportService:
         self.players_cache[cache_key] = player
         return player
     
+    def _match_row(self, match_data: Dict[str, Any], home_team_id: UUID, away_team_id: UUID) -> Dict[str, Any]:
+        """Match fields from JSON data"""
+        match_info = match_data.get("match_info", {})
+        home_team_data = match_data.get("home_team", {})
+        away_team_data = match_data.get("away_team", {})
+        
+        # Handle scores - 0 is a valid score, so check for None explicitly
+        home_score = match_info.get("home_score")
+        away_score = match_info.get("away_score")
+        # If scores are None, try to get from score object (for backwards compatibility)
+        if home_score is None:
+            home_score = match_data.get("score", {}).get("home")
+        if away_score is None:
+            away_score = match_data.get("score", {}).get("away")
+        
+        return {
+            "season": self.season,
+            "match_date": datetime.strptime(match_info.get("date", ""), "%Y-%m-%d").date(),
+            "home_team_id": home_team_id,
+            "away_team_id": away_team_id,
+            "score_home": home_score,
+            "score_away": away_score,
+            "status": "finished",
+            "venue": match_info.get("venue"),
+            "referee": match_info.get("referee"),
+            "attendance": match_info.get("attendance"),
+            "home_manager": home_team_data.get("manager"),
+            "away_manager": away_team_data.get("manager"),
+            "home_captain": home_team_data.get("captain"),
+            "away_captain": away_team_data.get("captain"),
+        }
+    
     def import_match(self, session: Session, match_data: Dict[str, Any]) -> Match:
         """Import a single match from JSON data"""
-        match_info = match_data.get("match_info", {})
+        return self._import_match(session, match_data)[0]
+    
+    def _import_match(self, session: Session, match_data: Dict[str, Any]) -> Tuple[Match, bool]:
+        """import_match, also returning whether the match was created (False: it already existed)"""
         home_team_data = match_data.get("home_team", {})
         away_team_data = match_data.get("away_team", {})
         
@@ -119,14 +222,11 @@ class MatchImportService:
             away_team_data.get("fbref_id", "")
         )
         
-        # Parse date
-        from datetime import datetime
-        date_str = match_info.get("date", "")
-        match_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        match_row = self._match_row(match_data, home_team.id, away_team.id)
         
         # Check if match already exists
         statement = select(Match).where(
-            Match.match_date == match_date,
+            Match.match_date == match_row["match_date"],
             Match.home_team_id == home_team.id,
             Match.away_team_id == away_team.id,
             Match.season == self.season
@@ -134,39 +234,20 @@ class MatchImportService:
         existing_match = session.exec(statement).first()
         
         if existing_match:
-            return existing_match  # Skip if already exists
+            return existing_match, False  # Skip if already exists
         
         # Create match
-        # Handle scores - 0 is a valid score, so check for None explicitly
-        home_score = match_info.get("home_score")
-        away_score = match_info.get("away_score")
-        # If scores are None, try to get from score object (for backwards compatibility)
-        if home_score is None:
-            home_score = match_data.get("score", {}).get("home")
-        if away_score is None:
-            away_score = match_data.get("score", {}).get("away")
-        
-        match = Match(
-            id=uuid4(),
-            season=self.season,
-            match_date=match_date,
-            home_team_id=home_team.id,
-            away_team_id=away_team.id,
-            score_home=home_score,
-            score_away=away_score,
-            status="finished",
-            venue=match_info.get("venue"),
-            referee=match_info.get("referee"),
-            attendance=match_info.get("attendance"),
-            home_manager=home_team_data.get("manager"),
-            away_manager=away_team_data.get("manager"),
-            home_captain=home_team_data.get("captain"),
-            away_captain=away_team_data.get("captain"),
-        )
+        match = Match(id=uuid4(), **match_row)
         session.add(match)
         session.commit()
         session.refresh(match)
         
+        # Keep materialized team form current
+        team_form_service.record_match(session, match)
+        session.commit()
+        # Keep in-process Elo ratings current (also evicts the teams' cached predictions)
+        elo_ledger.record_match(session, match)
+        
         # Import related data with error handling
         try:
             self._import_lineups(session, match, match_data.get("lineups", {}), home_team, away_team)
@@ -193,237 +274,176 @@ class MatchImportService:
             print(f"[Import] Error importing team stats: {e}")
         
         session.commit()
-        return match
+        return match, True
     
-    def _import_lineups(self, session: Session, match: Match, lineups_data: Dict[str, Any],
-                       home_team: Team, away_team: Team):
-        """Import lineups"""
-        if "home" in lineups_data:
-            home_lineup = lineups_data["home"]
-            lineup = Lineup(
-                id=uuid4(),
-                match_id=match.id,
-                team_id=home_team.id,
-                is_home=True,
-                formation=home_lineup.get("formation"),
-                starting_xi=home_lineup.get("starting_xi", []),
-                substitutes=home_lineup.get("substitutes", []),
-            )
-            session.add(lineup)
-        
-        if "away" in lineups_data:
-            away_lineup = lineups_data["away"]
-            lineup = Lineup(
-                id=uuid4(),
-                match_id=match.id,
-                team_id=away_team.id,
-                is_home=False,
-                formation=away_lineup.get("formation"),
-                starting_xi=away_lineup.get("starting_xi", []),
-                substitutes=away_lineup.get("substitutes", []),
-            )
-            session.add(lineup)
+    # ==================== Row builders (shared by both modes) ====================
     
-    def _import_events(self, session: Session, match: Match, events_data: Dict[str, Any],
-                      home_team: Team, away_team: Team):
-        """Import match events"""
-        # Import goals
+    def _lineup_rows(self, match_id: UUID, lineups_data: Dict[str, Any],
+                     home_team_id: UUID, away_team_id: UUID) -> List[Dict[str, Any]]:
+        rows = []
+        for side, team_id, is_home in (("home", home_team_id, True), ("away", away_team_id, False)):
+            if side not in lineups_data:
+                continue
+            lineup = lineups_data[side]
+            rows.append({
+                "match_id": match_id,
+                "team_id": team_id,
+                "is_home": is_home,
+                "formation": lineup.get("formation"),
+                "starting_xi": lineup.get("starting_xi", []),
+                "substitutes": lineup.get("substitutes", []),
+            })
+        return rows
+    
+    def _event_rows(self, match_id: UUID, events_data: Dict[str, Any],
+                    home_team_id: UUID, away_team_id: UUID,
+                    find_player: Callable[[Optional[str]], Optional[UUID]]) -> List[Dict[str, Any]]:
+        """Goal, card and substitution rows; find_player maps an fbref_id to a player id"""
+        rows = []
+        
+        def team_id(event: Dict[str, Any]) -> UUID:
+            return home_team_id if event.get("team") == "home" else away_team_id
+        
         for goal in events_data.get("goals", []):
-            player_id = goal.get("player_id")
-            player = None
-            if player_id:
-                statement = select(Player).where(Player.fbref_id == player_id)
-                player = session.exec(statement).first()
-            
-            team = home_team if goal.get("team") == "home" else away_team
-            minute = self._parse_minute(goal.get("minute"))
-            
-            event = MatchEvent(
-                id=uuid4(),
-                match_id=match.id,
-                event_type="goal",
-                minute=minute,
-                player_id=player.id if player else None,
-                team_id=team.id,
-                details={
+            rows.append({
+                "match_id": match_id,
+                "event_type": "goal",
+                "minute": self._parse_minute(goal.get("minute")),
+                "player_id": find_player(goal.get("player_id")),
+                "team_id": team_id(goal),
+                "details": {
                     "player_name": goal.get("player_name"),
                     "assist_player": goal.get("assist_player"),
                     "assist_player_id": goal.get("assist_player_id"),
-                }
-            )
-            session.add(event)
+                },
+            })
         
-        # Import cards
         for card in events_data.get("cards", []):
-            player_id = card.get("player_id")
-            player = None
-            if player_id:
-                statement = select(Player).where(Player.fbref_id == player_id)
-                player = session.exec(statement).first()
-            
-            team = home_team if card.get("team") == "home" else away_team
-            minute = self._parse_minute(card.get("minute"))
-            
-            event = MatchEvent(
-                id=uuid4(),
-                match_id=match.id,
-                event_type="card",
-                minute=minute,
-                player_id=player.id if player else None,
-                team_id=team.id,
-                details={
+            rows.append({
+                "match_id": match_id,
+                "event_type": "card",
+                "minute": self._parse_minute(card.get("minute")),
+                "player_id": find_player(card.get("player_id")),
+                "team_id": team_id(card),
+                "details": {
                     "card_type": card.get("card_type") or card.get("type"),
                     "player_name": card.get("player_name"),
-                }
-            )
-            session.add(event)
+                },
+            })
         
-        # Import substitutions
         for sub in events_data.get("substitutions", []):
             player_in_id = sub.get("player_in_id")
             player_out_id = sub.get("player_out_id")
-            
-            player_in = None
-            player_out = None
-            
-            if player_in_id:
-                statement = select(Player).where(Player.fbref_id == player_in_id)
-                player_in = session.exec(statement).first()
-            if player_out_id:
-                statement = select(Player).where(Player.fbref_id == player_out_id)
-                player_out = session.exec(statement).first()
-            
-            team = home_team if sub.get("team") == "home" else away_team
-            minute = self._parse_minute(sub.get("minute"))
-            
-            event = MatchEvent(
-                id=uuid4(),
-                match_id=match.id,
-                event_type="substitution",
-                minute=minute,
-                player_id=player_out.id if player_out else None,
-                team_id=team.id,
-                details={
+            rows.append({
+                "match_id": match_id,
+                "event_type": "substitution",
+                "minute": self._parse_minute(sub.get("minute")),
+                "player_id": find_player(player_out_id),
+                "team_id": team_id(sub),
+                "details": {
                     "player_in_name": sub.get("player_in"),
                     "player_in_id": player_in_id,
                     "player_out_name": sub.get("player_out"),
                     "player_out_id": player_out_id,
-                }
-            )
-            session.add(event)
+                },
+            })
+        return rows
+    
+    def _player_stat_rows(self, match_id: UUID, player_stats_data: Dict[str, Any],
+                          home_team_id: UUID, away_team_id: UUID,
+                          player_for: Callable[[Dict[str, Any], UUID], UUID]) -> List[Dict[str, Any]]:
+        """Per-player rows; player_for returns (creating if needed) the stat's player id"""
+        rows = []
+        for side, team_id in (("home", home_team_id), ("away", away_team_id)):
+            for stat in player_stats_data.get(side, []):
+                rows.append({
+                    "match_id": match_id,
+                    "player_id": player_for(stat, team_id),
+                    "team_id": team_id,
+                    "minutes": stat.get("minutes"),
+                    "goals": stat.get("goals", 0),
+                    "assists": stat.get("assists", 0),
+                    "shots": stat.get("shots"),
+                    "shots_on_target": stat.get("shots_on_target"),
+                    "passes": stat.get("passes"),
+                    "pass_accuracy": stat.get("pass_accuracy"),
+                    "tackles": stat.get("tackles"),
+                    "interceptions": stat.get("interceptions"),
+                    "fouls": stat.get("fouls"),
+                    "cards": stat.get("cards"),
+                })
+        return rows
+    
+    def _team_stat_rows(self, match_id: UUID, team_stats_data: Dict[str, Any],
+                        home_team_id: UUID, away_team_id: UUID) -> List[Dict[str, Any]]:
+        rows = []
+        for side, team_id, is_home in (("home", home_team_id, True), ("away", away_team_id, False)):
+            if side not in team_stats_data:
+                continue
+            stats = team_stats_data[side]
+            rows.append({
+                "match_id": match_id,
+                "team_id": team_id,
+                "is_home": is_home,
+                "possession": stats.get("possession"),
+                "passes": stats.get("passes"),
+                "pass_accuracy": stats.get("pass_accuracy"),
+                "shots": stats.get("shots"),
+                "shots_on_target": stats.get("shots_on_target"),
+                "tackles": stats.get("tackles"),
+                "interceptions": stats.get("interceptions"),
+                "clearances": stats.get("clearances"),
+            })
+        return rows
+    
+    # ==================== Per-match mode ====================
+    
+    def _import_lineups(self, session: Session, match: Match, lineups_data: Dict[str, Any],
+                       home_team: Team, away_team: Team):
+        """Import lineups"""
+        for row in self._lineup_rows(match.id, lineups_data, home_team.id, away_team.id):
+            session.add(Lineup(id=uuid4(), **row))
+    
+    def _import_events(self, session: Session, match: Match, events_data: Dict[str, Any],
+                      home_team: Team, away_team: Team):
+        """Import match events"""
+        def find_player(fbref_id: Optional[str]) -> Optional[UUID]:
+            if not fbref_id:
+                return None
+            statement = select(Player).where(Player.fbref_id == fbref_id)
+            player = session.exec(statement).first()
+            return player.id if player else None
+        
+        for row in self._event_rows(match.id, events_data, home_team.id, away_team.id, find_player):
+            session.add(MatchEvent(id=uuid4(), **row))
     
     def _import_player_stats(self, session: Session, match: Match, player_stats_data: Dict[str, Any],
                             home_team: Team, away_team: Team):
         """Import player statistics"""
-        # Home team stats
-        for stat in player_stats_data.get("home", []):
-            player = self.get_or_create_player(
+        def player_for(stat: Dict[str, Any], team_id: UUID) -> UUID:
+            return self.get_or_create_player(
                 session,
                 stat.get("player_name", ""),
                 stat.get("player_id", ""),
                 stat.get("position"),
-                home_team.id,
-            )
-            
-            stats = MatchPlayerStats(
-                id=uuid4(),
-                match_id=match.id,
-                player_id=player.id,
-                team_id=home_team.id,
-                minutes=stat.get("minutes"),
-                goals=stat.get("goals", 0),
-                assists=stat.get("assists", 0),
-                shots=stat.get("shots"),
-                shots_on_target=stat.get("shots_on_target"),
-                passes=stat.get("passes"),
-                pass_accuracy=stat.get("pass_accuracy"),
-                tackles=stat.get("tackles"),
-                interceptions=stat.get("interceptions"),
-                fouls=stat.get("fouls"),
-                cards=stat.get("cards"),
-            )
-            session.add(stats)
+                team_id,
+            ).id
         
-        # Away team stats
-        for stat in player_stats_data.get("away", []):
-            player = self.get_or_create_player(
-                session,
-                stat.get("player_name", ""),
-                stat.get("player_id", ""),
-                stat.get("position"),
-                away_team.id,
-            )
-            
-            stats = MatchPlayerStats(
-                id=uuid4(),
-                match_id=match.id,
-                player_id=player.id,
-                team_id=away_team.id,
-                minutes=stat.get("minutes"),
-                goals=stat.get("goals", 0),
-                assists=stat.get("assists", 0),
-                shots=stat.get("shots"),
-                shots_on_target=stat.get("shots_on_target"),
-                passes=stat.get("passes"),
-                pass_accuracy=stat.get("pass_accuracy"),
-                tackles=stat.get("tackles"),
-                interceptions=stat.get("interceptions"),
-                fouls=stat.get("fouls"),
-                cards=stat.get("cards"),
-            )
-            session.add(stats)
+        for row in self._player_stat_rows(match.id, player_stats_data, home_team.id, away_team.id, player_for):
+            session.add(MatchPlayerStats(id=uuid4(), **row))
     
     def _import_team_stats(self, session: Session, match: Match, team_stats_data: Dict[str, Any],
                           home_team: Team, away_team: Team):
         """Import team statistics"""
-        if "home" in team_stats_data:
-            home_stats = team_stats_data["home"]
-            stats = TeamStats(
-                id=uuid4(),
-                match_id=match.id,
-                team_id=home_team.id,
-                is_home=True,
-                possession=home_stats.get("possession"),
-                passes=home_stats.get("passes"),
-                pass_accuracy=home_stats.get("pass_accuracy"),
-                shots=home_stats.get("shots"),
-                shots_on_target=home_stats.get("shots_on_target"),
-                tackles=home_stats.get("tackles"),
-                interceptions=home_stats.get("interceptions"),
-                clearances=home_stats.get("clearances"),
-            )
-            session.add(stats)
-        
-        if "away" in team_stats_data:
-            away_stats = team_stats_data["away"]
-            stats = TeamStats(
-                id=uuid4(),
-                match_id=match.id,
-                team_id=away_team.id,
-                is_home=False,
-                possession=away_stats.get("possession"),
-                passes=away_stats.get("passes"),
-                pass_accuracy=away_stats.get("pass_accuracy"),
-                shots=away_stats.get("shots"),
-                shots_on_target=away_stats.get("shots_on_target"),
-                tackles=away_stats.get("tackles"),
-                interceptions=away_stats.get("interceptions"),
-                clearances=away_stats.get("clearances"),
-            )
-            session.add(stats)
+        for row in self._team_stat_rows(match.id, team_stats_data, home_team.id, away_team.id):
+            session.add(TeamStats(id=uuid4(), **row))
     
-    def run(self) -> Dict[str, Any]:
-        """Run the import process"""
-        print(f"\n{'='*60}")
-        print(f"Importing Match Data for Season: {self.season}")
-        print(f"{'='*60}\n")
-        
-        # Verify tables exist (don't try to create to avoid metadata conflicts)
-        from sqlalchemy import inspect
-        from app.core.pl_database import pl_engine
+    def _ensure_tables(self):
+        """Verify the PL data tables exist, creating missing ones"""
+        # Don't try to create when all exist, to avoid metadata conflicts
         inspector = inspect(pl_engine)
         existing_tables = inspector.get_table_names()
-        expected_tables = ["teams", "players", "matches", "match_player_stats", "match_events", "lineups", "team_stats"]
+        expected_tables = ["teams", "players", "matches", "match_player_stats", "match_events", "lineups", "team_stats", "import_manifest"]
         missing_tables = set(expected_tables) - set(existing_tables)
         
         if missing_tables:
@@ -450,6 +470,17 @@ class MatchImportService:
                     raise
         else:
             print("[Import] All PL data tables exist, proceeding with import")
+    
+    def run(self, bulk: bool = False, batch_size: int = DEFAULT_BATCH_SIZE,
+            workers: Optional[int] = None, from_index: bool = False) -> Dict[str, Any]:
+        """Run the import process (per match, or set-based with bulk=True; from_index implies bulk)"""
+        print(f"\n{'='*60}")
+        print(f"Importing Match Data for Season: {self.season}")
+        print(f"{'='*60}\n")
+        
+        self._ensure_tables()
+        if bulk or from_index:
+            return self.run_bulk(batch_size, workers, from_index)
         
         # Get all match files
         match_files = sorted(self.match_dir.glob("*.json"))
@@ -457,33 +488,539 @@ class MatchImportService:
         
         print(f"Found {total_matches} match files\n")
         
-        from app.core.pl_database import pl_engine
-        from sqlmodel import Session
-        
+        unchanged = 0
+        updated = 0
         with Session(pl_engine) as session:
+            recorded = dict(session.exec(
+                select(ImportManifest.path, ImportManifest.content_hash)
+                .where(ImportManifest.season == self.season)
+            ).all())
+            # Changed files, and unrecorded files of matches already in the
+            # database: their rows are replaced in place (and recorded) at the end
+            replace = []
+            created_ids = set()
+            
             for i, match_file in enumerate(match_files, 1):
                 print(f"[{i}/{total_matches}] Processing: {match_file.name}")
                 
                 try:
-                    with open(match_file, 'r', encoding='utf-8') as f:
-                        match_data = json.load(f)
+                    raw = match_file.read_bytes()
+                    path = self._manifest_path(match_file)
+                    if path in recorded:
+                        if recorded[path] == hashlib.sha256(raw).hexdigest():
+                            unchanged += 1
+                            print(f"  - Skipped (unchanged): {match_file.name}")
+                        else:
+                            replace.append(match_file)
+                        continue
                     
-                    match = self.import_match(session, match_data)
-                    if match:
+                    match, created = self._import_match(session, json.loads(raw))
+                    if created:
+                        created_ids.add(match.id)
+                        self.record_file(session, match_file, match)
                         self.stats_imported += 1
                         print(f"  ✓ Imported: {match_file.name}")
                     else:
-                        print(f"  - Skipped (already exists): {match_file.name}")
-                        
+                        replace.append(match_file)
+                
                 except Exception as e:
                     error_msg = f"Error processing {match_file.name}: {str(e)}"
                     print(f"  ✗ ERROR: {error_msg}")
                     self.errors.append(error_msg)
                     session.rollback()
+            
+            if replace:
+                print(f"\nReplacing {len(replace)} changed or unrecorded match file(s)")
+                updated = self._replace_files(session, replace, created_ids)
         
         return {
             "imported": self.stats_imported,
+            "updated": updated,
+            "unchanged": unchanged,
             "total": total_matches,
             "errors": self.errors,
         }
+    
+    # ==================== Bulk mode ====================
+    
+    def _preload(self, session: Session):
+        """Load team/player ids, the season's existing matches and its manifest into dicts"""
+        self.team_ids = dict(session.exec(select(Team.fbref_id, Team.id)).all())
+        self.player_ids = dict(session.exec(select(Player.fbref_id, Player.id)).all())
+        self.known_matches = {
+            (match_date, home_team_id, away_team_id): match_id
+            for match_id, match_date, home_team_id, away_team_id in session.exec(
+                select(Match.id, Match.match_date, Match.home_team_id, Match.away_team_id)
+                .where(Match.season == self.season)
+            ).all()
+        }
+        self.manifest = {
+            path: (content_hash, match_id)
+            for path, content_hash, match_id in session.exec(
+                select(ImportManifest.path, ImportManifest.content_hash, ImportManifest.match_id)
+                .where(ImportManifest.season == self.season)
+            ).all()
+        }
+    
+    def _manifest_path(self, match_file: Path) -> str:
+        try:
+            return match_file.relative_to(self.data_dir).as_posix()
+        except ValueError:
+            return match_file.as_posix()
+    
+    def _bulk_team(self, name: str, fbref_id: Optional[str]) -> UUID:
+        key = self._team_key(name, fbref_id)
+        team_id = self.team_ids.get(key)
+        if team_id is None:
+            team_id = self.team_ids[key] = uuid4()
+            self.pending[Team].append({"id": team_id, "fbref_id": key, "name": name})
+        return team_id
+    
+    def _bulk_player(self, fbref_id: str, name: str, position: Optional[str], team_id: UUID) -> UUID:
+        player_id = self.player_ids.get(fbref_id)
+        if player_id is None:
+            player_id = self.player_ids[fbref_id] = uuid4()
+            self.pending[Player].append({
+                "id": player_id,
+                "fbref_id": fbref_id,
+                "name": name,
+                "position": position,
+                "current_team_id": team_id,
+            })
+        return player_id
+    
+    def normalise(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        A match's rows with database ids left out: team ids are the side
+        ("home"/"away"), player ids are fbref ids and match_id is unset.
+        Needs no session, so it can run in a worker process.
+        """
+        home_team_data = match_data.get("home_team", {})
+        away_team_data = match_data.get("away_team", {})
+        players: List[Tuple[str, str, Optional[str], str]] = []  # (fbref_id, name, position, side)
+        
+        def player_for(stat: Dict[str, Any], side: str) -> str:
+            fbref_id = stat.get("player_id", "")
+            players.append((fbref_id, stat.get("player_name", ""), stat.get("position"), side))
+            return fbref_id
+        
+        rows = {
+            Lineup: self._lineup_rows(None, match_data.get("lineups", {}), "home", "away"),
+            MatchPlayerStats: self._player_stat_rows(None, match_data.get("player_stats", {}), "home", "away", player_for),
+            MatchEvent: self._event_rows(None, match_data.get("events", {}), "home", "away", lambda fbref_id: fbref_id or None),
+            TeamStats: self._team_stat_rows(None, match_data.get("team_stats", {}), "home", "away"),
+        }
+        return {
+            "teams": {
+                "home": (home_team_data.get("name", ""), home_team_data.get("fbref_id", "")),
+                "away": (away_team_data.get("name", ""), away_team_data.get("fbref_id", "")),
+            },
+            "match": self._match_row(match_data, "home", "away"),
+            "players": players,
+            "rows": rows,
+        }
+    
+    def _stage(self, path: str, content_hash: str, parsed: Dict[str, Any]) -> bool:
+        """
+        Assign ids to a normalised match file and queue its rows and manifest
+        entry. A match already in the database (from this file's manifest
+        entry, or by date and teams) is updated with its child rows replaced.
+        Returns False if another file in this run already wrote the match.
+        """
+        teams = {side: self._bulk_team(name, fbref_id) for side, (name, fbref_id) in parsed["teams"].items()}
+        match_row = dict(parsed["match"], home_team_id=teams["home"], away_team_id=teams["away"])
+        key = (match_row["match_date"], teams["home"], teams["away"])
+        
+        match_id = self.manifest[path][1] if path in self.manifest else self.known_matches.get(key)
+        # A duplicate file only gets a manifest entry, so later runs skip it
+        duplicate = match_id in self.run_match_ids
+        if not duplicate:
+            if match_id is None:
+                match_id = uuid4()
+                self.pending[Match].append({"id": match_id, **match_row})
+            else:
+                self.replaced[match_id] = {"id": match_id, **match_row}
+            self.known_matches[key] = match_id
+            self.run_match_ids.add(match_id)
+            
+            # Register the match's players before resolving event player ids
+            for fbref_id, name, position, side in parsed["players"]:
+                self._bulk_player(fbref_id, name, position, teams[side])
+            for model, rows in parsed["rows"].items():
+                for row in rows:
+                    row = dict(row, match_id=match_id, team_id=teams[row["team_id"]])
+                    if "player_id" in row:
+                        row["player_id"] = self.player_ids.get(row["player_id"]) if row["player_id"] else None
+                    self.pending[model].append(row)
+        
+        row_counts = {name: len(parsed["rows"][model]) for model, name in CHILD_TABLES.items()}
+        missing = _missing(row_counts, match_row["score_home"], match_row["score_away"])
+        self.pending[ImportManifest].append(
+            self._manifest_row(path, content_hash, match_id, row_counts, missing)
+        )
+        self.manifest[path] = (content_hash, match_id)
+        return not duplicate
+    
+    def _manifest_row(self, path: str, content_hash: str, match_id: UUID,
+                      row_counts: Dict[str, int], missing: List[str]) -> Dict[str, Any]:
+        return {
+            "path": path,
+            "season": self.season,
+            "content_hash": content_hash,
+            "match_id": match_id,
+            "row_counts": row_counts,
+            "missing": missing,
+            "is_complete": not missing,
+        }
+    
+    def _flush(self, session: Session) -> int:
+        """
+        Write pending rows in one transaction: replaced matches lose their
+        child rows and are updated, then each table gets one executemany
+        INSERT (FK order). Returns rows written.
+        """
+        now = get_utc_now()
+        written = 0
+        if self.replaced:
+            match_ids = list(self.replaced)
+            for model in CHILD_TABLES:
+                session.execute(delete(model).where(model.match_id.in_(match_ids)))
+            session.execute(update(Match), [dict(row, updated_at=now) for row in self.replaced.values()])
+            written += len(match_ids)
+        manifest_paths = [row["path"] for row in self.pending[ImportManifest]]
+        if manifest_paths:
+            session.execute(delete(ImportManifest).where(ImportManifest.path.in_(manifest_paths)))
+        
+        for model in BULK_TABLES:
+            rows = self.pending[model]
+            if not rows:
+                continue
+            for row in rows:
+                row.setdefault("id", uuid4())
+                row["created_at"] = now
+                if model is not MatchEvent:  # events have no updated_at
+                    row["updated_at"] = now
+            session.execute(insert(model), rows)
+            written += len(rows)
+        session.commit()
+        self._clear_pending()
+        return written
+    
+    def _clear_pending(self):
+        for rows in self.pending.values():
+            rows.clear()
+        self.replaced.clear()
+    
+    def _discard_pending(self, session: Session):
+        """Roll back a failed batch and forget the ids it handed out"""
+        session.rollback()
+        self.run_match_ids.difference_update(row["match_id"] for row in self.pending[ImportManifest])
+        self._clear_pending()
+        self._preload(session)
+    
+    def _rebuild_derived(self, session: Session):
+        # Derived state is rebuilt once rather than per match
+        team_form_service.rebuild_season(session, self.season)
+        elo_ledger.invalidate(self.season)
+    
+    def _file_source(self, match_files: List[Path], executor: Optional[ProcessPoolExecutor],
+                     transform: Optional[Callable] = None) -> Iterator[Tuple[str, str, Optional[str], Optional[Dict[str, Any]], Optional[str]]]:
+        """(name, manifest path, hash, normalised match, error) per match file, in file order"""
+        manifest_paths = [self._manifest_path(match_file) for match_file in match_files]
+        known_hashes = [self.manifest.get(path, (None,))[0] for path in manifest_paths]
+        parse = partial(parse_match_file, self.season, transform=transform)
+        paths = [str(match_file) for match_file in match_files]
+        # Results stream back in file order while later files are still parsing
+        parsed_files = (
+            executor.map(parse, paths, known_hashes, chunksize=PARSE_CHUNKSIZE) if executor
+            else map(parse, paths, known_hashes)
+        )
+        for match_file, path, (content_hash, parsed, error) in zip(match_files, manifest_paths, parsed_files):
+            yield match_file.name, path, content_hash, parsed, error
+    
+    def _index_source(self, index_file: Path,
+                      transform: Optional[Callable] = None) -> Iterator[Tuple[str, str, Optional[str], Optional[Dict[str, Any]], Optional[str]]]:
+        """The same tuples for each match in a season index.json, streamed one match at a time"""
+        index_path = self._manifest_path(index_file)
+        for key, match_data, raw in iter_index_matches(index_file):
+            path = f"{index_path}#{key}"
+            content_hash = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+            if self.manifest.get(path, (None,))[0] == content_hash:
+                yield key, path, content_hash, None, None
+                continue
+            try:
+                if transform is not None:
+                    match_data = transform(match_data)
+                    if not match_data:
+                        raise ValueError("transformation failed")
+                yield key, path, content_hash, self.normalise(match_data), None
+            except Exception as e:
+                yield key, path, content_hash, None, str(e)
+    
+    def _write_batch(self, session: Session, staged: List[str]) -> int:
+        """Flush the pending batch; on failure roll it back and record its files as errors"""
+        if not self.pending[ImportManifest]:
+            return 0
+        try:
+            rows = self._flush(session)
+        except Exception as e:
+            for name in staged:
+                self.errors.append(f"Error processing {name}: batch insert failed: {str(e)[:200]}")
+            print(f"  ✗ ERROR: batch ending {staged[-1] if staged else '?'} failed: {str(e)[:200]}")
+            self._discard_pending(session)
+            return 0
+        self.stats_imported += len(staged)
+        return rows
+    
+    def run_bulk(self, batch_size: int = DEFAULT_BATCH_SIZE, workers: Optional[int] = None,
+                 from_index: bool = False, transform: Optional[Callable] = None) -> Dict[str, Any]:
+        """
+        Set-based, incremental import in two stages: a process pool
+        (`workers`, default one per core; <= 1 parses inline) hashes, reads
+        and normalises match files, and this process assigns ids and writes
+        every `batch_size` files in one transaction, so parsing overlaps with
+        database I/O. Files whose hash matches the import manifest are
+        skipped unparsed; changed files replace their match's rows. A failed
+        batch is rolled back and its files are reported as errors; the rest
+        of the import continues.
+        
+        With from_index=True the matches are streamed one at a time from
+        <season>/index.json instead (parsed in this process, hashed per
+        match). `transform` maps raw match JSON to the import format
+        (default for the index: season_index.transform_match_data).
+        """
+        index_file = self.data_dir / self.season / "index.json"
+        if from_index:
+            match_files = []
+            total_matches = None  # unknown until the index has been streamed
+            workers = 1
+            # Index entries are in the scraped format
+            transform = transform or transform_match_data
+            print(f"Streaming matches from {index_file} (bulk, {batch_size} per batch)\n")
+        else:
+            match_files = sorted(self.match_dir.glob("*.json"))
+            total_matches = len(match_files)
+            workers = min(workers or os.cpu_count() or 1, total_matches)
+            print(f"Found {total_matches} match files (bulk, {batch_size} per batch, {max(workers, 1)} parser(s))\n")
+        
+        rows_written = 0
+        unchanged = 0
+        done = 0
+        start = time.perf_counter()
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        
+        def progress():
+            elapsed = time.perf_counter() - start
+            print(f"[Import] {done}{f'/{total_matches}' if total_matches is not None else ''} matches, "
+                  f"{unchanged} unchanged, {rows_written} rows "
+                  f"({rows_written / elapsed if elapsed else 0:.0f} rows/s)")
+        
+        try:
+            with Session(pl_engine) as session:
+                self._preload(session)
+                source = (
+                    self._index_source(index_file, transform) if from_index
+                    else self._file_source(match_files, executor, transform)
+                )
+                
+                staged = []
+                for done, (name, path, content_hash, parsed, error) in enumerate(source, 1):
+                    if error is not None:
+                        error_msg = f"Error processing {name}: {error}"
+                        print(f"  ✗ ERROR: {error_msg}")
+                        self.errors.append(error_msg)
+                    elif parsed is None:
+                        unchanged += 1
+                    elif self._stage(path, content_hash, parsed):
+                        staged.append(name)
+                    
+                    if done % batch_size == 0:
+                        rows_written += self._write_batch(session, staged)
+                        staged = []
+                        progress()
+                
+                if done % batch_size or not done:
+                    rows_written += self._write_batch(session, staged)
+                    progress()
+                
+                if self.stats_imported:
+                    self._rebuild_derived(session)
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+        
+        elapsed = time.perf_counter() - start
+        rows_per_sec = rows_written / elapsed if elapsed else 0.0
+        print(f"[Import] Bulk import: {self.stats_imported} matches, {unchanged} unchanged, {rows_written} rows "
+              f"in {elapsed:.1f}s ({rows_per_sec:.0f} rows/s)")
+        
+        return {
+            "imported": self.stats_imported,
+            "unchanged": unchanged,
+            "total": done,
+            "errors": self.errors,
+            "rows": rows_written,
+            "elapsed": round(elapsed, 2),
+            "rows_per_sec": round(rows_per_sec, 1),
+        }
+    
+    def import_files(self, session: Session, match_files: List[Path],
+                     transform: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None) -> int:
+        """
+        Re-import specific files now, whether or not they changed, in one
+        transaction (inline, no pool). `transform` maps raw file JSON to the
+        import format. Returns rows written; raises on the first bad file.
+        """
+        self._preload(session)
+        self.run_match_ids.clear()
+        for match_file in match_files:
+            content_hash, parsed, error = parse_match_file(self.season, str(match_file), None, transform)
+            if error is not None:
+                self._clear_pending()
+                raise ValueError(f"{match_file.name}: {error}")
+            self._stage(self._manifest_path(match_file), content_hash, parsed)
+        try:
+            rows = self._flush(session)
+        except Exception:
+            self._discard_pending(session)
+            raise
+        self._rebuild_derived(session)
+        return rows
+    
+    def _replace_files(self, session: Session, match_files: List[Path], created_ids: Set[UUID]) -> int:
+        """
+        Per-match mode: write files whose match already exists through the
+        bulk path in one transaction, replacing the match's rows and recording
+        the files. Matches created earlier in the run (`created_ids`) are not
+        overwritten by a duplicate file. Bad files are reported and skipped.
+        Returns matches written.
+        """
+        self._preload(session)
+        self.run_match_ids = set(created_ids)
+        written = 0
+        for match_file in match_files:
+            content_hash, parsed, error = parse_match_file(self.season, str(match_file))
+            if error is not None:
+                error_msg = f"Error processing {match_file.name}: {error}"
+                print(f"  ✗ ERROR: {error_msg}")
+                self.errors.append(error_msg)
+            elif self._stage(self._manifest_path(match_file), content_hash, parsed):
+                written += 1
+        try:
+            self._flush(session)
+        except Exception as e:
+            self._discard_pending(session)
+            self.errors.append(f"Error replacing {len(match_files)} match file(s): {e}")
+            return 0
+        if written:
+            self._rebuild_derived(session)
+        return written
+    
+    def record_file(self, session: Session, match_file: Path, match: Match):
+        """
+        Record a file whose match import_match has just created in the
+        manifest (commits); never for a match it found already imported, whose
+        rows may come from a different version of the file.
+        Its rows are counted in the database, so tables that failed to import
+        show as missing.
+        """
+        content_hash = hashlib.sha256(match_file.read_bytes()).hexdigest()
+        row_counts = self._row_counts(session, [match.id])[match.id]
+        path = self._manifest_path(match_file)
+        session.execute(delete(ImportManifest).where(ImportManifest.path == path))
+        missing = _missing(row_counts, match.score_home, match.score_away)
+        row = self._manifest_row(path, content_hash, match.id, row_counts, missing)
+        now = get_utc_now()
+        session.execute(insert(ImportManifest), [dict(row, id=uuid4(), created_at=now, updated_at=now)])
+        session.commit()
+    
+    def _row_counts(self, session: Session, match_ids: List[UUID]) -> Dict[UUID, Dict[str, int]]:
+        """Rows per child table for each match (one grouped count per table)"""
+        counts = {match_id: dict.fromkeys(CHILD_TABLES.values(), 0) for match_id in match_ids}
+        for model, name in CHILD_TABLES.items():
+            for match_id, count in session.exec(
+                select(model.match_id, func.count(model.id))
+                .where(model.match_id.in_(match_ids))
+                .group_by(model.match_id)
+            ).all():
+                counts[match_id][name] = count
+        return counts
+    
+    def unrecorded_incomplete_matches(self, session: Session) -> List[Tuple[Match, List[str]]]:
+        """
+        (match, missing) for the season's incomplete matches that have no
+        manifest entry - imported through import_match without record_file,
+        or before the manifest existed - checked by counting their rows
+        """
+        matches = session.exec(
+            select(Match)
+            .where(Match.season == self.season, ~exists().where(ImportManifest.match_id == Match.id))
+            .order_by(Match.match_date)
+        ).all()
+        counts = self._row_counts(session, [match.id for match in matches])
+        incomplete = []
+        for match in matches:
+            missing = _missing(counts[match.id], match.score_home, match.score_away)
+            if missing:
+                incomplete.append((match, missing))
+        return incomplete
+    
+    def locate_files(self, session: Session, matches: List[Match],
+                     transform: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None) -> Dict[UUID, str]:
+        """
+        Find the files (as manifest paths) of matches without a manifest entry
+        by date and teams' fbref ids, reading only files not in the manifest
+        """
+        fbref_ids = dict(session.exec(select(Team.id, Team.fbref_id)).all())
+        wanted = {
+            (match.match_date, fbref_ids.get(match.home_team_id), fbref_ids.get(match.away_team_id)): match.id
+            for match in matches
+        }
+        recorded = set(session.exec(select(ImportManifest.path).where(ImportManifest.season == self.season)).all())
+        found = {}
+        for match_file in sorted(self.match_dir.glob("*.json")):
+            path = self._manifest_path(match_file)
+            if path in recorded:
+                continue
+            _, parsed, error = parse_match_file(self.season, str(match_file), None, transform)
+            if error is not None:
+                continue
+            key = (parsed["match"]["match_date"], parsed["teams"]["home"][1], parsed["teams"]["away"][1])
+            if key in wanted:
+                found.setdefault(wanted[key], path)
+        return found
+    
+    def incomplete_files(self, session: Session) -> List[ImportManifest]:
+        """Manifest entries of the season's files that lack scores or any per-match table"""
+        return session.exec(
+            select(ImportManifest)
+            .where(ImportManifest.season == self.season, ImportManifest.is_complete == False)
+            .order_by(ImportManifest.path)
+        ).all()
 
+def parse_match_file(
+    season: str,
+    path: str,
+    known_hash: Optional[str] = None,
+    transform: Optional[Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]] = None,
+) -> Tuple[str, Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Hash, read and normalise one match file (runs in a pool worker).
+    Returns (content hash, normalised match, error); the match is None
+    without an error when the hash equals `known_hash`.
+    """
+    match_file = Path(path)
+    content_hash = None
+    try:
+        raw = match_file.read_bytes()
+        content_hash = hashlib.sha256(raw).hexdigest()
+        if content_hash == known_hash:
+            return content_hash, None, None
+        match_data = json.loads(raw)
+        if transform is not None:
+            match_data = transform(match_data)
+            if not match_data:
+                raise ValueError("transformation failed")
+        return content_hash, MatchImportService(season, match_file.parent).normalise(match_data), None
+    except Exception as e:
+        return content_hash, None, str(e)
@@ -0,0 +1,279 @@
+"""
+Match Warehouse
+Columnar export of the PL match tables for fast analytical loads.
+
+export_season writes one directory per season under the warehouse root,
+holding one uncompressed .npy file per column for matches, player_stats,
+events and team_stats. Teams, players, event types and card values are
+dictionary-encoded as small integers against warehouse-wide dictionaries
+(dictionaries.json) that only ever grow, so codes are stable across seasons
+and columns from several seasons concatenate directly. Loading memory-maps
+the columns: a season is a handful of file opens however many rows it has,
+and analytics run as NumPy scans instead of walking ORM rows.
+
+Missing values are NULL (-1) in integer columns and NaN in float columns.
+Rows reference their match by its index in the season's matches table
+(sorted by date, then id); the match UUIDs are listed in meta.json.
+
+pyarrow isn't a dependency, so the files are plain NumPy rather than
+Parquet/Arrow.
+"""
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable
+from uuid import UUID
+
+import numpy as np
+from sqlmodel import Session, select
+
+from app.models.pl_data import Team, Player, Match, MatchPlayerStats, MatchEvent, TeamStats
+
+DEFAULT_ROOT = Path(__file__).resolve().parents[2] / "data" / "warehouse"
+NULL = -1
+
+TEAM_DTYPE = np.int16
+PLAYER_DTYPE = np.int32
+MATCH_DTYPE = np.int32
+CODE_DTYPE = np.int8
+STAT_DTYPE = np.int16
+
+# Dictionary name -> warehouse-wide list of values (index = code)
+DICTIONARIES = ("teams", "team_names", "players", "player_names", "event_types", "cards")
+
+
+def _ints(values: Iterable[Optional[int]], dtype) -> np.ndarray:
+    return np.array([NULL if value is None else value for value in values], dtype=dtype)
+
+
+def _floats(values: Iterable[Optional[float]]) -> np.ndarray:
+    return np.array([np.nan if value is None else value for value in values], dtype=np.float32)
+
+
+class _Encoder:
+    """Grows a dictionary's values as new ones are encoded"""
+    
+    def __init__(self, values: List[str]):
+        self.values = values
+        self.codes = {value: code for code, value in enumerate(values)}
+    
+    def encode(self, value: Any) -> int:
+        if value is None:
+            return NULL
+        value = str(value)
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class MatchWarehouse:
+    """Exports seasons to and loads them from a columnar warehouse directory"""
+    
+    def __init__(self, root: Path = DEFAULT_ROOT):
+        self.root = Path(root)
+    
+    # ==================== Dictionaries ====================
+    
+    def dictionaries(self) -> Dict[str, List[str]]:
+        """Warehouse-wide dictionaries; code = index into the list"""
+        path = self.root / "dictionaries.json"
+        stored = json.loads(path.read_text()) if path.exists() else {}
+        return {name: stored.get(name, []) for name in DICTIONARIES}
+    
+    def _write_json(self, path: Path, data: Dict[str, Any]):
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data))
+        os.replace(tmp, path)
+    
+    # ==================== Export ====================
+    
+    def export_season(self, session: Session, season: str) -> Dict[str, int]:
+        """Write a season's columns (replacing any earlier export); returns rows per table"""
+        matches = session.exec(
+            select(Match.id, Match.match_date, Match.home_team_id, Match.away_team_id,
+                   Match.score_home, Match.score_away, Match.matchday)
+            .where(Match.season == season)
+            .order_by(Match.match_date, Match.id)
+        ).all()
+        match_index = {row[0]: idx for idx, row in enumerate(matches)}
+        in_season = Match.season == season
+        
+        player_stats = session.exec(
+            select(MatchPlayerStats.match_id, MatchPlayerStats.player_id, MatchPlayerStats.team_id,
+                   MatchPlayerStats.minutes, MatchPlayerStats.goals, MatchPlayerStats.assists,
+                   MatchPlayerStats.shots, MatchPlayerStats.shots_on_target, MatchPlayerStats.passes,
+                   MatchPlayerStats.pass_accuracy, MatchPlayerStats.tackles, MatchPlayerStats.interceptions,
+                   MatchPlayerStats.fouls, MatchPlayerStats.cards)
+            .join(Match, Match.id == MatchPlayerStats.match_id).where(in_season)
+        ).all()
+        events = session.exec(
+            select(MatchEvent.match_id, MatchEvent.team_id, MatchEvent.player_id,
+                   MatchEvent.event_type, MatchEvent.minute, MatchEvent.details)
+            .join(Match, Match.id == MatchEvent.match_id).where(in_season)
+        ).all()
+        team_stats = session.exec(
+            select(TeamStats.match_id, TeamStats.team_id, TeamStats.is_home, TeamStats.possession,
+                   TeamStats.passes, TeamStats.pass_accuracy, TeamStats.shots, TeamStats.shots_on_target,
+                   TeamStats.tackles, TeamStats.interceptions, TeamStats.clearances)
+            .join(Match, Match.id == TeamStats.match_id).where(in_season)
+        ).all()
+        
+        dictionaries = self.dictionaries()
+        teams = _Encoder(dictionaries["teams"])
+        players = _Encoder(dictionaries["players"])
+        event_types = _Encoder(dictionaries["event_types"])
+        cards = _Encoder(dictionaries["cards"])
+        
+        def column(rows: List[tuple], idx: int) -> List[Any]:
+            return [row[idx] for row in rows]
+        
+        tables = {
+            "matches": {
+                "date": np.array([row[1] for row in matches], dtype="datetime64[D]"),
+                "home_team": _ints((teams.encode(row[2]) for row in matches), TEAM_DTYPE),
+                "away_team": _ints((teams.encode(row[3]) for row in matches), TEAM_DTYPE),
+                "score_home": _ints(column(matches, 4), STAT_DTYPE),
+                "score_away": _ints(column(matches, 5), STAT_DTYPE),
+                "matchday": _ints(column(matches, 6), STAT_DTYPE),
+            },
+            "player_stats": {
+                "match": _ints((match_index[row[0]] for row in player_stats), MATCH_DTYPE),
+                "player": _ints((players.encode(row[1]) for row in player_stats), PLAYER_DTYPE),
+                "team": _ints((teams.encode(row[2]) for row in player_stats), TEAM_DTYPE),
+                **{
+                    name: _ints(column(player_stats, idx), STAT_DTYPE)
+                    for idx, name in enumerate(
+                        ("minutes", "goals", "assists", "shots", "shots_on_target", "passes"), start=3
+                    )
+                },
+                "pass_accuracy": _floats(column(player_stats, 9)),
+                "tackles": _ints(column(player_stats, 10), STAT_DTYPE),
+                "interceptions": _ints(column(player_stats, 11), STAT_DTYPE),
+                "fouls": _ints(column(player_stats, 12), STAT_DTYPE),
+                "cards": _ints((cards.encode(row[13]) for row in player_stats), CODE_DTYPE),
+            },
+            "events": {
+                "match": _ints((match_index[row[0]] for row in events), MATCH_DTYPE),
+                "team": _ints((teams.encode(row[1]) for row in events), TEAM_DTYPE),
+                "player": _ints((players.encode(row[2]) for row in events), PLAYER_DTYPE),
+                "event_type": _ints((event_types.encode(row[3]) for row in events), CODE_DTYPE),
+                "minute": _ints(column(events, 4), STAT_DTYPE),
+                "card": _ints((cards.encode((row[5] or {}).get("card_type")) for row in events), CODE_DTYPE),
+            },
+            "team_stats": {
+                "match": _ints((match_index[row[0]] for row in team_stats), MATCH_DTYPE),
+                "team": _ints((teams.encode(row[1]) for row in team_stats), TEAM_DTYPE),
+                "is_home": np.array(column(team_stats, 2), dtype=bool),
+                "possession": _floats(column(team_stats, 3)),
+                "passes": _ints(column(team_stats, 4), STAT_DTYPE),
+                "pass_accuracy": _floats(column(team_stats, 5)),
+                **{
+                    name: _ints(column(team_stats, idx), STAT_DTYPE)
+                    for idx, name in enumerate(
+                        ("shots", "shots_on_target", "tackles", "interceptions", "clearances"), start=6
+                    )
+                },
+            },
+        }
+        
+        # Names for the labels of newly coded teams and players
+        self._fill_names(session, dictionaries, "teams", "team_names", Team)
+        self._fill_names(session, dictionaries, "players", "player_names", Player)
+        
+        # Dictionaries first: if the season write fails they have only grown
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._write_json(self.root / "dictionaries.json", dictionaries)
+        
+        season_dir = self.root / season
+        staging = self.root / f".{season}.tmp"
+        shutil.rmtree(staging, ignore_errors=True)
+        for table, columns in tables.items():
+            (staging / table).mkdir(parents=True)
+            for name, values in columns.items():
+                np.save(staging / table / f"{name}.npy", values)
+        rows = {table: len(next(iter(columns.values()))) for table, columns in tables.items()}
+        (staging / "meta.json").write_text(json.dumps({
+            "season": season,
+            "exported_at": datetime.now(timezone.utc).isoformat(),
+            "rows": rows,
+            "match_ids": [str(row[0]) for row in matches],
+        }))
+        shutil.rmtree(season_dir, ignore_errors=True)
+        os.replace(staging, season_dir)
+        
+        print(f"[Warehouse] Exported {season}: " + ", ".join(f"{n} {table}" for table, n in rows.items()))
+        return rows
+    
+    def _fill_names(self, session: Session, dictionaries: Dict[str, List[str]], ids_key: str, names_key: str, model):
+        ids, names = dictionaries[ids_key], dictionaries[names_key]
+        if len(names) >= len(ids):
+            return
+        missing = ids[len(names):]
+        by_id = {
+            str(entity_id): name for entity_id, name in session.exec(
+                select(model.id, model.name).where(model.id.in_([UUID(entity_id) for entity_id in missing]))
+            ).all()
+        }
+        names.extend(by_id.get(entity_id, "") for entity_id in missing)
+    
+    # ==================== Load ====================
+    
+    def seasons(self) -> List[str]:
+        """Exported seasons"""
+        if not self.root.exists():
+            return []
+        return sorted(path.parent.name for path in self.root.glob("*/meta.json"))
+    
+    def load_season(self, season: str, mmap: bool = True) -> Dict[str, Dict[str, np.ndarray]]:
+        """{table: {column: array}} for one season (memory-mapped, read-only, by default)"""
+        season_dir = self.root / season
+        if not (season_dir / "meta.json").exists():
+            raise FileNotFoundError(f"Season {season} has not been exported to {self.root}")
+        return {
+            table_dir.name: {
+                path.stem: np.load(path, mmap_mode="r" if mmap else None)
+                for path in sorted(table_dir.glob("*.npy"))
+            }
+            for table_dir in sorted(season_dir.iterdir()) if table_dir.is_dir()
+        }
+    
+    def load(self, seasons: Optional[List[str]] = None) -> Dict[str, Dict[str, np.ndarray]]:
+        """
+        Several seasons as one set of tables (default: every exported season).
+        Match references are offset to index the combined matches table, and
+        every table gains a "season" column (index into `seasons`).
+        """
+        seasons = seasons or self.seasons()
+        loaded = [self.load_season(season) for season in seasons]
+        if not loaded:
+            return {}
+        if len(loaded) == 1:
+            single = loaded[0]
+            return {
+                table: {**columns, "season": np.zeros(len(next(iter(columns.values()))), dtype=CODE_DTYPE)}
+                for table, columns in single.items()
+            }
+        
+        offsets = np.cumsum([0] + [len(tables["matches"]["date"]) for tables in loaded[:-1]])
+        combined: Dict[str, Dict[str, np.ndarray]] = {}
+        for table in loaded[0]:
+            columns = {}
+            for name in loaded[0][table]:
+                parts = [tables[table][name] for tables in loaded]
+                if name == "match":
+                    parts = [(part + offset).astype(MATCH_DTYPE) for part, offset in zip(parts, offsets)]
+                columns[name] = np.concatenate(parts)
+            columns["season"] = np.concatenate([
+                np.full(len(next(iter(tables[table].values()))), idx, dtype=CODE_DTYPE)
+                for idx, tables in enumerate(loaded)
+            ])
+            combined[table] = columns
+        return combined
+
+
+# Singleton instance
+match_warehouse = MatchWarehouse()
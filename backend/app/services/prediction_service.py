@@ -8,40 +8,54 @@ Enhanced with:
 - Player availability factors from FPL API
 """
 from typing import Dict, List, Optional, Tuple, Any
-from datetime import datetime, date, timedelta
+from bisect import bisect_left
+from datetime import date, timedelta
 from sqlmodel import Session, select, func, and_, or_
 from collections import defaultdict
 from functools import lru_cache
 import hashlib
 import json
-import math
 
-# Try to import scipy for Poisson distribution
-try:
-    from scipy.stats import poisson
-    SCIPY_AVAILABLE = True
-except ImportError:
-    SCIPY_AVAILABLE = False
-    print("[PredictionService] scipy not available, using fallback probability calculation")
+import numpy as np
 
+from app.core.cache import cache
 from app.core.pl_database import get_pl_session
 from app.models.pl_data import Match, Team, Player, MatchEvent, MatchPlayerStats
 from app.services.fpl_service import fpl_service
+from app.services import score_model
+from app.services.elo_ledger import elo_ledger, BASE_ELO, HOME_ELO_ADVANTAGE
+from app.services.team_form_service import team_form_service, summarize_window, match_entry, FORM_WINDOW
 
-# Simple in-memory cache for predictions (TTL: 1 hour)
-_prediction_cache: Dict[str, Tuple[Any, datetime]] = {}
+# Predictions are kept in the shared cache (see app.core.cache)
+PREDICTION_CACHE_NAMESPACE = 'predictions'
 CACHE_TTL = timedelta(hours=1)
 
-# Elo ratings cache (recalculated periodically)
-_elo_ratings_cache: Dict[str, Tuple[Dict[str, float], datetime]] = {}
-ELO_CACHE_TTL = timedelta(hours=6)
 
-# Base Elo rating for new teams
-BASE_ELO = 1500
-# K-factor for Elo updates (higher = more volatile)
-ELO_K_FACTOR = 32
-# Home advantage in Elo points
-HOME_ELO_ADVANTAGE = 65
+def prediction_tags(season: str, home_team_id: Any, away_team_id: Any) -> List[str]:
+    """Cache tags for a prediction: its season and each team within that season"""
+    return [f"season:{season}", f"team:{season}:{home_team_id}", f"team:{season}:{away_team_id}"]
+
+
+def invalidate_predictions(season: Optional[str], team_ids: Optional[Any] = None) -> int:
+    """
+    Evict cached predictions affected by new results.
+    Registered as an Elo ledger listener: a result changes the ratings (and
+    form / H2H) of exactly the two teams involved, so only their fixtures go.
+    """
+    if season is None:
+        removed = cache.clear_namespace(PREDICTION_CACHE_NAMESPACE)
+    elif team_ids is None:
+        removed = cache.invalidate_tags(PREDICTION_CACHE_NAMESPACE, [f"season:{season}"])
+    else:
+        removed = cache.invalidate_tags(
+            PREDICTION_CACHE_NAMESPACE, [f"team:{season}:{team_id}" for team_id in team_ids]
+        )
+    if removed:
+        print(f"[Predictions] Evicted {removed} cached predictions ({season or 'all seasons'})")
+    return removed
+
+
+elo_ledger.add_listener(invalidate_predictions)
 
 
 class PredictionService:
@@ -67,15 +81,13 @@ class PredictionService:
         
         Returns comprehensive prediction with probabilities for each scoreline.
         """
-        # Check cache
+        # Check cache (after picking up results imported by other processes)
         if use_cache:
+            elo_ledger.refresh(self.pl_session, season)
             cache_key = f"pred_v2_{home_team_id}_{away_team_id}_{season}_{match_date.isoformat()}"
-            if cache_key in _prediction_cache:
-                cached_result, cached_time = _prediction_cache[cache_key]
-                if datetime.now() - cached_time < CACHE_TTL:
-                    return cached_result
-                else:
-                    del _prediction_cache[cache_key]
+            cached_result = await cache.aget(PREDICTION_CACHE_NAMESPACE, cache_key)
+            if cached_result is not None:
+                return cached_result
         
         from uuid import UUID
         try:
@@ -117,6 +129,237 @@ class PredictionService:
         # 4. Get head-to-head history
         h2h_matches = self._get_head_to_head(home_team_id, away_team_id, match_date)
         
+        result = self._build_prediction(
+            home_team, away_team,
+            home_elo, away_elo,
+            home_form, away_form,
+            home_availability, away_availability,
+            h2h_matches,
+        )
+        
+        # Cache result
+        if use_cache:
+            cache_key = f"pred_v2_{home_team_id}_{away_team_id}_{season}_{match_date.isoformat()}"
+            await cache.aset(
+                PREDICTION_CACHE_NAMESPACE, cache_key, result, ttl=CACHE_TTL,
+                tags=prediction_tags(season, home_team.id, away_team.id),
+            )
+        
+        return result
+    
+    async def predict_gameweek(
+        self,
+        fixtures: List[Dict[str, Any]],
+        season: str,
+        use_cache: bool = True,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Predict a batch of fixtures (typically a gameweek) with a fixed number of queries.
+        
+        Each fixture is a dict with 'home_team_id', 'away_team_id' (DB team IDs) and
+        'match_date'. The season's finished matches are loaded once; Elo, form and
+        head-to-head for every fixture are then derived in memory. Returns payloads
+        identical to predict_match_score, in fixture order (None if a team is unknown).
+        """
+        results: List[Optional[Dict[str, Any]]] = [None] * len(fixtures)
+        pending = []  # (index, fixture, cache_key)
+        
+        if use_cache:
+            elo_ledger.refresh(self.pl_session, season)
+        
+        for idx, fixture in enumerate(fixtures):
+            cache_key = (
+                f"pred_v2_{fixture['home_team_id']}_{fixture['away_team_id']}_"
+                f"{season}_{fixture['match_date'].isoformat()}"
+            )
+            if use_cache:
+                cached_result = await cache.aget(PREDICTION_CACHE_NAMESPACE, cache_key)
+                if cached_result is not None:
+                    results[idx] = cached_result
+                    continue
+            pending.append((idx, fixture, cache_key))
+        
+        if not pending:
+            return results
+        
+        prepared = self.prepare_batch_inputs([fixture for _, fixture, _ in pending], season)
+        pending = [(p, inputs) for p, inputs in zip(pending, prepared) if inputs is not None]
+        if not pending:
+            return results
+        
+        # Availability, once per team
+        availability: Dict[Any, float] = {}
+        for _, inputs in pending:
+            for team in (inputs['home_team'], inputs['away_team']):
+                if team.id not in availability:
+                    fpl_id = self._extract_fpl_team_id(team.fbref_id)
+                    availability[team.id] = await self._get_player_availability_factor(fpl_id) if fpl_id else 1.0
+        
+        fixture_inputs = []
+        for _, inputs in pending:
+            home_team = inputs['home_team']
+            away_team = inputs['away_team']
+            
+            # Same rule as predict_match_score: availability only when both teams are mapped to FPL
+            both_mapped = bool(
+                self._extract_fpl_team_id(home_team.fbref_id) and self._extract_fpl_team_id(away_team.fbref_id)
+            )
+            
+            fixture_inputs.append((
+                home_team, away_team,
+                inputs['home_elo'], inputs['away_elo'],
+                inputs['home_form'], inputs['away_form'],
+                availability[home_team.id] if both_mapped else 1.0,
+                availability[away_team.id] if both_mapped else 1.0,
+                inputs['h2h'],
+            ))
+        
+        # Score matrices for the whole batch in one vectorized call
+        expected_goals = np.array([
+            self._calculate_expected_goals(elo_h, elo_a, form_h, form_a, avail_h, avail_a, h2h)
+            for _, _, elo_h, elo_a, form_h, form_a, avail_h, avail_a, h2h in fixture_inputs
+        ]).reshape(-1, 2)
+        matrices = score_model.score_matrix(expected_goals[:, 0], expected_goals[:, 1])
+        
+        for ((idx, _, cache_key), _), args, matrix in zip(pending, fixture_inputs, matrices):
+            result = self._build_prediction(*args, score_probs=matrix)
+            
+            if use_cache:
+                await cache.aset(
+                    PREDICTION_CACHE_NAMESPACE, cache_key, result, ttl=CACHE_TTL,
+                    tags=prediction_tags(season, args[0].id, args[1].id),
+                )
+            results[idx] = result
+        
+        return results
+    
+    def prepare_batch_inputs(
+        self,
+        fixtures: List[Dict[str, Any]],
+        season: str,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Gather model inputs (teams, Elo, form, H2H) for many fixtures from the database
+        in a fixed number of queries. Fixture dicts are as for predict_gameweek.
+        
+        Returns one dict per fixture with keys home_team, away_team, home_elo, away_elo,
+        home_form, away_form and h2h (None where a team can't be resolved).
+        Player availability is not included - it needs live FPL data.
+        """
+        from uuid import UUID
+        
+        prepared: List[Optional[Dict[str, Any]]] = [None] * len(fixtures)
+        pending = []  # (index, home_uuid, away_uuid, match_date)
+        
+        for idx, fixture in enumerate(fixtures):
+            try:
+                home_uuid = fixture['home_team_id']
+                away_uuid = fixture['away_team_id']
+                home_uuid = home_uuid if isinstance(home_uuid, UUID) else UUID(str(home_uuid))
+                away_uuid = away_uuid if isinstance(away_uuid, UUID) else UUID(str(away_uuid))
+            except (ValueError, TypeError):
+                print(f"[PredictionService] Invalid team IDs for batch fixture {fixture.get('home_team_id')} vs {fixture.get('away_team_id')}")
+                continue
+            pending.append((idx, home_uuid, away_uuid, fixture['match_date']))
+        
+        if not pending:
+            return prepared
+        
+        # 1. Teams (one query)
+        team_ids = {p[1] for p in pending} | {p[2] for p in pending}
+        teams = {
+            team.id: team
+            for team in self.pl_session.exec(select(Team).where(Team.id.in_(team_ids))).all()
+        }
+        pending = [p for p in pending if p[1] in teams and p[2] in teams]
+        if not pending:
+            return prepared
+        
+        latest_date = max(p[3] for p in pending)
+        
+        # 2. Finished season matches before the last fixture (one query)
+        season_matches = self.pl_session.exec(
+            select(Match).where(
+                and_(
+                    Match.season == season,
+                    Match.match_date < latest_date,
+                    Match.status == "finished",
+                )
+            ).order_by(Match.match_date.asc())
+        ).all()
+        
+        # 3. Head-to-head history for the fixture pairs, any season (one query)
+        pairs = {frozenset((p[1], p[2])) for p in pending}
+        h2h_all = self.pl_session.exec(
+            select(Match).where(
+                and_(
+                    Match.match_date < latest_date,
+                    Match.status == "finished",
+                    or_(*[
+                        and_(Match.home_team_id.in_(pair), Match.away_team_id.in_(pair))
+                        for pair in pairs
+                    ]),
+                )
+            ).order_by(Match.match_date.asc())
+        ).all()
+        
+        h2h_by_pair: Dict[frozenset, List[Match]] = defaultdict(list)
+        for match in h2h_all:
+            pair = frozenset((match.home_team_id, match.away_team_id))
+            if pair in pairs:
+                h2h_by_pair[pair].append(match)
+        
+        # Per-team, per-venue match lists in date order (for form)
+        home_matches: Dict[Any, List[Match]] = defaultdict(list)
+        away_matches: Dict[Any, List[Match]] = defaultdict(list)
+        for match in season_matches:
+            home_matches[match.home_team_id].append(match)
+            away_matches[match.away_team_id].append(match)
+        
+        def before(matches: List[Match], match_date: date, limit: int = 10) -> List[Match]:
+            """Last `limit` matches strictly before match_date, most recent first"""
+            end = bisect_left([m.match_date for m in matches], match_date)
+            return matches[max(0, end - limit):end][::-1]
+        
+        # 4. Elo ratings at each fixture date (ledger lookups)
+        elo_by_date: Dict[date, Dict[str, float]] = {
+            match_date: self._calculate_elo_ratings(season, match_date)
+            for match_date in {p[3] for p in pending}
+        }
+        
+        for idx, home_uuid, away_uuid, match_date in pending:
+            elo_ratings = elo_by_date[match_date]
+            prepared[idx] = {
+                'home_team': teams[home_uuid],
+                'away_team': teams[away_uuid],
+                'home_elo': elo_ratings.get(str(home_uuid), BASE_ELO),
+                'away_elo': elo_ratings.get(str(away_uuid), BASE_ELO),
+                'home_form': self._summarize_form(before(home_matches[home_uuid], match_date), home_uuid),
+                'away_form': self._summarize_form(before(away_matches[away_uuid], match_date), away_uuid),
+                'h2h': self._format_head_to_head(
+                    before(h2h_by_pair[frozenset((home_uuid, away_uuid))], match_date), home_uuid
+                ),
+            }
+        
+        return prepared
+    
+    def _build_prediction(
+        self,
+        home_team: Team,
+        away_team: Team,
+        home_elo: float,
+        away_elo: float,
+        home_form: Dict,
+        away_form: Dict,
+        home_availability: float,
+        away_availability: float,
+        h2h_matches: List[Dict],
+        score_probs: Optional[np.ndarray] = None,
+    ) -> Dict[str, Any]:
+        """
+        Turn the gathered inputs for one fixture into the prediction payload.
+        score_probs may be passed in when it was already computed as part of a batch.
+        """
         # 5. Calculate expected goals using Elo + form + availability
         home_xg, away_xg = self._calculate_expected_goals(
             home_elo, away_elo,
@@ -126,19 +369,16 @@ class PredictionService:
         )
         
         # 6. Calculate score probabilities using Poisson distribution
-        if SCIPY_AVAILABLE:
+        if score_probs is None:
             score_probs = self._calculate_poisson_probabilities(home_xg, away_xg)
-        else:
-            score_probs = self._calculate_fallback_probabilities(home_xg, away_xg)
         
         # 7. Get most likely score and outcome probabilities
-        most_likely_score = max(score_probs.items(), key=lambda x: x[1])
-        predicted_home, predicted_away = most_likely_score[0]
+        predicted_home, predicted_away = score_model.most_likely_score(score_probs)
         
-        # Calculate outcome probabilities from score matrix
-        home_win_prob = sum(prob for (h, a), prob in score_probs.items() if h > a) * 100
-        draw_prob = sum(prob for (h, a), prob in score_probs.items() if h == a) * 100
-        away_win_prob = sum(prob for (h, a), prob in score_probs.items() if h < a) * 100
+        # Calculate outcome probabilities from score matrix (triangular sums)
+        home_win_prob, draw_prob, away_win_prob = (
+            float(p) * 100 for p in score_model.outcome_probabilities(score_probs)
+        )
         
         # Normalize to ensure they sum to 100
         total_prob = home_win_prob + draw_prob + away_win_prob
@@ -187,81 +427,15 @@ class PredictionService:
             },
         }
         
-        # Cache result
-        if use_cache:
-            cache_key = f"pred_v2_{home_team_id}_{away_team_id}_{season}_{match_date.isoformat()}"
-            _prediction_cache[cache_key] = (result, datetime.now())
-            if len(_prediction_cache) > 1000:
-                sorted_cache = sorted(_prediction_cache.items(), key=lambda x: x[1][1])
-                for key, _ in sorted_cache[:500]:
-                    del _prediction_cache[key]
-        
         return result
     
     def _calculate_elo_ratings(self, season: str, before_date: date) -> Dict[str, float]:
         """
-        Calculate Elo ratings for all teams based on match results.
-        Uses a simplified calculation that updates ratings after each match.
+        Elo ratings for all teams from the season's results before the date.
+        Served from the incremental Elo ledger (one replay per season, then
+        a binary search per date).
         """
-        cache_key = f"{season}_{before_date.isoformat()}"
-        
-        # Check cache
-        if cache_key in _elo_ratings_cache:
-            cached_ratings, cached_time = _elo_ratings_cache[cache_key]
-            if datetime.now() - cached_time < ELO_CACHE_TTL:
-                return cached_ratings
-        
-        # Initialize all teams with base rating
-        ratings: Dict[str, float] = {}
-        
-        # Get all finished matches in season before the date
-        query = select(Match).where(
-            and_(
-                Match.season == season,
-                Match.match_date < before_date,
-                Match.status == "finished"
-            )
-        ).order_by(Match.match_date.asc())
-        
-        matches = self.pl_session.exec(query).all()
-        
-        for match in matches:
-            home_id = str(match.home_team_id)
-            away_id = str(match.away_team_id)
-            
-            # Initialize ratings if not exists
-            if home_id not in ratings:
-                ratings[home_id] = BASE_ELO
-            if away_id not in ratings:
-                ratings[away_id] = BASE_ELO
-            
-            # Get current ratings (with home advantage)
-            home_rating = ratings[home_id] + HOME_ELO_ADVANTAGE
-            away_rating = ratings[away_id]
-            
-            # Calculate expected scores
-            home_expected = 1 / (1 + 10 ** ((away_rating - home_rating) / 400))
-            away_expected = 1 - home_expected
-            
-            # Get actual result (1 = win, 0.5 = draw, 0 = loss)
-            home_score = match.score_home or 0
-            away_score = match.score_away or 0
-            
-            if home_score > away_score:
-                home_actual, away_actual = 1.0, 0.0
-            elif home_score < away_score:
-                home_actual, away_actual = 0.0, 1.0
-            else:
-                home_actual, away_actual = 0.5, 0.5
-            
-            # Update ratings
-            ratings[home_id] += ELO_K_FACTOR * (home_actual - home_expected)
-            ratings[away_id] += ELO_K_FACTOR * (away_actual - away_expected)
-        
-        # Cache the ratings
-        _elo_ratings_cache[cache_key] = (ratings, datetime.now())
-        
-        return ratings
+        return elo_ledger.ratings_as_of(self.pl_session, season, before_date)
     
     async def _get_player_availability_factor(self, fpl_team_id: int) -> float:
         """
@@ -273,11 +447,10 @@ class PredictionService:
         - Lower values = key players missing
         """
         try:
-            bootstrap = await fpl_service.get_bootstrap_static()
-            elements = bootstrap.get('elements', [])
+            snapshot = await fpl_service.get_bootstrap_snapshot()
             
-            # Filter players for this team
-            team_players = [p for p in elements if p.get('team') == fpl_team_id]
+            # Players for this team (pre-grouped in the snapshot)
+            team_players = snapshot.get_team_players(fpl_team_id)
             
             if not team_players:
                 return 1.0
@@ -324,7 +497,7 @@ class PredictionService:
             # Calculate availability factor (minimum 0.7 to avoid extreme adjustments)
             factor = available_weighted_value / total_weighted_value
             return max(0.7, min(1.0, factor))
-            
+        
         except Exception as e:
             print(f"[PredictionService] Error calculating availability: {e}")
             return 1.0
@@ -424,64 +597,32 @@ class PredictionService:
         self,
         home_xg: float,
         away_xg: float,
-        max_goals: int = 7
-    ) -> Dict[Tuple[int, int], float]:
+        max_goals: int = score_model.MAX_GOALS
+    ) -> np.ndarray:
         """
         Calculate probability of each scoreline using Poisson distribution.
+        Returns a (max_goals, max_goals) matrix indexed [home_goals, away_goals].
         
         Poisson is appropriate for goal scoring as:
         - Goals are independent events
         - Average rate is known (xG)
         - Events occur in fixed interval (90 mins)
         """
-        probabilities = {}
-        
-        for home_goals in range(max_goals):
-            for away_goals in range(max_goals):
-                # P(X=k) = (λ^k * e^-λ) / k!
-                prob = poisson.pmf(home_goals, home_xg) * poisson.pmf(away_goals, away_xg)
-                probabilities[(home_goals, away_goals)] = prob
-        
-        return probabilities
-    
-    def _calculate_fallback_probabilities(
-        self,
-        home_xg: float,
-        away_xg: float,
-        max_goals: int = 7
-    ) -> Dict[Tuple[int, int], float]:
-        """
-        Fallback probability calculation if scipy is not available.
-        Uses manual Poisson formula.
-        """
-        def poisson_pmf(k: int, lambda_val: float) -> float:
-            """Calculate Poisson probability mass function"""
-            return (lambda_val ** k) * math.exp(-lambda_val) / math.factorial(k)
-        
-        probabilities = {}
-        
-        for home_goals in range(max_goals):
-            for away_goals in range(max_goals):
-                prob = poisson_pmf(home_goals, home_xg) * poisson_pmf(away_goals, away_xg)
-                probabilities[(home_goals, away_goals)] = prob
-        
-        return probabilities
+        return score_model.score_matrix(home_xg, away_xg, max_goals)
     
     def _get_top_scorelines(
         self,
-        score_probs: Dict[Tuple[int, int], float],
+        score_probs: np.ndarray,
         n: int = 6
     ) -> List[Dict[str, Any]]:
         """Get top N most likely scorelines"""
-        sorted_scores = sorted(score_probs.items(), key=lambda x: x[1], reverse=True)
-        
         return [
             {
-                'home': score[0],
-                'away': score[1],
+                'home': home,
+                'away': away,
                 'probability': round(prob * 100, 1)
             }
-            for score, prob in sorted_scores[:n]
+            for home, away, prob in score_model.top_scorelines(score_probs, n)
         ]
     
     def _calculate_confidence_v2(
@@ -619,28 +760,92 @@ class PredictionService:
         match_date: date,
     ) -> Dict[str, List[Dict[str, Any]]]:
         """Predict most likely goal scorers for each team"""
-        home_recent_matches = self._get_recent_matches(home_team_id, season, match_date, limit=10)
-        away_recent_matches = self._get_recent_matches(away_team_id, season, match_date, limit=10)
-        
-        home_scorers = self._get_player_scoring_stats(home_team_id, home_recent_matches)
-        away_scorers = self._get_player_scoring_stats(away_team_id, away_recent_matches)
-        
-        home_def_strength = self._get_defensive_strength(home_team_id, season, match_date, is_home=True)
-        away_def_strength = self._get_defensive_strength(away_team_id, season, match_date, is_home=False)
-        
-        for scorer in home_scorers:
-            scorer['probability'] = min(100, scorer['probability'] * (1 + (1 - away_def_strength) * 0.2))
-        
-        for scorer in away_scorers:
-            scorer['probability'] = min(100, scorer['probability'] * (1 + (1 - home_def_strength) * 0.2))
+        return self.predict_goal_scorers_batch(
+            [{'home_team_id': home_team_id, 'away_team_id': away_team_id, 'match_date': match_date}],
+            season,
+        )[0]
+    
+    def predict_goal_scorers_batch(
+        self,
+        fixtures: List[Dict[str, Any]],
+        season: str,
+    ) -> List[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Goal scorer predictions for several fixtures (e.g. a whole gameweek).
+        Each fixture dict has home_team_id, away_team_id and match_date.
+        Form windows come from one snapshot query and scorer tables for every
+        team from one grouped aggregate query.
+        """
+        from uuid import UUID
         
-        home_scorers.sort(key=lambda x: x['probability'], reverse=True)
-        away_scorers.sort(key=lambda x: x['probability'], reverse=True)
+        def to_uuid(team_id):
+            return UUID(team_id) if isinstance(team_id, str) and len(team_id) == 36 else team_id
+        
+        # Form snapshots for every team in the batch (one query); a team without
+        # one before its fixture falls back to the per-team match queries
+        team_ids = {to_uuid(f['home_team_id']) for f in fixtures} | {to_uuid(f['away_team_id']) for f in fixtures}
+        snapshots = team_form_service.get_snapshots(
+            self.pl_session, team_ids, season, max(f['match_date'] for f in fixtures)
+        ) if fixtures else {}
+        
+        def snapshot_before(team_uuid, venue: str, match_date: date):
+            team_snapshots = snapshots.get((team_uuid, venue), [])
+            end = bisect_left([s.as_of_date for s in team_snapshots], match_date)
+            return team_snapshots[end - 1] if end else None
+        
+        def recent_entries(team_uuid, match_date: date) -> List[Dict[str, Any]]:
+            snapshot = snapshot_before(team_uuid, "all", match_date)
+            if snapshot is not None:
+                return snapshot.recent or []
+            return self._get_recent_entries(team_uuid, season, match_date, limit=FORM_WINDOW)
+        
+        def defensive_strength(team_uuid, match_date: date, is_home: bool) -> float:
+            snapshot = snapshot_before(team_uuid, "home" if is_home else "away", match_date)
+            if snapshot is None:
+                return self._get_defensive_strength(team_uuid, season, match_date, is_home=is_home)
+            return max(0, min(1, 1 - (snapshot.avg_goals_against / 3)))
+        
+        # (team, recent match ids, opponent defensive strength) per fixture side
+        sides = []
+        for fixture in fixtures:
+            home_uuid = to_uuid(fixture['home_team_id'])
+            away_uuid = to_uuid(fixture['away_team_id'])
+            match_date = fixture['match_date']
+            
+            home_recent = recent_entries(home_uuid, match_date)
+            away_recent = recent_entries(away_uuid, match_date)
+            home_def_strength = defensive_strength(home_uuid, match_date, is_home=True)
+            away_def_strength = defensive_strength(away_uuid, match_date, is_home=False)
+            
+            sides.append((home_uuid, [e['match_id'] for e in home_recent], away_def_strength))
+            sides.append((away_uuid, [e['match_id'] for e in away_recent], home_def_strength))
+        
+        # One query per round; a round holds at most one match window per team
+        rounds: List[Dict[Any, List[Any]]] = []
+        side_rounds = []
+        for team_uuid, match_ids, _ in sides:
+            for idx, windows in enumerate(rounds):
+                if windows.get(team_uuid, match_ids) == match_ids:
+                    break
+            else:
+                idx = len(rounds)
+                rounds.append({})
+            rounds[idx][team_uuid] = match_ids
+            side_rounds.append(idx)
+        round_results = [self._get_scoring_stats_batch(windows) for windows in rounds]
+        
+        tables = []
+        for (team_uuid, _, opponent_def_strength), idx in zip(sides, side_rounds):
+            scorers = [dict(scorer) for scorer in round_results[idx].get(team_uuid, [])]
+            for scorer in scorers:
+                scorer['probability'] = min(100, scorer['probability'] * (1 + (1 - opponent_def_strength) * 0.2))
+            scorers.sort(key=lambda x: x['probability'], reverse=True)
+            tables.append(scorers[:5])
         
-        return {
-            "homeScorers": home_scorers[:5],
-            "awayScorers": away_scorers[:5],
-        }
+        return [
+            {"homeScorers": tables[i], "awayScorers": tables[i + 1]}
+            for i in range(0, len(tables), 2)
+        ]
     
     def _get_team_form(
         self,
@@ -650,10 +855,17 @@ class PredictionService:
         is_home: bool,
         limit: int = 10
     ) -> Dict[str, float]:
-        """Get team form statistics"""
+        """Get team form statistics (from team_form_snapshots when available)"""
         from uuid import UUID
         team_uuid = UUID(team_id) if isinstance(team_id, str) and len(team_id) == 36 else team_id
         
+        if limit == FORM_WINDOW:
+            form = team_form_service.get_form(
+                self.pl_session, team_uuid, season, before_date, "home" if is_home else "away"
+            )
+            if form is not None:
+                return form
+        
         if is_home:
             query = select(Match).where(
                 and_(
@@ -676,53 +888,12 @@ class PredictionService:
         query = query.order_by(Match.match_date.desc()).limit(limit)
         matches = self.pl_session.exec(query).all()
         
-        if not matches:
-            return {
-                'avg_goals_for': 1.35,
-                'avg_goals_against': 1.35,
-                'wins': 0,
-                'draws': 0,
-                'losses': 0,
-                'matches_played': 0,
-            }
-        
-        weighted_goals_for = 0
-        weighted_goals_against = 0
-        total_weight = 0
-        wins = 0
-        draws = 0
-        losses = 0
-        
-        for idx, match in enumerate(matches):
-            weight = 1.0 - (idx * 0.5 / len(matches)) if len(matches) > 1 else 1.0
-            weight = max(0.5, weight)
-            
-            if match.home_team_id == team_uuid:
-                goals_for_val = match.score_home or 0
-                goals_against_val = match.score_away or 0
-            else:
-                goals_for_val = match.score_away or 0
-                goals_against_val = match.score_home or 0
-            
-            weighted_goals_for += goals_for_val * weight
-            weighted_goals_against += goals_against_val * weight
-            total_weight += weight
-            
-            if goals_for_val > goals_against_val:
-                wins += 1
-            elif goals_for_val == goals_against_val:
-                draws += 1
-            else:
-                losses += 1
-        
-        return {
-            'avg_goals_for': weighted_goals_for / total_weight if total_weight > 0 else 1.35,
-            'avg_goals_against': weighted_goals_against / total_weight if total_weight > 0 else 1.35,
-            'wins': wins,
-            'draws': draws,
-            'losses': losses,
-            'matches_played': len(matches),
-        }
+        return self._summarize_form(matches, team_uuid)
+    
+    @staticmethod
+    def _summarize_form(matches: List[Match], team_uuid: Any) -> Dict[str, float]:
+        """Weighted form summary from a team's matches (most recent first)"""
+        return summarize_window([match_entry(match, team_uuid) for match in matches])
     
     def _get_head_to_head(
         self,
@@ -749,6 +920,11 @@ class PredictionService:
         
         matches = self.pl_session.exec(query).all()
         
+        return self._format_head_to_head(matches, home_uuid)
+    
+    @staticmethod
+    def _format_head_to_head(matches: List[Match], home_uuid: Any) -> List[Dict[str, Any]]:
+        """H2H records (most recent first) from the perspective of the given home team"""
         h2h = []
         for match in matches:
             if match.home_team_id == home_uuid:
@@ -788,81 +964,116 @@ class PredictionService:
         
         return list(self.pl_session.exec(query).all())
     
-    def _get_player_scoring_stats(
+    def _get_recent_entries(
         self,
         team_id: str,
-        recent_matches: List[Match]
+        season: str,
+        before_date: date,
+        limit: int = 10
     ) -> List[Dict[str, Any]]:
-        """Get player scoring statistics from recent matches"""
-        if not recent_matches:
-            return []
+        """Recent results for a team (most recent first) as team form window entries"""
+        from uuid import UUID
+        team_uuid = UUID(team_id) if isinstance(team_id, str) and len(team_id) == 36 else team_id
         
-        match_ids = [match.id for match in recent_matches]
+        if limit <= FORM_WINDOW:
+            snapshot = team_form_service.get_snapshot(self.pl_session, team_uuid, season, before_date)
+            if snapshot is not None:
+                return (snapshot.recent or [])[:limit]
         
+        matches = self._get_recent_matches(team_id, season, before_date, limit=limit)
+        return [match_entry(match, team_uuid) for match in matches]
+    
+    def _get_player_scoring_stats(
+        self,
+        team_id: str,
+        recent_match_ids: List[Any]
+    ) -> List[Dict[str, Any]]:
+        """Get player scoring statistics from recent matches"""
         from uuid import UUID
         team_uuid = UUID(team_id) if isinstance(team_id, str) and len(team_id) == 36 else team_id
-        
-        query = select(MatchEvent).where(
+        return self._get_scoring_stats_batch({team_uuid: recent_match_ids}).get(team_uuid, [])
+    
+    def _get_scoring_stats_batch(self, windows: Dict[Any, List[Any]]) -> Dict[Any, List[Dict[str, Any]]]:
+        """
+        Scorer tables for several teams, each over its own recent match ids.
+        Goals (from goal events), shots and minutes (from player stats) are
+        aggregated per player in SQL and joined to players in one round trip.
+        """
+        from uuid import UUID
+        windows = {
+            team_uuid: [UUID(m) if isinstance(m, str) else m for m in match_ids]
+            for team_uuid, match_ids in windows.items() if match_ids
+        }
+        if not windows:
+            return {}
+        
+        goals = select(
+            MatchEvent.team_id,
+            MatchEvent.player_id,
+            func.count(MatchEvent.id).label('goals'),
+        ).where(
             and_(
-                MatchEvent.match_id.in_(match_ids),
                 MatchEvent.event_type == "goal",
-                MatchEvent.team_id == team_uuid,
+                MatchEvent.player_id.is_not(None),
+                or_(*[
+                    and_(MatchEvent.team_id == team_uuid, MatchEvent.match_id.in_(match_ids))
+                    for team_uuid, match_ids in windows.items()
+                ]),
             )
-        )
-        
-        goal_events = self.pl_session.exec(query).all()
-        
-        player_goals = defaultdict(int)
-        player_names = {}
-        
-        for event in goal_events:
-            if event.player_id:
-                player_goals[str(event.player_id)] += 1
-                player_name = event.details.get('player_name', 'Unknown') if event.details else 'Unknown'
-                if player_name != 'Unknown':
-                    player_names[str(event.player_id)] = player_name
-        
-        scorers = []
-        for player_id_str, goals in player_goals.items():
-            from uuid import UUID
-            try:
-                player_uuid = UUID(player_id_str)
-                player = self.pl_session.get(Player, player_uuid)
-            except (ValueError, TypeError):
-                player = self.pl_session.get(Player, player_id_str)
+        ).group_by(MatchEvent.team_id, MatchEvent.player_id).subquery()
+        
+        stats = select(
+            MatchPlayerStats.team_id,
+            MatchPlayerStats.player_id,
+            func.sum(MatchPlayerStats.shots).label('shots'),
+            func.sum(MatchPlayerStats.minutes).label('minutes'),
+        ).where(
+            or_(*[
+                and_(MatchPlayerStats.team_id == team_uuid, MatchPlayerStats.match_id.in_(match_ids))
+                for team_uuid, match_ids in windows.items()
+            ])
+        ).group_by(MatchPlayerStats.team_id, MatchPlayerStats.player_id).subquery()
+        
+        rows = self.pl_session.exec(
+            select(Player, goals.c.team_id, goals.c.goals, stats.c.shots, stats.c.minutes)
+            .join(goals, goals.c.player_id == Player.id)
+            .outerjoin(stats, and_(stats.c.player_id == goals.c.player_id, stats.c.team_id == goals.c.team_id))
+            .order_by(goals.c.goals.desc(), Player.name)
+        ).all()
+        
+        scorers = defaultdict(list)
+        for player, team_uuid, goal_count, shots, minutes in rows:
+            matches_played = len(windows[team_uuid])
+            probability = min(100, (goal_count / matches_played) * 100 * 2)
             
-            if player:
-                probability = min(100, (goals / len(recent_matches)) * 100 * 2) if recent_matches else 0
-                
-                position_boost = 1.0
-                if player.position in ['FW', 'FWD', 'ST', 'F']:
-                    position_boost = 1.3
-                elif player.position in ['MF', 'MID', 'AM', 'CM', 'M']:
-                    position_boost = 1.1
-                
-                probability = min(100, probability * position_boost)
-                
-                form: str = 'neutral'
-                if goals >= 3:
-                    form = 'hot'
-                elif goals == 0:
-                    form = 'cold'
-                
-                player_id_int = 0
-                if player.fbref_id and player.fbref_id.isdigit():
-                    try:
-                        player_id_int = int(player.fbref_id)
-                    except:
-                        pass
-                
-                scorers.append({
-                    'playerId': player_id_int,
-                    'playerName': player.name,
-                    'position': player.position or 'MID',
-                    'probability': round(probability, 1),
-                    'form': form,
-                    'recentGoals': goals,
-                })
+            position_boost = 1.0
+            if player.position in ['FW', 'FWD', 'ST', 'F']:
+                position_boost = 1.3
+            elif player.position in ['MF', 'MID', 'AM', 'CM', 'M']:
+                position_boost = 1.1
+            
+            probability = min(100, probability * position_boost)
+            
+            form: str = 'neutral'
+            if goal_count >= 3:
+                form = 'hot'
+            elif goal_count == 0:
+                form = 'cold'
+            
+            player_id_int = 0
+            if player.fbref_id and player.fbref_id.isdigit():
+                player_id_int = int(player.fbref_id)
+            
+            scorers[team_uuid].append({
+                'playerId': player_id_int,
+                'playerName': player.name,
+                'position': player.position or 'MID',
+                'probability': round(probability, 1),
+                'form': form,
+                'recentGoals': goal_count,
+                'recentShots': shots or 0,
+                'recentMinutes': minutes or 0,
+            })
         
         return scorers
     
@@ -888,30 +1099,25 @@ class PredictionService:
         limit: int = 5
     ) -> List[Dict[str, Any]]:
         """Get team form data for charts"""
-        from uuid import UUID
-        team_uuid = UUID(team_id) if isinstance(team_id, str) and len(team_id) == 36 else team_id
+        recent = self._get_recent_entries(team_id, season, before_date, limit=limit)
         
-        matches = self._get_recent_matches(team_id, season, before_date, limit=limit)
+        from uuid import UUID
+        opponent_ids = {UUID(e['opponent_id']) for e in recent}
+        opponents = {
+            str(team.id): team.name
+            for team in self.pl_session.exec(select(Team).where(Team.id.in_(opponent_ids))).all()
+        } if opponent_ids else {}
         
         form_data = []
-        for match in reversed(matches):
-            if match.home_team_id == team_uuid:
-                opponent_team = self.pl_session.get(Team, match.away_team_id)
-                opponent_name = opponent_team.name if opponent_team else "Unknown"
-                form_data.append({
-                    'match': f"vs {opponent_name}",
-                    'goalsFor': match.score_home or 0,
-                    'goalsAgainst': match.score_away or 0,
-                    'result': 'W' if (match.score_home or 0) > (match.score_away or 0) else ('D' if (match.score_home or 0) == (match.score_away or 0) else 'L'),
-                })
-            else:
-                opponent_team = self.pl_session.get(Team, match.home_team_id)
-                opponent_name = opponent_team.name if opponent_team else "Unknown"
-                form_data.append({
-                    'match': f"@ {opponent_name}",
-                    'goalsFor': match.score_away or 0,
-                    'goalsAgainst': match.score_home or 0,
-                    'result': 'W' if (match.score_away or 0) > (match.score_home or 0) else ('D' if (match.score_away or 0) == (match.score_home or 0) else 'L'),
-                })
+        for entry in reversed(recent):
+            opponent_name = opponents.get(entry['opponent_id'], "Unknown")
+            goals_for = entry['goals_for']
+            goals_against = entry['goals_against']
+            form_data.append({
+                'match': f"vs {opponent_name}" if entry['is_home'] else f"@ {opponent_name}",
+                'goalsFor': goals_for,
+                'goalsAgainst': goals_against,
+                'result': 'W' if goals_for > goals_against else ('D' if goals_for == goals_against else 'L'),
+            })
         
         return form_data
@@ -0,0 +1,219 @@
+"""
+Push Delivery
+Concurrent web-push sending with batched NotificationLog writes.
+
+pywebpush is synchronous, so each send runs on a bounded thread pool rather
+than blocking the event loop. Worker threads keep one requests.Session per
+push-service host (FCM, Mozilla, Apple, ...) so connections are reused
+across notifications. 429 and 5xx responses are retried with exponential
+backoff (honouring Retry-After) without holding a thread while waiting;
+404/410 mark the subscription inactive. Log rows are buffered and written
+with one bulk INSERT every LOG_BATCH_SIZE rows and at the end of each
+deliver() call.
+"""
+import asyncio
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Any, Set, Tuple
+from urllib.parse import urlparse
+
+import requests
+from sqlalchemy import insert, update
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models.push_subscription import PushSubscription, NotificationLog
+
+try:
+    from pywebpush import webpush, WebPushException
+    from py_vapid import Vapid
+    WEBPUSH_AVAILABLE = True
+except ImportError:
+    WEBPUSH_AVAILABLE = False
+
+MAX_WORKERS = 32
+MAX_RETRIES = 3
+BASE_BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 30.0
+SEND_TIMEOUT_SECONDS = 10.0
+LOG_BATCH_SIZE = 500
+
+
+class PushDeliveryService:
+    """Sends web-push notifications on a thread pool and batches their logs"""
+    
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="push")
+        self._local = threading.local()
+        self._vapid = None
+        self._log_rows: List[Dict[str, Any]] = []
+        self._expired: Set[int] = set()  # subscription ids answered with 404/410
+    
+    @property
+    def enabled(self) -> bool:
+        return WEBPUSH_AVAILABLE and bool(settings.VAPID_PRIVATE_KEY)
+    
+    def _get_vapid(self):
+        # Parse the private key once rather than on every send
+        if self._vapid is None:
+            self._vapid = Vapid.from_string(private_key=settings.VAPID_PRIVATE_KEY)
+        return self._vapid
+    
+    def _session_for(self, endpoint: str) -> requests.Session:
+        """This thread's HTTP session for the endpoint's push service"""
+        sessions = getattr(self._local, 'sessions', None)
+        if sessions is None:
+            sessions = self._local.sessions = {}
+        host = urlparse(endpoint).netloc
+        session = sessions.get(host)
+        if session is None:
+            session = sessions[host] = requests.Session()
+        return session
+    
+    def _send_once(self, subscription_info: Dict[str, Any], payload: str) -> Tuple[Optional[int], Optional[str], Optional[float]]:
+        """
+        One blocking send (runs on the pool).
+        Returns (status, error, retry_after); status is None on a network error.
+        """
+        try:
+            response = webpush(
+                subscription_info=subscription_info,
+                data=payload,
+                vapid_private_key=self._get_vapid(),
+                # webpush fills in aud/exp on the dict it's given, so never share it
+                vapid_claims={"sub": f"mailto:{settings.VAPID_EMAIL}"},
+                timeout=SEND_TIMEOUT_SECONDS,
+                requests_session=self._session_for(subscription_info['endpoint']),
+            )
+            return response.status_code, None, None
+        except WebPushException as e:
+            response = e.response
+            if response is None:
+                return None, str(e), None
+            retry_after = response.headers.get('Retry-After')
+            try:
+                retry_after = float(retry_after) if retry_after else None
+            except ValueError:
+                retry_after = None
+            return response.status_code, str(e), retry_after
+        except requests.RequestException as e:
+            return None, str(e), None
+    
+    def _target(self, subscription: PushSubscription) -> Dict[str, Any]:
+        """Plain copy of what a send needs, so commits during delivery don't expire it"""
+        return {
+            'id': subscription.id,
+            'user_id': subscription.user_id,
+            'info': {
+                'endpoint': subscription.endpoint,
+                'keys': {
+                    'p256dh': subscription.p256dh_key,
+                    'auth': subscription.auth_key,
+                }
+            },
+        }
+    
+    async def send(self, target: Dict[str, Any], notification: Dict[str, Any]) -> bool:
+        """Send one notification, retrying 429/5xx/network errors, and buffer its log row"""
+        payload = json.dumps({
+            'title': notification['title'],
+            'body': notification['body'],
+            'icon': '/icon-192.png',
+            'badge': '/icon-192.png',
+            'tag': f"{notification['type']}-{notification['player_id']}-{datetime.now().timestamp()}",
+            'data': {
+                'type': notification['type'],
+                'player_id': notification['player_id'],
+            }
+        })
+        
+        loop = asyncio.get_running_loop()
+        for attempt in range(MAX_RETRIES + 1):
+            status, error, retry_after = await loop.run_in_executor(
+                self._executor, self._send_once, target['info'], payload
+            )
+            retryable = status is None or status == 429 or status >= 500
+            if error is None or not retryable or attempt == MAX_RETRIES:
+                break
+            # Back off without holding a pool thread
+            await asyncio.sleep(min(retry_after or BASE_BACKOFF_SECONDS * 2 ** attempt, MAX_BACKOFF_SECONDS))
+        
+        if status in (404, 410):
+            self._expired.add(target['id'])
+        
+        self._log_rows.append({
+            'user_id': target['user_id'],
+            'notification_type': notification['type'],
+            'player_id': notification['player_id'],
+            'player_name': notification['player_name'],
+            'message': notification['body'],
+            'sent_at': datetime.now(timezone.utc),
+            'success': error is None,
+            'error_message': error,
+        })
+        return error is None
+    
+    async def deliver(
+        self,
+        session: Session,
+        deliveries: List[Tuple[PushSubscription, Dict[str, Any]]],
+    ) -> int:
+        """
+        Send many notifications concurrently (bounded by the pool) and return
+        how many succeeded. Logs are flushed whenever a batch fills up and
+        before returning.
+        """
+        if not deliveries:
+            return 0
+        if not self.enabled:
+            print(f"[Push] VAPID keys not configured, skipping {len(deliveries)} notification(s)")
+            return 0
+        
+        async def send_and_flush(target: Dict[str, Any], notification: Dict[str, Any]) -> bool:
+            sent = await self.send(target, notification)
+            if len(self._log_rows) >= LOG_BATCH_SIZE:
+                self.flush(session)
+            return sent
+        
+        start = time.monotonic()
+        targets = {}
+        for subscription, _ in deliveries:
+            if subscription.id not in targets:
+                targets[subscription.id] = self._target(subscription)
+        try:
+            results = await asyncio.gather(*(
+                send_and_flush(targets[subscription.id], notification) for subscription, notification in deliveries
+            ))
+        finally:
+            # Write what was sent even if delivery was cancelled part-way
+            self.flush(session)
+        sent = sum(1 for result in results if result)
+        print(f"[Push] Sent {sent}/{len(deliveries)} notification(s) in {time.monotonic() - start:.1f}s")
+        return sent
+    
+    def flush(self, session: Session):
+        """Bulk-insert buffered logs and deactivate expired subscriptions (commits)"""
+        rows, self._log_rows = self._log_rows, []
+        expired, self._expired = self._expired, set()
+        if not rows and not expired:
+            return
+        
+        if rows:
+            session.execute(insert(NotificationLog), rows)
+        if expired:
+            session.execute(
+                update(PushSubscription)
+                .where(PushSubscription.id.in_(list(expired)))
+                .values(is_active=False, last_error="Subscription expired or invalid")
+            )
+        session.commit()
+    
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
+
+
+# Singleton instance
+push_delivery_service = PushDeliveryService()
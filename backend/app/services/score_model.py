@@ -0,0 +1,96 @@
+"""
+Score Model
+Vectorized Poisson scoreline model used by the prediction service.
+
+Goals for each side are modelled as independent Poisson variables, so the
+scoreline distribution is the outer product of two pmf vectors. Every
+function accepts a single (home_xg, away_xg) pair or a batch of them, so a
+whole gameweek or backtest season can be evaluated in one call.
+"""
+from typing import Dict, List, Tuple, Any, Union
+
+import numpy as np
+
+# Scorelines 0..MAX_GOALS-1 for each side (matches the original 7x7 grid)
+MAX_GOALS = 7
+
+ArrayLike = Union[float, List[float], np.ndarray]
+
+
+def poisson_pmf(xg: ArrayLike, max_goals: int = MAX_GOALS) -> np.ndarray:
+    """
+    P(goals = k) for k in 0..max_goals-1.
+    Returns shape (max_goals,) for a scalar xg, or (B, max_goals) for B values.
+    Uses the recurrence p(k) = p(k-1) * xg / k instead of factorials.
+    """
+    lam = np.asarray(xg, dtype=np.float64)
+    ratios = np.ones(lam.shape + (max_goals,), dtype=np.float64)
+    ratios[..., 1:] = lam[..., None] / np.arange(1, max_goals, dtype=np.float64)
+    ratios[..., 0] = np.exp(-lam)
+    return np.cumprod(ratios, axis=-1)
+
+
+def score_matrix(home_xg: ArrayLike, away_xg: ArrayLike, max_goals: int = MAX_GOALS) -> np.ndarray:
+    """
+    Scoreline probabilities: matrix[h, a] = P(home scores h) * P(away scores a).
+    Returns (G, G) for scalar inputs or (B, G, G) for batches.
+    """
+    home_pmf = poisson_pmf(home_xg, max_goals)
+    away_pmf = poisson_pmf(away_xg, max_goals)
+    return home_pmf[..., :, None] * away_pmf[..., None, :]
+
+
+def outcome_probabilities(matrix: np.ndarray) -> np.ndarray:
+    """
+    Home win / draw / away win mass of one or more score matrices.
+    Home wins sit below the diagonal (h > a), away wins above it.
+    Returns shape (3,) or (B, 3).
+    """
+    size = matrix.shape[-1]
+    home = np.tril(matrix, k=-1).sum(axis=(-2, -1))
+    draw = np.trace(matrix, axis1=-2, axis2=-1)
+    away = np.triu(matrix, k=1).sum(axis=(-2, -1))
+    return np.stack([home, draw, away], axis=-1) if size else np.zeros(matrix.shape[:-2] + (3,))
+
+
+def most_likely_score(matrix: np.ndarray) -> Tuple[int, int]:
+    """Most likely (home, away) scoreline; ties go to the first in row-major order"""
+    flat_index = int(np.argmax(matrix))
+    home, away = divmod(flat_index, matrix.shape[-1])
+    return home, away
+
+
+def top_scorelines(matrix: np.ndarray, n: int = 6) -> List[Tuple[int, int, float]]:
+    """
+    Top n (home, away, probability) scorelines of a single (G, G) matrix.
+    Ties are ordered row-major, matching a stable descending sort.
+    """
+    flat = matrix.ravel()
+    n = min(n, flat.size)
+    if n <= 0:
+        return []
+    # Everything tied with the n-th value is a candidate so ties resolve deterministically
+    kth = flat[np.argpartition(flat, flat.size - n)[flat.size - n]]
+    candidates = np.flatnonzero(flat >= kth)
+    order = candidates[np.lexsort((candidates, -flat[candidates]))][:n]
+    size = matrix.shape[-1]
+    return [(int(i // size), int(i % size), float(flat[i])) for i in order]
+
+
+def summarize(home_xg: ArrayLike, away_xg: ArrayLike, n: int = 6, max_goals: int = MAX_GOALS) -> List[Dict[str, Any]]:
+    """
+    Evaluate a batch of fixtures in one pass.
+    Returns per fixture: matrix, outcomes (home/draw/away), most likely score and top n scorelines.
+    """
+    matrices = score_matrix(np.atleast_1d(home_xg), np.atleast_1d(away_xg), max_goals)
+    outcomes = outcome_probabilities(matrices)
+    flat_best = matrices.reshape(len(matrices), -1).argmax(axis=1)
+    return [
+        {
+            'matrix': matrices[i],
+            'outcomes': outcomes[i],
+            'most_likely': divmod(int(flat_best[i]), max_goals),
+            'top': top_scorelines(matrices[i], n),
+        }
+        for i in range(len(matrices))
+    ]
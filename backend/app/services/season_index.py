@@ -0,0 +1,224 @@
+"""
+Season Index Reader
+Streams the matches of a scraped data/<season>/index.json one at a time.
+
+index.json is a single document - {"season", "scraped_at", "matches": {key:
+match, ...}, "players", "clubs"} - written with json.dump by the scrapers.
+Rather than loading it whole, the reader pulls fixed-size chunks and uses
+the C decoder's raw_decode on one match at a time, dropping consumed text
+as it goes, so memory stays around one chunk plus one match whatever the
+season size, and the first match is available after the first chunk.
+Reading stops at the end of "matches"; players and clubs are never parsed.
+
+Index entries are in the scraped format; transform_match_data converts one
+to the format MatchImportService imports.
+"""
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, Iterator, Optional, Tuple, Union
+
+CHUNK_SIZE = 256 * 1024
+WHITESPACE = " \t\n\r"
+
+
+class _Stream:
+    """A text file read in chunks, with JSON values decoded from the front"""
+    
+    def __init__(self, f, chunk_size: int):
+        self.f = f
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+    
+    def _fill(self) -> bool:
+        if self.eof:
+            return False
+        # Read at least as much as is pending, so a value spanning many
+        # chunks is re-decoded a logarithmic number of times, not once per chunk
+        chunk = self.f.read(max(self.chunk_size, len(self.buf) - self.pos))
+        if not chunk:
+            self.eof = True
+            return False
+        # Drop what's been consumed so the buffer doesn't grow with the file
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+    
+    def peek(self) -> str:
+        """Next non-whitespace character ('' at end of file)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+    
+    def expect(self, char: str):
+        if self.peek() != char:
+            raise ValueError(f"Expected {char!r} in season index, found {self.peek()!r}")
+        self.pos += 1
+    
+    def value(self) -> Tuple[Any, str]:
+        """Decode the next JSON value; returns (value, its raw text)"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # Value runs past the buffer (or the file is malformed)
+                if self._fill():
+                    continue
+                raise
+            # A number or literal ending at the buffer edge may continue in the next chunk
+            if end == len(self.buf) and self._fill():
+                continue
+            raw = self.buf[self.pos:end]
+            self.pos = end
+            return value, raw
+
+
+def iter_index_matches(
+    path: Union[str, Path],
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Tuple[str, Dict[str, Any], str]]:
+    """
+    Yield (match key, match record, raw JSON text of the record) for each
+    entry of the index's "matches" object, in file order.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = _Stream(f, chunk_size)
+        stream.expect("{")
+        while stream.peek() not in ("}", ""):
+            key, _ = stream.value()
+            stream.expect(":")
+            if key != "matches":
+                stream.value()  # season, scraped_at, ... (small)
+            else:
+                stream.expect("{")
+                while stream.peek() not in ("}", ""):
+                    match_key, _ = stream.value()
+                    stream.expect(":")
+                    match, raw = stream.value()
+                    yield match_key, match, raw
+                    if stream.peek() == ",":
+                        stream.pos += 1
+                return
+            if stream.peek() == ",":
+                stream.pos += 1
+
+
+def transform_match_data(match_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Transform scraped match JSON format to import service format"""
+    transformed = {}
+    
+    # Transform date
+    date_str = match_data.get("match_info", {}).get("date") or match_data.get("date", "")
+    transformed_date = None
+    
+    if not date_str:
+        return None
+    
+    date_formats = [
+        "%B %d, %Y",      # "December 2, 2023"
+        "%Y-%m-%d",        # "2023-12-02"
+        "%Y_%m_%d",        # "2023_08_12"
+        "%d %B %Y",        # "2 December 2023"
+        "%B %d %Y",        # "December 2 2023"
+    ]
+    
+    for fmt in date_formats:
+        try:
+            parsed_date = datetime.strptime(date_str, fmt)
+            transformed_date = parsed_date.strftime("%Y-%m-%d")
+            break
+        except ValueError:
+            continue
+    
+    if not transformed_date:
+        return None
+    
+    # Get scores
+    score_data = match_data.get("score", {})
+    match_info_data = match_data.get("match_info", {})
+    
+    home_score = match_info_data.get("home_score") or score_data.get("home")
+    away_score = match_info_data.get("away_score") or score_data.get("away")
+    
+    transformed["match_info"] = {
+        "date": transformed_date,
+        "home_score": home_score,
+        "away_score": away_score,
+        "attendance": match_info_data.get("attendance"),
+        "referee": match_info_data.get("referee"),
+        "venue": match_info_data.get("venue"),
+    }
+    
+    transformed["home_team"] = match_data.get("home_team", {})
+    transformed["away_team"] = match_data.get("away_team", {})
+    transformed["lineups"] = match_data.get("lineups", {})
+    transformed["player_stats"] = match_data.get("player_stats", {})
+    
+    # Transform team_stats
+    team_stats_data = match_data.get("team_stats", {})
+    if team_stats_data:
+        transformed_team_stats = {}
+        for side in ["home", "away"]:
+            if side in team_stats_data:
+                side_stats = team_stats_data[side].copy()
+                if "passes_completed" in side_stats:
+                    side_stats["passes"] = side_stats.pop("passes_completed")
+                elif "passes_attempted" in side_stats:
+                    side_stats["passes"] = side_stats.pop("passes_attempted")
+                if "passing_accuracy" in side_stats:
+                    side_stats["pass_accuracy"] = side_stats.pop("passing_accuracy")
+                transformed_team_stats[side] = side_stats
+        transformed["team_stats"] = transformed_team_stats
+    else:
+        transformed["team_stats"] = {}
+    
+    # Transform events
+    events_data = match_data.get("events", {})
+    if events_data:
+        transformed_events = {
+            "goals": events_data.get("goals", []),
+            "cards": events_data.get("cards", []),
+            "substitutions": [],
+        }
+        
+        for sub in events_data.get("substitutions", []):
+            player_out_name = sub.get("player_name")
+            player_out_id = sub.get("player_id")
+            player_in_name = sub.get("substituted_for")
+            
+            player_in_id = None
+            all_lineups = []
+            if transformed["lineups"].get("home"):
+                all_lineups.extend(transformed["lineups"]["home"].get("starting_xi", []))
+                all_lineups.extend(transformed["lineups"]["home"].get("substitutes", []))
+            if transformed["lineups"].get("away"):
+                all_lineups.extend(transformed["lineups"]["away"].get("starting_xi", []))
+                all_lineups.extend(transformed["lineups"]["away"].get("substitutes", []))
+            
+            for player in all_lineups:
+                if player.get("name") == player_in_name:
+                    player_in_id = player.get("fbref_id")
+                    break
+            
+            transformed_events["substitutions"].append({
+                "player_out": player_out_name,
+                "player_out_id": player_out_id,
+                "player_in": player_in_name,
+                "player_in_id": player_in_id,
+                "minute": sub.get("minute"),
+                "team": sub.get("team"),
+            })
+        
+        transformed["events"] = transformed_events
+    else:
+        transformed["events"] = {}
+    
+    return transformed
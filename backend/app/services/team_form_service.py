@@ -0,0 +1,281 @@
+"""
+Team Form Service
+Materialized rolling team form, maintained as matches are imported.
+
+After every finished match a team plays, a snapshot of its form (weighted
+goals for/against, W/D/L over the last FORM_WINDOW matches) is stored for
+all matches, and separately for home-only or away-only matches. A form
+lookup "before date D" is then one indexed read of the latest snapshot
+dated before D, instead of an ORDER BY ... LIMIT query per team.
+
+Snapshots carry their match window, so a new result is appended from the
+previous snapshot without touching the matches table. Anything that
+rewrites history (an older or re-scored match) rebuilds the team's season.
+"""
+from datetime import date
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete
+from sqlmodel import Session, select, and_, or_
+
+from app.models.pl_data import Match, TeamFormSnapshot
+
+# Matches in the rolling window (matches PredictionService's form limit)
+FORM_WINDOW = 10
+# League-average goals used when a team has no matches yet
+DEFAULT_GOALS = 1.35
+
+
+def summarize_window(recent: List[Dict[str, Any]]) -> Dict[str, float]:
+    """Weighted form summary from window entries (most recent first)"""
+    if not recent:
+        return {
+            'avg_goals_for': DEFAULT_GOALS,
+            'avg_goals_against': DEFAULT_GOALS,
+            'wins': 0,
+            'draws': 0,
+            'losses': 0,
+            'matches_played': 0,
+        }
+    
+    weighted_goals_for = 0
+    weighted_goals_against = 0
+    total_weight = 0
+    wins = 0
+    draws = 0
+    losses = 0
+    
+    for idx, entry in enumerate(recent):
+        # Linear decay from 1.0 to 0.5 across the window
+        weight = 1.0 - (idx * 0.5 / len(recent)) if len(recent) > 1 else 1.0
+        weight = max(0.5, weight)
+        
+        goals_for_val = entry['goals_for']
+        goals_against_val = entry['goals_against']
+        
+        weighted_goals_for += goals_for_val * weight
+        weighted_goals_against += goals_against_val * weight
+        total_weight += weight
+        
+        if goals_for_val > goals_against_val:
+            wins += 1
+        elif goals_for_val == goals_against_val:
+            draws += 1
+        else:
+            losses += 1
+    
+    return {
+        'avg_goals_for': weighted_goals_for / total_weight if total_weight > 0 else DEFAULT_GOALS,
+        'avg_goals_against': weighted_goals_against / total_weight if total_weight > 0 else DEFAULT_GOALS,
+        'wins': wins,
+        'draws': draws,
+        'losses': losses,
+        'matches_played': len(recent),
+    }
+
+
+def match_entry(match: Match, team_id: Any) -> Dict[str, Any]:
+    """Window entry for one match from the given team's perspective"""
+    is_home = str(match.home_team_id) == str(team_id)
+    return {
+        'match_id': str(match.id),
+        'date': match.match_date.isoformat() if match.match_date else '',
+        'opponent_id': str(match.away_team_id if is_home else match.home_team_id),
+        'is_home': is_home,
+        'goals_for': (match.score_home if is_home else match.score_away) or 0,
+        'goals_against': (match.score_away if is_home else match.score_home) or 0,
+    }
+
+
+def _team_venues(match: Match) -> Iterable[Tuple[UUID, str]]:
+    """(team, venue) pairs a match contributes to"""
+    for team_id, side in ((match.home_team_id, "home"), (match.away_team_id, "away")):
+        yield team_id, "all"
+        yield team_id, side
+
+
+def _build_snapshot(team_id: UUID, season: str, venue: str, as_of: date, recent: List[Dict[str, Any]]) -> TeamFormSnapshot:
+    return TeamFormSnapshot(
+        team_id=team_id,
+        season=season,
+        venue=venue,
+        as_of_date=as_of,
+        recent=recent,
+        **summarize_window(recent),
+    )
+
+
+def _is_scored(match: Match) -> bool:
+    return match.status == "finished" and match.score_home is not None and match.score_away is not None
+
+
+class TeamFormService:
+    """Reads and maintains team_form_snapshots"""
+    
+    def _to_uuid(self, team_id: Any) -> Any:
+        return UUID(team_id) if isinstance(team_id, str) and len(team_id) == 36 else team_id
+    
+    def get_snapshot(
+        self,
+        session: Session,
+        team_id: Any,
+        season: str,
+        before_date: date,
+        venue: str = "all",
+    ) -> Optional[TeamFormSnapshot]:
+        """Latest snapshot from matches strictly before the date (None if there is none)"""
+        return session.exec(
+            select(TeamFormSnapshot).where(
+                and_(
+                    TeamFormSnapshot.team_id == self._to_uuid(team_id),
+                    TeamFormSnapshot.season == season,
+                    TeamFormSnapshot.venue == venue,
+                    TeamFormSnapshot.as_of_date < before_date,
+                )
+            ).order_by(TeamFormSnapshot.as_of_date.desc()).limit(1)
+        ).first()
+    
+    def get_snapshots(
+        self,
+        session: Session,
+        team_ids: Iterable[Any],
+        season: str,
+        before_date: date,
+    ) -> Dict[Tuple[Any, str], List[TeamFormSnapshot]]:
+        """
+        Every snapshot dated before the date for several teams (one query),
+        as (team_id, venue) -> snapshots in date order
+        """
+        team_ids = {self._to_uuid(team_id) for team_id in team_ids}
+        snapshots: Dict[Tuple[Any, str], List[TeamFormSnapshot]] = {}
+        if not team_ids:
+            return snapshots
+        for snapshot in session.exec(
+            select(TeamFormSnapshot).where(
+                and_(
+                    TeamFormSnapshot.team_id.in_(team_ids),
+                    TeamFormSnapshot.season == season,
+                    TeamFormSnapshot.as_of_date < before_date,
+                )
+            ).order_by(TeamFormSnapshot.as_of_date.asc())
+        ).all():
+            snapshots.setdefault((snapshot.team_id, snapshot.venue), []).append(snapshot)
+        return snapshots
+    
+    def get_form(
+        self,
+        session: Session,
+        team_id: Any,
+        season: str,
+        before_date: date,
+        venue: str = "all",
+    ) -> Optional[Dict[str, float]]:
+        """Form summary in PredictionService's shape, or None without a snapshot"""
+        snapshot = self.get_snapshot(session, team_id, season, before_date, venue)
+        if snapshot is None:
+            return None
+        return {
+            'avg_goals_for': snapshot.avg_goals_for,
+            'avg_goals_against': snapshot.avg_goals_against,
+            'wins': snapshot.wins,
+            'draws': snapshot.draws,
+            'losses': snapshot.losses,
+            'matches_played': snapshot.matches_played,
+        }
+    
+    def record_match(self, session: Session, match: Match):
+        """
+        Update snapshots for a newly imported or updated match (caller commits).
+        Appends when the match is the team's latest, no-ops when it's already
+        recorded unchanged, and rebuilds the team's season otherwise (including
+        when the team has no snapshot for the season yet).
+        """
+        if not _is_scored(match):
+            return
+        
+        rebuild = set()
+        for team_id, venue in _team_venues(match):
+            if team_id in rebuild:
+                continue
+            latest = session.exec(
+                select(TeamFormSnapshot).where(
+                    and_(
+                        TeamFormSnapshot.team_id == team_id,
+                        TeamFormSnapshot.season == match.season,
+                        TeamFormSnapshot.venue == venue,
+                    )
+                ).order_by(TeamFormSnapshot.as_of_date.desc()).limit(1)
+            ).first()
+            entry = match_entry(match, team_id)
+            
+            if latest is None:
+                # No snapshot to append to (a new season, or a database not
+                # backfilled yet): replay the team's season from its matches
+                rebuild.add(team_id)
+            elif latest.as_of_date < match.match_date:
+                recent = [entry] + (latest.recent or [])[:FORM_WINDOW - 1]
+                session.add(_build_snapshot(team_id, match.season, venue, match.match_date, recent))
+            elif entry not in (latest.recent or []):
+                rebuild.add(team_id)
+        
+        for team_id in rebuild:
+            self.rebuild_team(session, team_id, match.season)
+    
+    def _replay(self, matches: List[Match], season: str, team_id: Optional[UUID] = None) -> List[TeamFormSnapshot]:
+        """Snapshots for matches sorted by date (optionally for one team only)"""
+        windows: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+        snapshots: Dict[Tuple[str, str, date], TeamFormSnapshot] = {}
+        for match in matches:
+            if not _is_scored(match):
+                continue
+            for match_team_id, venue in _team_venues(match):
+                if team_id is not None and match_team_id != team_id:
+                    continue
+                key = (str(match_team_id), venue)
+                recent = [match_entry(match, match_team_id)] + windows.get(key, [])[:FORM_WINDOW - 1]
+                windows[key] = recent
+                # A second match on the same date replaces the first snapshot
+                snapshots[key + (match.match_date,)] = _build_snapshot(
+                    match_team_id, season, venue, match.match_date, recent
+                )
+        return list(snapshots.values())
+    
+    def rebuild_team(self, session: Session, team_id: Any, season: str) -> int:
+        """Recompute one team's snapshots for a season (caller commits)"""
+        team_uuid = self._to_uuid(team_id)
+        session.exec(
+            delete(TeamFormSnapshot).where(
+                and_(TeamFormSnapshot.team_id == team_uuid, TeamFormSnapshot.season == season)
+            )
+        )
+        matches = session.exec(
+            select(Match).where(
+                and_(
+                    Match.season == season,
+                    Match.status == "finished",
+                    or_(Match.home_team_id == team_uuid, Match.away_team_id == team_uuid),
+                )
+            ).order_by(Match.match_date.asc())
+        ).all()
+        snapshots = self._replay(matches, season, team_uuid)
+        session.add_all(snapshots)
+        return len(snapshots)
+    
+    def rebuild_season(self, session: Session, season: str) -> int:
+        """Recompute every snapshot of a season from the matches table (commits)"""
+        session.exec(delete(TeamFormSnapshot).where(TeamFormSnapshot.season == season))
+        matches = session.exec(
+            select(Match).where(
+                and_(Match.season == season, Match.status == "finished")
+            ).order_by(Match.match_date.asc())
+        ).all()
+        snapshots = self._replay(matches, season)
+        session.add_all(snapshots)
+        session.commit()
+        print(f"[TeamForm] Rebuilt {len(snapshots)} snapshots for {season}")
+        return len(snapshots)
+
+
+# Singleton instance
+team_form_service = TeamFormService()
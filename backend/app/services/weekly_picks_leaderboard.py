@@ -0,0 +1,260 @@
+"""
+Weekly Picks Leaderboard
+Materialized, rank-indexed leaderboards for every gameweek.
+
+The scoring job rebuilds a gameweek's leaderboard after its points change:
+ranks (overall, and per league partitioned by league) are computed by the
+database with ROW_NUMBER() and written with INSERT ... SELECT, together with
+each user's previous-gameweek rank, movement and cumulative season points.
+Reads are then range scans on (gameweek, league_id, rank): a page is
+"rank > cursor LIMIT n" and "around me" is "rank BETWEEN r - k AND r + k",
+whatever the size of the league.
+
+Ties are broken by season points, then user id, so ranks are unique and
+stable between pages. Only the scoring job and admin edits build; until a
+gameweek has been built, reads run the same ranking query without storing it.
+"""
+from typing import Dict, List, Optional, Any
+
+from sqlalchemy import insert, delete, update, literal, case
+from sqlalchemy.orm import aliased
+from sqlmodel import Session, select, func, and_
+
+from app.models.user import User
+from app.models.weekly_picks import WeeklyPick, WeeklyPicksLeagueMember, WeeklyPicksLeaderboardEntry
+
+# League id of the overall leaderboard
+OVERALL = 0
+# Default and maximum page sizes
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+Entry = WeeklyPicksLeaderboardEntry
+
+
+class WeeklyPicksLeaderboardService:
+    """Builds and reads weekly_picks_leaderboard"""
+    
+    def _season_points(self, gameweek: int):
+        """Per-user points over gameweeks up to and including this one"""
+        return (
+            select(
+                WeeklyPick.user_id.label("user_id"),
+                func.sum(WeeklyPick.total_points).label("season_points"),
+            )
+            .where(WeeklyPick.gameweek <= gameweek)
+            .group_by(WeeklyPick.user_id)
+            .subquery()
+        )
+    
+    def _ranked(self, gameweek: int, by_league: bool):
+        """SELECT of one gameweek's entry rows, overall or partitioned by league"""
+        season = self._season_points(gameweek)
+        order_by = (
+            WeeklyPick.total_points.desc(),
+            season.c.season_points.desc(),
+            WeeklyPick.user_id.asc(),
+        )
+        if by_league:
+            league_id = WeeklyPicksLeagueMember.league_id
+            rank = func.row_number().over(partition_by=league_id, order_by=order_by)
+        else:
+            league_id = literal(OVERALL)
+            rank = func.row_number().over(order_by=order_by)
+        
+        ranked = (
+            select(
+                league_id.label("league_id"),
+                WeeklyPick.user_id.label("user_id"),
+                WeeklyPick.id.label("weekly_pick_id"),
+                WeeklyPick.total_points.label("points"),
+                season.c.season_points.label("season_points"),
+                rank.label("rank"),
+            )
+            .join(season, season.c.user_id == WeeklyPick.user_id)
+            .where(WeeklyPick.gameweek == gameweek)
+        )
+        if by_league:
+            ranked = ranked.join(
+                WeeklyPicksLeagueMember, WeeklyPicksLeagueMember.user_id == WeeklyPick.user_id
+            )
+        ranked = ranked.subquery()
+        
+        previous = aliased(Entry)
+        return select(
+            literal(gameweek).label("gameweek"),
+            ranked.c.league_id,
+            ranked.c.user_id,
+            ranked.c.weekly_pick_id,
+            ranked.c.points,
+            ranked.c.season_points,
+            ranked.c.rank,
+            previous.rank.label("previous_rank"),
+            (previous.rank - ranked.c.rank).label("movement"),
+        ).outerjoin(
+            previous,
+            and_(
+                previous.gameweek == gameweek - 1,
+                previous.league_id == ranked.c.league_id,
+                previous.user_id == ranked.c.user_id,
+            ),
+        )
+    
+    def _insert_ranked(self, session: Session, gameweek: int, by_league: bool):
+        """INSERT ... SELECT one gameweek's ranks, overall or partitioned by league"""
+        session.execute(
+            insert(Entry).from_select(
+                [
+                    "gameweek", "league_id", "user_id", "weekly_pick_id", "points",
+                    "season_points", "rank", "previous_rank", "movement",
+                ],
+                self._ranked(gameweek, by_league),
+            )
+        )
+    
+    def _build_gameweek(self, session: Session, gameweek: int):
+        session.execute(delete(Entry).where(Entry.gameweek == gameweek))
+        self._insert_ranked(session, gameweek, by_league=False)
+        self._insert_ranked(session, gameweek, by_league=True)
+        
+        # Keep WeeklyPick.rank in step with the overall leaderboard
+        session.execute(
+            update(WeeklyPick)
+            .where(WeeklyPick.gameweek == gameweek)
+            .values(
+                rank=select(Entry.rank)
+                .where(
+                    and_(
+                        Entry.weekly_pick_id == WeeklyPick.id,
+                        Entry.league_id == OVERALL,
+                    )
+                )
+                .scalar_subquery()
+            )
+        )
+    
+    def rebuild(self, session: Session, gameweek: int) -> List[int]:
+        """
+        Rebuild a gameweek's leaderboards, and every later gameweek already
+        materialized (their season points and movement depend on it). Commits.
+        """
+        later = session.exec(
+            select(Entry.gameweek).where(Entry.gameweek > gameweek).distinct()
+        ).all()
+        gameweeks = [gameweek] + sorted(later)
+        for gw in gameweeks:
+            self._build_gameweek(session, gw)
+        session.commit()
+        print(f"[Weekly Picks] Rebuilt leaderboard for GW{', GW'.join(map(str, gameweeks))}")
+        return gameweeks
+    
+    def remove_pick(self, session: Session, weekly_pick_id: int):
+        """Drop a deleted pick's entries before the pick itself (caller commits, then rebuilds)"""
+        session.execute(delete(Entry).where(Entry.weekly_pick_id == weekly_pick_id))
+    
+    def is_stale(self, session: Session, gameweek: int) -> bool:
+        """True when the overall leaderboard is missing picks or holds outdated points"""
+        picks = session.exec(
+            select(func.count(WeeklyPick.id)).where(WeeklyPick.gameweek == gameweek)
+        ).one()
+        entries, outdated = session.exec(
+            select(
+                func.count(Entry.id),
+                func.sum(case((WeeklyPick.total_points != Entry.points, 1), else_=0)),
+            )
+            .select_from(Entry)
+            .outerjoin(WeeklyPick, WeeklyPick.id == Entry.weekly_pick_id)
+            .where(and_(Entry.gameweek == gameweek, Entry.league_id == OVERALL))
+        ).one()
+        return picks != entries or bool(outdated)
+    
+    def _entries(self, session: Session, gameweek: int, league_id: int):
+        """
+        A gameweek's entries for one leaderboard: the materialized rows, or
+        the ranking computed on the fly if the gameweek hasn't been built yet
+        """
+        built = session.exec(
+            select(Entry.id).where(and_(Entry.gameweek == gameweek, Entry.league_id == OVERALL)).limit(1)
+        ).first()
+        if built is not None:
+            return Entry.__table__
+        return self._ranked(gameweek, by_league=league_id != OVERALL).subquery()
+    
+    def _serialize(self, rows) -> List[Dict[str, Any]]:
+        return [
+            {
+                "userId": row.user_id,
+                "userName": row.username,
+                "rank": row.rank,
+                "points": row.points,
+                "seasonPoints": row.season_points,
+                "previousRank": row.previous_rank,
+                "movement": row.movement,
+            }
+            for row in rows
+        ]
+    
+    def _range(self, entries, gameweek: int, league_id: int):
+        return (
+            select(
+                entries.c.user_id,
+                User.username,
+                entries.c.rank,
+                entries.c.points,
+                entries.c.season_points,
+                entries.c.previous_rank,
+                entries.c.movement,
+            )
+            .join(User, User.id == entries.c.user_id)
+            .where(and_(entries.c.gameweek == gameweek, entries.c.league_id == league_id))
+        )
+    
+    def get_page(
+        self,
+        session: Session,
+        gameweek: int,
+        league_id: int = OVERALL,
+        after_rank: int = 0,
+        limit: int = DEFAULT_PAGE_SIZE,
+    ) -> List[Dict[str, Any]]:
+        """Entries ranked after the cursor, in rank order (keyset pagination)"""
+        entries = self._entries(session, gameweek, league_id)
+        rows = session.exec(
+            self._range(entries, gameweek, league_id)
+            .where(entries.c.rank > after_rank)
+            .order_by(entries.c.rank.asc())
+            .limit(min(limit, MAX_PAGE_SIZE))
+        ).all()
+        return self._serialize(rows)
+    
+    def get_around(
+        self,
+        session: Session,
+        gameweek: int,
+        user_id: int,
+        league_id: int = OVERALL,
+        radius: int = 5,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """The user's entry with up to `radius` entries either side (None if not ranked)"""
+        entries = self._entries(session, gameweek, league_id)
+        rank = session.exec(
+            select(entries.c.rank).where(
+                and_(
+                    entries.c.gameweek == gameweek,
+                    entries.c.league_id == league_id,
+                    entries.c.user_id == user_id,
+                )
+            )
+        ).first()
+        if rank is None:
+            return None
+        rows = session.exec(
+            self._range(entries, gameweek, league_id)
+            .where(entries.c.rank.between(max(1, rank - radius), rank + radius))
+            .order_by(entries.c.rank.asc())
+        ).all()
+        return self._serialize(rows)
+
+
+# Singleton instance
+weekly_picks_leaderboard_service = WeeklyPicksLeaderboardService()
@@ -0,0 +1,104 @@
+"""
+Weekly Picks Repository
+Set-based reads of a user's weekly picks.
+
+A user's picks are loaded with their score predictions and player picks
+through selectinload on the model relationships: three queries for a whole
+season, whatever the number of gameweeks. Season statistics are SQL
+aggregates over the child tables rather than per-pick queries.
+"""
+from typing import Dict, List, Optional, Any
+
+from sqlalchemy import case
+from sqlalchemy.orm import selectinload
+from sqlmodel import Session, select, func, and_
+
+from app.models.weekly_picks import WeeklyPick, ScorePrediction, PlayerPick
+
+
+class WeeklyPicksRepository:
+    """Reads weekly picks with their children in a fixed number of queries"""
+    
+    def _with_children(self, query):
+        return query.options(
+            selectinload(WeeklyPick.score_predictions),
+            selectinload(WeeklyPick.player_picks),
+        )
+    
+    def get_user_picks(self, session: Session, user_id: int) -> List[WeeklyPick]:
+        """All of a user's picks, newest gameweek first, children loaded (three queries)"""
+        return session.exec(
+            self._with_children(
+                select(WeeklyPick)
+                .where(WeeklyPick.user_id == user_id)
+                .order_by(WeeklyPick.gameweek.desc())
+            )
+        ).all()
+    
+    def get_user_pick(self, session: Session, user_id: int, gameweek: int) -> Optional[WeeklyPick]:
+        """A user's pick for one gameweek with its children loaded"""
+        return session.exec(
+            self._with_children(
+                select(WeeklyPick).where(
+                    and_(WeeklyPick.user_id == user_id, WeeklyPick.gameweek == gameweek)
+                )
+            )
+        ).first()
+    
+    def get_user_statistics(self, session: Session, user_id: int) -> Dict[str, Any]:
+        """
+        Per-gameweek points/rank plus score prediction and player pick aggregates.
+        An exact score is a scored prediction equal to the result.
+        """
+        gameweeks = session.exec(
+            select(WeeklyPick.gameweek, WeeklyPick.total_points, WeeklyPick.rank)
+            .where(WeeklyPick.user_id == user_id)
+            .order_by(WeeklyPick.gameweek.asc())
+        ).all()
+        
+        predictions, exact_scores, prediction_points = session.exec(
+            select(
+                func.count(ScorePrediction.id),
+                func.sum(case(
+                    (
+                        and_(
+                            ScorePrediction.actual_home_score.is_not(None),
+                            ScorePrediction.predicted_home_score == ScorePrediction.actual_home_score,
+                            ScorePrediction.predicted_away_score == ScorePrediction.actual_away_score,
+                        ),
+                        1,
+                    ),
+                    else_=0,
+                )),
+                func.sum(ScorePrediction.points),
+            )
+            .join(WeeklyPick, WeeklyPick.id == ScorePrediction.weekly_pick_id)
+            .where(WeeklyPick.user_id == user_id)
+        ).one()
+        
+        player_picks, successful_picks, fpl_points = session.exec(
+            select(
+                func.count(PlayerPick.id),
+                func.sum(case((PlayerPick.fpl_points > 0, 1), else_=0)),
+                func.sum(func.coalesce(PlayerPick.fpl_points, 0)),
+            )
+            .join(WeeklyPick, WeeklyPick.id == PlayerPick.weekly_pick_id)
+            .where(WeeklyPick.user_id == user_id)
+        ).one()
+        
+        return {
+            "gameweeks": [
+                {"gameweek": gw, "points": points, "rank": rank}
+                for gw, points, rank in gameweeks
+            ],
+            "score_predictions": predictions,
+            "exact_scores": exact_scores or 0,
+            "score_prediction_points": prediction_points or 0,
+            "player_picks": player_picks,
+            "successful_player_picks": successful_picks or 0,
+            "fpl_points": fpl_points or 0,
+        }
+
+
+# Singleton instance
+weekly_picks_repository = WeeklyPicksRepository()
@@ -0,0 +1,275 @@
+"""
+Weekly Picks Scoring
+Scores every weekly pick of a gameweek in one pass.
+
+Fixtures and live elements are fetched once per run. Score predictions are
+scored once per distinct (predicted, actual) scoreline and player picks once
+per distinct player, then mapped back onto every row with NumPy. Only rows
+whose values changed are written, with bulk UPDATEs in a single transaction,
+so re-running while a gameweek is live is idempotent and incremental.
+
+Changes in pick totals are applied to the season standings as deltas in
+the same transaction. Whole-gameweek runs also rebuild the gameweek's
+materialized leaderboard and rerank the standings when any total changed
+or the leaderboard is out of date.
+"""
+from datetime import datetime, timezone
+from typing import Dict, Optional, Any, Iterable
+
+import numpy as np
+from sqlalchemy import update
+from sqlmodel import Session, select
+
+from app.models.weekly_picks import WeeklyPick, ScorePrediction, PlayerPick
+from app.services.fpl_service import fpl_service
+from app.services.weekly_picks_leaderboard import weekly_picks_leaderboard_service
+from app.services.weekly_picks_standings import weekly_picks_standings_service
+
+
+def calculate_score_prediction_points(
+    predicted_home: int,
+    predicted_away: int,
+    actual_home: int,
+    actual_away: int,
+) -> dict:
+    """
+    Calculate points for a score prediction:
+    - Exact score: 4 points
+    - Correct result (win/draw): 2 points
+    - Correct home goals: 1 point
+    - Correct away goals: 1 point
+    Maximum: 4 points (exact score includes all bonuses)
+    """
+    points = 0
+    breakdown = {
+        "home_goals": 0,
+        "away_goals": 0,
+        "result": 0,
+        "exact_score": 0,
+    }
+    
+    # Exact score
+    if predicted_home == actual_home and predicted_away == actual_away:
+        points = 4
+        breakdown["exact_score"] = 4
+        breakdown["home_goals"] = 1
+        breakdown["away_goals"] = 1
+        breakdown["result"] = 2
+    else:
+        # Correct result (win/draw)
+        predicted_result = "home" if predicted_home > predicted_away else ("away" if predicted_away > predicted_home else "draw")
+        actual_result = "home" if actual_home > actual_away else ("away" if actual_away > actual_home else "draw")
+        
+        if predicted_result == actual_result:
+            points += 2
+            breakdown["result"] = 2
+        
+        # Correct home goals
+        if predicted_home == actual_home:
+            points += 1
+            breakdown["home_goals"] = 1
+        
+        # Correct away goals
+        if predicted_away == actual_away:
+            points += 1
+            breakdown["away_goals"] = 1
+    
+    return {"points": points, "breakdown": breakdown}
+
+
+def calculate_player_pick_points(fpl_points: Optional[int]) -> int:
+    """
+    Calculate points for a player pick:
+    - Points = FPL points scored (1:1 ratio)
+    - Minimum: 0 points
+    """
+    return max(0, fpl_points or 0)
+
+
+class WeeklyPicksScoringService:
+    """Bulk scoring engine for weekly picks"""
+    
+    async def fetch_results(self, gameweek: int) -> Dict[str, Dict[int, Any]]:
+        """Finished/live fixture scores and live player points for a gameweek (one fetch each)"""
+        fixtures_data = await fpl_service.get_gameweek_fixtures(gameweek)
+        fixture_scores = {
+            f["id"]: (f.get("team_h_score"), f.get("team_a_score"))
+            for f in fixtures_data
+            if f.get("team_h_score") is not None and f.get("team_a_score") is not None
+        }
+        
+        try:
+            live_data = await fpl_service.get_live_gameweek(gameweek)
+            live_points = {
+                e["id"]: e.get("stats", {}).get("total_points", 0)
+                for e in live_data.get("elements", [])
+            }
+        except Exception as e:
+            print(f"[Weekly Picks] Live data unavailable for GW{gameweek}: {e}")
+            live_points = {}
+        
+        return {"fixture_scores": fixture_scores, "live_points": live_points}
+    
+    async def score_gameweek(
+        self,
+        session: Session,
+        gameweek: int,
+        weekly_pick_ids: Optional[Iterable[int]] = None,
+    ) -> Dict[str, int]:
+        """Fetch results and score every pick of the gameweek (or only the given picks)"""
+        results = await self.fetch_results(gameweek)
+        return self.apply_results(
+            session,
+            gameweek,
+            results["fixture_scores"],
+            results["live_points"],
+            weekly_pick_ids=weekly_pick_ids,
+        )
+    
+    def apply_results(
+        self,
+        session: Session,
+        gameweek: int,
+        fixture_scores: Dict[int, Any],
+        live_points: Dict[int, int],
+        weekly_pick_ids: Optional[Iterable[int]] = None,
+    ) -> Dict[str, int]:
+        """
+        Score picks against known results and write changes in one transaction.
+        fixture_scores maps fixture id -> (home, away); live_points maps player id -> FPL points.
+        """
+        now = datetime.now(timezone.utc)
+        
+        pick_query = select(WeeklyPick.id, WeeklyPick.total_points, WeeklyPick.user_id).where(WeeklyPick.gameweek == gameweek)
+        if weekly_pick_ids is not None:
+            pick_query = pick_query.where(WeeklyPick.id.in_(list(weekly_pick_ids)))
+        pick_rows = session.exec(pick_query).all()
+        picks = {row.id: row.total_points for row in pick_rows}
+        pick_users = {row.id: row.user_id for row in pick_rows}
+        if not picks:
+            return {"picks": 0, "score_predictions": 0, "player_picks": 0, "totals": 0}
+        pick_ids = list(picks)
+        
+        def for_picks(query, weekly_pick_id):
+            # Whole gameweek: join instead of a potentially huge IN list
+            if weekly_pick_ids is None:
+                return query.join(WeeklyPick, WeeklyPick.id == weekly_pick_id).where(WeeklyPick.gameweek == gameweek)
+            return query.where(weekly_pick_id.in_(pick_ids))
+        
+        score_predictions = session.exec(for_picks(
+            select(
+                ScorePrediction.id,
+                ScorePrediction.weekly_pick_id,
+                ScorePrediction.fixture_id,
+                ScorePrediction.predicted_home_score,
+                ScorePrediction.predicted_away_score,
+                ScorePrediction.actual_home_score,
+                ScorePrediction.actual_away_score,
+                ScorePrediction.points,
+                ScorePrediction.breakdown,
+            ),
+            ScorePrediction.weekly_pick_id,
+        )).all()
+        player_picks = session.exec(for_picks(
+            select(
+                PlayerPick.id,
+                PlayerPick.weekly_pick_id,
+                PlayerPick.player_id,
+                PlayerPick.fpl_points,
+                PlayerPick.points,
+            ),
+            PlayerPick.weekly_pick_id,
+        )).all()
+        
+        totals: Dict[int, int] = {pick_id: 0 for pick_id in pick_ids}
+        
+        # Score predictions: score each distinct (predicted, actual) scoreline once
+        sp_updates = []
+        scored = [row for row in score_predictions if row.fixture_id in fixture_scores]
+        if scored:
+            scorelines = np.array([
+                (row.predicted_home_score, row.predicted_away_score, *fixture_scores[row.fixture_id])
+                for row in scored
+            ], dtype=np.int64)
+            unique, inverse = np.unique(scorelines, axis=0, return_inverse=True)
+            outcomes = [calculate_score_prediction_points(*map(int, line)) for line in unique]
+            for row, outcome_idx in zip(scored, inverse.ravel()):
+                outcome = outcomes[outcome_idx]
+                actual_home, actual_away = fixture_scores[row.fixture_id]
+                if (
+                    row.points != outcome["points"]
+                    or row.breakdown != outcome["breakdown"]
+                    or row.actual_home_score != actual_home
+                    or row.actual_away_score != actual_away
+                ):
+                    sp_updates.append({
+                        "id": row.id,
+                        "actual_home_score": actual_home,
+                        "actual_away_score": actual_away,
+                        "points": outcome["points"],
+                        "breakdown": outcome["breakdown"],
+                        "updated_at": now,
+                    })
+        scored_ids = {update_row["id"]: update_row["points"] for update_row in sp_updates}
+        for row in score_predictions:
+            totals[row.weekly_pick_id] += scored_ids.get(row.id, row.points)
+        
+        # Player picks: score each distinct player once
+        pp_updates = []
+        live = [row for row in player_picks if row.player_id in live_points]
+        if live:
+            player_ids = np.array([row.player_id for row in live], dtype=np.int64)
+            unique_players, inverse = np.unique(player_ids, return_inverse=True)
+            fpl_points = [live_points[int(player_id)] for player_id in unique_players]
+            pick_points = [calculate_player_pick_points(p) for p in fpl_points]
+            for row, player_idx in zip(live, inverse.ravel()):
+                if row.fpl_points != fpl_points[player_idx] or row.points != pick_points[player_idx]:
+                    pp_updates.append({
+                        "id": row.id,
+                        "fpl_points": fpl_points[player_idx],
+                        "points": pick_points[player_idx],
+                        "updated_at": now,
+                    })
+        picked_ids = {update_row["id"]: update_row["points"] for update_row in pp_updates}
+        for row in player_picks:
+            totals[row.weekly_pick_id] += picked_ids.get(row.id, row.points)
+        
+        total_updates = [
+            {"id": pick_id, "total_points": total, "updated_at": now}
+            for pick_id, total in totals.items()
+            if picks[pick_id] != total
+        ]
+        
+        # Bulk UPDATE by primary key, all in one transaction
+        if sp_updates:
+            session.execute(update(ScorePrediction), sp_updates)
+        if pp_updates:
+            session.execute(update(PlayerPick), pp_updates)
+        if total_updates:
+            session.execute(update(WeeklyPick), total_updates)
+            deltas = {
+                pick_users[row["id"]]: row["total_points"] - picks[row["id"]]
+                for row in total_updates
+            }
+            weekly_picks_standings_service.apply_deltas(session, deltas)
+            # Full runs rerank everything below; a partial run reranks the leagues it touched
+            if weekly_pick_ids is not None:
+                weekly_picks_standings_service.rerank_users(session, deltas)
+        session.commit()
+        
+        summary = {
+            "picks": len(pick_ids),
+            "score_predictions": len(sp_updates),
+            "player_picks": len(pp_updates),
+            "totals": len(total_updates),
+        }
+        if weekly_pick_ids is None:
+            if total_updates or weekly_picks_leaderboard_service.is_stale(session, gameweek):
+                summary["leaderboard"] = len(weekly_picks_leaderboard_service.rebuild(session, gameweek))
+                summary["standings"] = weekly_picks_standings_service.refresh(session)
+            print(f"[Weekly Picks] Scored GW{gameweek}: {summary}")
+        return summary
+
+
+# Singleton instance
+weekly_picks_scoring_service = WeeklyPicksScoringService()
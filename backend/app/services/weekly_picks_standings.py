@@ -0,0 +1,207 @@
+"""
+Weekly Picks Standings
+Season-long cumulative standings, overall and per league.
+
+Each user has one row per leaderboard they appear on (league 0 = overall)
+holding their running season total. Totals are never re-summed from
+weekly_picks on the scoring path: the scoring engine passes the change in
+each user's gameweek total and apply_deltas adds it to every row of that
+user. Ranks are then recomputed for all leagues in one UPDATE from a
+ROW_NUMBER() window, writing only rows whose rank moved, so reading a
+league's standings is a range scan on (league_id, rank).
+
+Rows are created on demand from the user's summed picks (new players,
+league joins), which also makes a full rebuild a single INSERT ... SELECT.
+Weekly picks carry no season, so the standings cover every gameweek stored.
+"""
+from typing import Dict, List, Optional, Any, Iterable
+
+from sqlalchemy import insert, delete, update, bindparam, literal, exists
+from sqlmodel import Session, select, func, and_
+
+from app.models.user import User
+from app.models.weekly_picks import WeeklyPick, WeeklyPicksLeagueMember, WeeklyPicksStanding
+
+# League id of the overall standings
+OVERALL = 0
+
+Standing = WeeklyPicksStanding
+standings_table = WeeklyPicksStanding.__table__
+
+
+class WeeklyPicksStandingsService:
+    """Maintains and reads weekly_picks_standings"""
+    
+    def apply_deltas(self, session: Session, deltas: Dict[int, int]):
+        """
+        Add each user's change in points to all of their standings rows (caller commits).
+        Users without rows yet get them created from their summed picks.
+        """
+        rows = [{"target_user_id": user_id, "delta": delta} for user_id, delta in deltas.items() if delta]
+        if not rows:
+            return
+        session.execute(
+            update(standings_table)
+            .where(standings_table.c.user_id == bindparam("target_user_id"))
+            .values(total_points=standings_table.c.total_points + bindparam("delta")),
+            rows,
+        )
+        self.insert_missing(session, user_ids=list(deltas))
+    
+    def insert_missing(
+        self,
+        session: Session,
+        user_ids: Optional[Iterable[int]] = None,
+        league_id: Optional[int] = None,
+    ):
+        """
+        Create missing rows: overall for users with picks, per league for members
+        (optionally only for some users or one league). Caller commits.
+        """
+        user_ids = list(user_ids) if user_ids is not None else None
+        
+        totals = select(
+            WeeklyPick.user_id.label("user_id"),
+            func.sum(WeeklyPick.total_points).label("total_points"),
+        )
+        if user_ids is not None:
+            totals = totals.where(WeeklyPick.user_id.in_(user_ids))
+        totals = totals.group_by(WeeklyPick.user_id).subquery()
+        
+        columns = ["league_id", "user_id", "total_points"]
+        
+        if league_id is None or league_id == OVERALL:
+            session.execute(insert(Standing).from_select(
+                columns,
+                select(literal(OVERALL), totals.c.user_id, totals.c.total_points).where(
+                    ~exists().where(
+                        and_(Standing.league_id == OVERALL, Standing.user_id == totals.c.user_id)
+                    )
+                ),
+            ))
+        
+        if league_id != OVERALL:
+            members = (
+                select(
+                    WeeklyPicksLeagueMember.league_id,
+                    WeeklyPicksLeagueMember.user_id,
+                    func.coalesce(totals.c.total_points, 0),
+                )
+                .outerjoin(totals, totals.c.user_id == WeeklyPicksLeagueMember.user_id)
+                .where(
+                    ~exists().where(
+                        and_(
+                            Standing.league_id == WeeklyPicksLeagueMember.league_id,
+                            Standing.user_id == WeeklyPicksLeagueMember.user_id,
+                        )
+                    )
+                )
+            )
+            if user_ids is not None:
+                members = members.where(WeeklyPicksLeagueMember.user_id.in_(user_ids))
+            if league_id is not None:
+                members = members.where(WeeklyPicksLeagueMember.league_id == league_id)
+            session.execute(insert(Standing).from_select(columns, members))
+    
+    def rerank(self, session: Session, league_id: Optional[int] = None) -> int:
+        """Recompute ranks in one window-function pass (all leagues or one). Caller commits."""
+        ranked = select(
+            Standing.id.label("id"),
+            func.row_number().over(
+                partition_by=Standing.league_id,
+                order_by=(Standing.total_points.desc(), Standing.user_id.asc()),
+            ).label("rank"),
+        )
+        if league_id is not None:
+            ranked = ranked.where(Standing.league_id == league_id)
+        ranked = ranked.subquery()
+        
+        result = session.execute(
+            update(standings_table)
+            .where(
+                and_(
+                    standings_table.c.id == ranked.c.id,
+                    standings_table.c.rank.is_distinct_from(ranked.c.rank),
+                )
+            )
+            .values(rank=ranked.c.rank)
+        )
+        return result.rowcount
+    
+    def rerank_users(self, session: Session, user_ids: Iterable[int]) -> int:
+        """Rerank only the leagues the users have rows in (caller commits)"""
+        league_ids = session.exec(
+            select(Standing.league_id).where(Standing.user_id.in_(list(user_ids))).distinct()
+        ).all()
+        return sum(self.rerank(session, league_id) for league_id in league_ids)
+    
+    def refresh(self, session: Session) -> int:
+        """Add rows for new players and members, then rerank everything (commits)"""
+        self.insert_missing(session)
+        moved = self.rerank(session)
+        session.commit()
+        print(f"[Weekly Picks] Standings reranked: {moved} row(s) moved")
+        return moved
+    
+    def rebuild(self, session: Session) -> int:
+        """Recreate the standings from weekly_picks (commits)"""
+        session.execute(delete(Standing))
+        self.insert_missing(session)
+        self.rerank(session)
+        session.commit()
+        count = session.exec(select(func.count(Standing.id))).one()
+        print(f"[Weekly Picks] Rebuilt standings: {count} row(s)")
+        return count
+    
+    def add_member(self, session: Session, league_id: int, user_id: int):
+        """Give a new league member a standings row and rerank the league (caller commits)"""
+        self.insert_missing(session, user_ids=[user_id], league_id=league_id)
+        self.rerank(session, league_id)
+    
+    def remove_member(self, session: Session, league_id: int, user_id: int):
+        """Drop a member's row and rerank the league (caller commits)"""
+        session.execute(
+            delete(Standing).where(and_(Standing.league_id == league_id, Standing.user_id == user_id))
+        )
+        self.rerank(session, league_id)
+    
+    def remove_league(self, session: Session, league_id: int):
+        """Drop a league's standings (caller commits)"""
+        session.execute(delete(Standing).where(Standing.league_id == league_id))
+    
+    def get_page(
+        self,
+        session: Session,
+        league_id: int = OVERALL,
+        after_rank: int = 0,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Standings ranked after the cursor, in rank order (keyset pagination)"""
+        rows = session.exec(
+            select(Standing, User.username)
+            .join(User, User.id == Standing.user_id)
+            .where(and_(Standing.league_id == league_id, Standing.rank > after_rank))
+            .order_by(Standing.rank.asc())
+            .limit(limit)
+        ).all()
+        return [
+            {
+                "userId": standing.user_id,
+                "userName": username,
+                "rank": standing.rank,
+                "points": standing.total_points,
+            }
+            for standing, username in rows
+        ]
+    
+    def get_user_ranks(self, session: Session, user_id: int, league_ids: Iterable[int]) -> Dict[int, Optional[int]]:
+        """A user's rank in each of the given leagues (one query)"""
+        return dict(session.exec(
+            select(Standing.league_id, Standing.rank).where(
+                and_(Standing.user_id == user_id, Standing.league_id.in_(list(league_ids)))
+            )
+        ).all())
+
+
+# Singleton instance
+weekly_picks_standings_service = WeeklyPicksStandingsService()
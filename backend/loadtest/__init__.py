@@ -0,0 +1,5 @@
+"""
+Deadline-rush load testing
+A local stand-in for the FPL API (fake_fpl) and scripted user journeys
+driven by an async client (run). See loadtest/README.md.
+"""
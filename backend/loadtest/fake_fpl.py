@@ -0,0 +1,240 @@
+"""
+Fake FPL API
+Serves the FPL endpoints FPLService calls from recorded (or synthetic)
+payloads, with configurable latency, and counts every request so a load
+test can report how many upstream calls the backend made.
+
+Point the backend at it with FPL_BASE_URL=http://127.0.0.1:8765/api.
+
+Usage:
+    python -m loadtest.fake_fpl --port 8765 --latency-ms 150 --jitter-ms 50
+    python -m loadtest.fake_fpl --payloads loadtest/payloads
+    python -m loadtest.fake_fpl --record loadtest/payloads   # snapshot the real API
+"""
+import argparse
+import asyncio
+import json
+import random
+import threading
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+from fastapi import FastAPI, HTTPException
+
+REAL_FPL_URL = "https://fantasy.premierleague.com/api"
+TEAMS = 20
+PLAYERS_PER_TEAM = 25
+GAMEWEEKS = 38
+
+
+def _iso(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def build_synthetic_payloads(current_gameweek: int = 10, deadline_in: timedelta = timedelta(minutes=30)) -> Dict[str, Any]:
+    """
+    A self-consistent season: 20 teams, 500 players, 380 fixtures. The next
+    gameweek's first kickoff is `deadline_in` from now, so submissions for it
+    are accepted for the length of a deadline-rush run.
+    """
+    rng = random.Random(0)
+    now = datetime.now(timezone.utc)
+    next_kickoff = now + deadline_in
+    
+    def gameweek_start(gw: int) -> datetime:
+        return next_kickoff + timedelta(days=7 * (gw - current_gameweek - 1))
+    
+    events = [
+        {
+            "id": gw,
+            "name": f"Gameweek {gw}",
+            "deadline_time": _iso(gameweek_start(gw) - timedelta(minutes=90)),
+            "is_previous": gw == current_gameweek - 1,
+            "is_current": gw == current_gameweek,
+            "is_next": gw == current_gameweek + 1,
+            "finished": gw < current_gameweek,
+            "data_checked": gw < current_gameweek,
+        }
+        for gw in range(1, GAMEWEEKS + 1)
+    ]
+    teams = [
+        {"id": t, "code": t, "name": f"Team {t}", "short_name": f"T{t:02d}", "strength": rng.randint(2, 5)}
+        for t in range(1, TEAMS + 1)
+    ]
+    elements = []
+    for t in range(1, TEAMS + 1):
+        for slot in range(PLAYERS_PER_TEAM):
+            player_id = len(elements) + 1
+            elements.append({
+                "id": player_id,
+                "code": 100000 + player_id,
+                "web_name": f"Player{player_id}",
+                "first_name": "Player",
+                "second_name": str(player_id),
+                "team": t,
+                "element_type": 1 if slot < 3 else 2 + (slot - 3) * 3 // (PLAYERS_PER_TEAM - 3),
+                "now_cost": rng.randint(40, 130),
+                "status": "a",
+                "chance_of_playing_next_round": None,
+                "total_points": rng.randint(0, 120),
+                "form": f"{rng.uniform(0, 8):.1f}",
+                "selected_by_percent": f"{rng.uniform(0, 60):.1f}",
+            })
+    
+    # Round-robin schedule: 10 fixtures per gameweek
+    fixtures = []
+    order = list(range(1, TEAMS + 1))
+    for gw in range(1, GAMEWEEKS + 1):
+        round_idx = (gw - 1) % (TEAMS - 1)
+        rotated = [order[0]] + order[1:][round_idx:] + order[1:][:round_idx]
+        for i in range(TEAMS // 2):
+            home, away = rotated[i], rotated[-(i + 1)]
+            if gw > TEAMS - 1:
+                home, away = away, home
+            finished = gw < current_gameweek
+            fixtures.append({
+                "id": len(fixtures) + 1,
+                "event": gw,
+                "team_h": home,
+                "team_a": away,
+                "kickoff_time": _iso(gameweek_start(gw) + timedelta(hours=2 * i)),
+                "started": finished,
+                "finished": finished,
+                "team_h_score": rng.randint(0, 4) if finished else None,
+                "team_a_score": rng.randint(0, 3) if finished else None,
+                "team_h_difficulty": rng.randint(2, 5),
+                "team_a_difficulty": rng.randint(2, 5),
+            })
+    
+    live = {
+        gw: {
+            "elements": [
+                {"id": p["id"], "stats": {"minutes": 90, "total_points": rng.randint(0, 12)}}
+                for p in elements
+            ]
+        }
+        for gw in range(1, current_gameweek + 1)
+    }
+    return {
+        "bootstrap-static": {"events": events, "teams": teams, "elements": elements, "element_types": []},
+        "fixtures": fixtures,
+        "live": live,
+    }
+
+
+def load_payloads(directory: Path) -> Dict[str, Any]:
+    """Payloads saved by --record: bootstrap-static.json, fixtures.json, live/<gw>.json"""
+    live = {
+        int(path.stem): json.loads(path.read_text())
+        for path in (directory / "live").glob("*.json")
+    }
+    return {
+        "bootstrap-static": json.loads((directory / "bootstrap-static.json").read_text()),
+        "fixtures": json.loads((directory / "fixtures.json").read_text()),
+        "live": live,
+    }
+
+
+def record_payloads(directory: Path, base_url: str = REAL_FPL_URL):
+    """Snapshot the real FPL API into a payload directory"""
+    import httpx
+    
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "live").mkdir(exist_ok=True)
+    with httpx.Client(timeout=30.0) as client:
+        bootstrap = client.get(f"{base_url}/bootstrap-static/").raise_for_status().json()
+        (directory / "bootstrap-static.json").write_text(json.dumps(bootstrap))
+        fixtures = client.get(f"{base_url}/fixtures/").raise_for_status().json()
+        (directory / "fixtures.json").write_text(json.dumps(fixtures))
+        current = next((e["id"] for e in bootstrap.get("events", []) if e.get("is_current")), None)
+        if current:
+            live = client.get(f"{base_url}/event/{current}/live/").raise_for_status().json()
+            (directory / "live" / f"{current}.json").write_text(json.dumps(live))
+    print(f"[Fake FPL] Recorded payloads to {directory}")
+
+
+def create_app(payloads: Dict[str, Any], latency_ms: float = 0, jitter_ms: float = 0) -> FastAPI:
+    """FastAPI app serving the payloads under /api, plus /__stats for request counts"""
+    app = FastAPI(title="Fake FPL API")
+    counts: Counter = Counter()
+    lock = threading.Lock()
+    fixtures_by_event: Dict[int, List[Dict[str, Any]]] = {}
+    for fixture in payloads["fixtures"]:
+        fixtures_by_event.setdefault(fixture.get("event"), []).append(fixture)
+    
+    async def respond(route: str, payload: Any) -> Any:
+        with lock:
+            counts[route] += 1
+        delay = latency_ms + random.uniform(-jitter_ms, jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000.0)
+        return payload
+    
+    @app.get("/api/bootstrap-static/")
+    async def bootstrap_static():
+        return await respond("bootstrap-static", payloads["bootstrap-static"])
+    
+    @app.get("/api/fixtures/")
+    async def fixtures(event: Optional[int] = None):
+        if event is None:
+            return await respond("fixtures", payloads["fixtures"])
+        return await respond("fixtures?event", fixtures_by_event.get(event, []))
+    
+    @app.get("/api/event/{gameweek}/live/")
+    async def live(gameweek: int):
+        return await respond("event/live", payloads["live"].get(gameweek, {"elements": []}))
+    
+    @app.get("/api/element-summary/{player_id}/")
+    async def element_summary(player_id: int):
+        return await respond("element-summary", {"fixtures": [], "history": [], "history_past": []})
+    
+    @app.get("/api/{path:path}")
+    async def unknown(path: str):
+        with lock:
+            counts[f"unknown:{path}"] += 1
+        raise HTTPException(status_code=404, detail=f"Not recorded: {path}")
+    
+    @app.get("/__stats")
+    async def stats():
+        with lock:
+            return {"requests": dict(counts), "total": sum(counts.values())}
+    
+    @app.post("/__stats/reset")
+    async def reset_stats():
+        with lock:
+            counts.clear()
+        return {"reset": True}
+    
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stand-in for the FPL API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=100, help="Added latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=25, help="Uniform +/- jitter on the latency")
+    parser.add_argument("--payloads", type=Path, help="Directory of recorded payloads (default: synthetic season)")
+    parser.add_argument("--current-gameweek", type=int, default=10, help="Synthetic payloads: current gameweek")
+    parser.add_argument("--deadline-minutes", type=float, default=30, help="Synthetic payloads: minutes to the next deadline")
+    parser.add_argument("--record", type=Path, help="Record the real FPL API into this directory and exit")
+    args = parser.parse_args()
+    
+    if args.record:
+        record_payloads(args.record)
+        return
+    
+    if args.payloads:
+        payloads = load_payloads(args.payloads)
+    else:
+        payloads = build_synthetic_payloads(args.current_gameweek, timedelta(minutes=args.deadline_minutes))
+    
+    import uvicorn
+    print(f"[Fake FPL] Serving on http://{args.host}:{args.port}/api (latency {args.latency_ms}±{args.jitter_ms} ms)")
+    uvicorn.run(create_app(payloads, args.latency_ms, args.jitter_ms), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""
+Deadline-rush load test
+Drives scripted user journeys against a running backend whose FPL_BASE_URL
+points at loadtest.fake_fpl, then reports latency percentiles per route and
+the number of upstream FPL calls the backend made.
+
+Journey per user: login -> valid-gameweeks -> predictions/fixtures ->
+weekly-picks/submit -> weekly-picks/leaderboard. Users arrive over the
+window with a rate that rises linearly toward the deadline.
+
+Usage:
+    python -m loadtest.run --users 2000 --window 600 --max-concurrency 200
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+import httpx
+import numpy as np
+
+PASSWORD = "loadtest-password"
+
+
+class Recorder:
+    """Latencies and failures per route"""
+    
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+    
+    async def request(self, client: httpx.AsyncClient, route: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError as e:
+            self.latencies[route].append((time.perf_counter() - start) * 1000)
+            self.errors[route] += 1
+            self.statuses[route][type(e).__name__] += 1
+            return None
+        self.latencies[route].append((time.perf_counter() - start) * 1000)
+        self.statuses[route][response.status_code] += 1
+        if response.status_code >= 400:
+            self.errors[route] += 1
+        return response
+    
+    def summary(self, elapsed: float) -> Dict[str, Any]:
+        routes = {}
+        for route, samples in self.latencies.items():
+            values = np.array(samples)
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            routes[route] = {
+                "requests": len(values),
+                "errors": self.errors[route],
+                "p50_ms": round(float(p50), 1),
+                "p95_ms": round(float(p95), 1),
+                "p99_ms": round(float(p99), 1),
+                "max_ms": round(float(values.max()), 1),
+                "statuses": {str(k): v for k, v in self.statuses[route].items()},
+            }
+        total = sum(len(samples) for samples in self.latencies.values())
+        return {
+            "elapsed_s": round(elapsed, 1),
+            "requests": total,
+            "throughput_rps": round(total / elapsed, 1) if elapsed else 0,
+            "routes": routes,
+        }
+
+
+class Season:
+    """Fixtures and players to build submissions from (read once from the fake FPL API)"""
+    
+    def __init__(self, fake_fpl_url: str):
+        self.fake_fpl_url = fake_fpl_url.rstrip("/")
+        self.fixtures: Dict[int, List[Dict[str, Any]]] = {}
+        self.players_by_team: Dict[int, List[int]] = defaultdict(list)
+    
+    async def load(self, client: httpx.AsyncClient):
+        bootstrap = (await client.get(f"{self.fake_fpl_url}/api/bootstrap-static/")).json()
+        for player in bootstrap.get("elements", []):
+            self.players_by_team[player["team"]].append(player["id"])
+        for fixture in (await client.get(f"{self.fake_fpl_url}/api/fixtures/")).json():
+            self.fixtures.setdefault(fixture.get("event"), []).append(fixture)
+    
+    def submission(self, gameweek: int, rng: random.Random) -> Dict[str, Any]:
+        fixtures = rng.sample(self.fixtures.get(gameweek, []), 3)
+        return {
+            "scorePredictions": [
+                {
+                    "fixtureId": f["id"],
+                    "homeTeamId": f["team_h"],
+                    "awayTeamId": f["team_a"],
+                    "homeScore": rng.randint(0, 3),
+                    "awayScore": rng.randint(0, 3),
+                }
+                for f in fixtures
+            ],
+            "playerPicks": [
+                {"playerId": rng.choice(self.players_by_team[f["team_h"]]), "fixtureId": f["id"]}
+                for f in fixtures
+            ],
+        }
+
+
+def arrival_offsets(users: int, window: float, seed: int) -> List[float]:
+    """Start times in [0, window) with density rising linearly toward the deadline"""
+    rng = random.Random(seed)
+    return sorted(window * math.sqrt(rng.random()) for _ in range(users))
+
+
+def user_email(run_id: str, idx: int) -> str:
+    return f"loadtest+{run_id}-{idx}@example.com"
+
+
+async def register_users(client: httpx.AsyncClient, run_id: str, users: int, concurrency: int):
+    """Create the test accounts (not timed; existing accounts are reused)"""
+    semaphore = asyncio.Semaphore(concurrency)
+    
+    async def register(idx: int):
+        async with semaphore:
+            try:
+                response = await client.post("/api/auth/register", json={
+                    "email": user_email(run_id, idx),
+                    "username": f"loadtest-{run_id}-{idx}",
+                    "password": PASSWORD,
+                })
+            except httpx.HTTPError as e:
+                print(f"[Load Test] Register {idx} failed: {type(e).__name__}")
+                return
+            if response.status_code not in (200, 400):
+                print(f"[Load Test] Register {idx} failed: {response.status_code} {response.text[:200]}")
+    
+    await asyncio.gather(*(register(idx) for idx in range(users)))
+
+
+async def journey(
+    client: httpx.AsyncClient,
+    recorder: Recorder,
+    season: Season,
+    run_id: str,
+    idx: int,
+    rng: random.Random,
+):
+    """One user's deadline-rush session"""
+    response = await recorder.request(
+        client, "POST /auth/login", "POST", "/api/auth/login",
+        data={"username": user_email(run_id, idx), "password": PASSWORD},
+    )
+    if response is None or response.status_code != 200:
+        return
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+    
+    response = await recorder.request(
+        client, "GET /weekly-picks/valid-gameweeks", "GET", "/api/weekly-picks/valid-gameweeks", headers=headers,
+    )
+    valid = (response.json().get("valid_gameweeks") if response is not None and response.status_code == 200 else None) or []
+    if not valid:
+        return
+    # Rush for the upcoming deadline
+    gameweek = valid[-1]["gameweek"]
+    
+    await recorder.request(
+        client, "GET /predictions/fixtures", "GET", "/api/predictions/fixtures",
+        params={"gameweek": gameweek}, headers=headers,
+    )
+    await recorder.request(
+        client, "POST /weekly-picks/submit", "POST", "/api/weekly-picks/submit",
+        params={"gameweek": gameweek}, json=season.submission(gameweek, rng), headers=headers,
+    )
+    await recorder.request(
+        client, "GET /weekly-picks/leaderboard", "GET", "/api/weekly-picks/leaderboard",
+        params={"gameweek": valid[0]["gameweek"]}, headers=headers,
+    )
+
+
+async def run(args) -> Dict[str, Any]:
+    run_id = args.run_id or time.strftime("%Y%m%d%H%M%S")
+    limits = httpx.Limits(max_connections=args.max_concurrency, max_keepalive_connections=args.max_concurrency)
+    
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client, \
+            httpx.AsyncClient(timeout=30.0) as fake_client:
+        season = Season(args.fake_fpl_url)
+        await season.load(fake_client)
+        
+        if not args.run_id:
+            print(f"[Load Test] Registering {args.users} users (run {run_id})...")
+            await register_users(client, run_id, args.users, args.max_concurrency)
+        
+        # Count only upstream calls made during the timed phase
+        await fake_client.post(f"{season.fake_fpl_url}/__stats/reset")
+        
+        recorder = Recorder()
+        semaphore = asyncio.Semaphore(args.max_concurrency)
+        offsets = arrival_offsets(args.users, args.window, args.seed)
+        start = time.perf_counter()
+        
+        async def scheduled(idx: int, offset: float):
+            await asyncio.sleep(max(0.0, offset - (time.perf_counter() - start)))
+            async with semaphore:
+                await journey(client, recorder, season, run_id, idx, random.Random(args.seed + idx))
+        
+        print(f"[Load Test] Running {args.users} journeys over {args.window:.0f}s...")
+        await asyncio.gather(*(scheduled(idx, offset) for idx, offset in enumerate(offsets)))
+        elapsed = time.perf_counter() - start
+        
+        upstream = (await fake_client.get(f"{season.fake_fpl_url}/__stats")).json()
+    
+    summary = recorder.summary(elapsed)
+    summary["users"] = args.users
+    summary["upstream"] = upstream
+    return summary
+
+
+def print_report(summary: Dict[str, Any]):
+    print(f"\n{'='*96}")
+    print(f"Users: {summary['users']}  Requests: {summary['requests']}  "
+          f"Elapsed: {summary['elapsed_s']}s  Throughput: {summary['throughput_rps']} req/s")
+    print(f"{'='*96}")
+    print(f"{'Route':<36}{'Requests':>10}{'Errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for route, stats in summary["routes"].items():
+        print(f"{route:<36}{stats['requests']:>10}{stats['errors']:>8}"
+              f"{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['max_ms']:>10}")
+    print(f"\nUpstream FPL calls: {summary['upstream']['total']}")
+    for route, count in sorted(summary["upstream"]["requests"].items()):
+        print(f"  {route:<34}{count:>10}")
+    print(f"{'='*96}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Deadline-rush load test for weekly picks")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000", help="Backend under test")
+    parser.add_argument("--fake-fpl-url", default="http://127.0.0.1:8765", help="Running loadtest.fake_fpl")
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--window", type=float, default=60, help="Seconds over which users arrive")
+    parser.add_argument("--max-concurrency", type=int, default=100, help="Journeys in flight at once")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout (seconds)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--run-id", help="Reuse the accounts of an earlier run (skips registration)")
+    parser.add_argument("--json", type=Path, help="Also write the summary to this file")
+    args = parser.parse_args()
+    
+    summary = asyncio.run(run(args))
+    print_report(summary)
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2))
+        print(f"[Load Test] Summary written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""
+Export PL match data to the columnar match warehouse (one .npy per column)
+Usage: python scripts/export_match_warehouse.py --seasons 2023-2024 2024-2025 --out data/warehouse
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session, select
+from app.core.pl_database import pl_engine, create_pl_db_and_tables
+from app.models.pl_data import Match
+from app.services.match_warehouse import MatchWarehouse, DEFAULT_ROOT
+
+
+def main():
+    """Main function to export seasons"""
+    parser = argparse.ArgumentParser(description="Export match data to the columnar warehouse")
+    parser.add_argument("--seasons", nargs="*", help="Seasons to export (default: every season with matches)")
+    parser.add_argument("--out", default=str(DEFAULT_ROOT), help="Warehouse directory")
+    args = parser.parse_args()
+    
+    create_pl_db_and_tables()
+    warehouse = MatchWarehouse(Path(args.out))
+    
+    with Session(pl_engine) as session:
+        seasons = args.seasons or sorted(session.exec(select(Match.season).distinct()).all())
+        if not seasons:
+            print("Error: No matches found")
+            sys.exit(1)
+        
+        print(f"\n{'='*60}")
+        print(f"Exporting Match Warehouse: {', '.join(seasons)}")
+        print(f"{'='*60}\n")
+        
+        for season in seasons:
+            warehouse.export_season(session, season)
+    
+    # Report how long a load of everything exported takes
+    start = time.perf_counter()
+    tables = warehouse.load(seasons)
+    elapsed = (time.perf_counter() - start) * 1000
+    
+    print(f"\n{'='*60}")
+    print(f"Warehouse: {warehouse.root}")
+    for table, columns in tables.items():
+        print(f"  {table:<14}{len(columns['season']):>8} rows, {len(columns)} columns")
+    print(f"Loaded {len(seasons)} season(s) in {elapsed:.1f} ms")
+    print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -278,6 +278,7 @@ def main():
                     # Import using the service
                     match = import_service.import_match(session, transformed_data)
                     if match:
+                        import_service.record_file(session, match_file, match)
                         imported += 1
                         print(f"  ✓ Imported: {match_file.name}")
                     else:
@@ -1,6 +1,8 @@
 """
 Import scraped match data from JSON files into database
 Usage: python scripts/import_match_data.py --season 2025-2026 --data-dir data
+       python scripts/import_match_data.py --season 2025-2026 --bulk --batch-size 100
+       python scripts/import_match_data.py --season 2022-2023 --from-index
 """
 import argparse
 import sys
@@ -10,7 +12,7 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 # Import directly to avoid importing other services that may have dependencies
-from app.services.match_import_service import MatchImportService
+from app.services.match_import_service import MatchImportService, DEFAULT_BATCH_SIZE
 
 
 def main():
@@ -18,6 +20,10 @@ def main():
     parser = argparse.ArgumentParser(description="Import scraped match data into database")
     parser.add_argument("--season", required=True, help="Season (e.g., 2025-2026)")
     parser.add_argument("--data-dir", default="data", help="Data directory path (relative to backend/)")
+    parser.add_argument("--bulk", action="store_true", help="Set-based import with batched inserts (faster for full seasons)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Matches per transaction in bulk mode")
+    parser.add_argument("--from-index", action="store_true", help="Stream matches from <season>/index.json (implies --bulk)")
+    parser.add_argument("--workers", type=int, help="Parser processes in bulk mode (default: one per core)")
     args = parser.parse_args()
     
     # Resolve data directory path
@@ -40,7 +46,9 @@ def main():
     import_service = MatchImportService(season=args.season, data_dir=data_dir)
     
     # Run import
-    result = import_service.run()
+    result = import_service.run(
+        bulk=args.bulk, batch_size=args.batch_size, workers=args.workers, from_index=args.from_index
+    )
     
     # Print summary
     print(f"\n{'='*60}")
@@ -48,7 +56,11 @@ def main():
     print(f"{'='*60}")
     print(f"Total matches processed: {result['total']}")
     print(f"Successfully imported: {result['imported']}")
+    if 'unchanged' in result:
+        print(f"Unchanged since last import: {result['unchanged']}")
     print(f"Errors: {len(result['errors'])}")
+    if 'rows_per_sec' in result:
+        print(f"Rows written: {result['rows']} in {result['elapsed']}s ({result['rows_per_sec']} rows/s)")
     
     if result['errors']:
         print("\nErrors encountered:")
@@ -0,0 +1,35 @@
+"""
+Rebuild weekly picks season standings from the weekly_picks table
+Needed once for picks scored before weekly_picks_standings existed, or after
+editing totals outside the scoring engine.
+Usage: python scripts/rebuild_standings.py
+"""
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+from app.core.database import engine, create_db_and_tables
+from app.services.weekly_picks_standings import weekly_picks_standings_service
+
+
+def main():
+    """Main function to rebuild season standings"""
+    create_db_and_tables()
+    
+    with Session(engine) as session:
+        print(f"\n{'='*60}")
+        print("Rebuilding Weekly Picks Standings")
+        print(f"{'='*60}\n")
+        
+        total = weekly_picks_standings_service.rebuild(session)
+        
+        print(f"\n{'='*60}")
+        print(f"Standings rows written: {total}")
+        print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
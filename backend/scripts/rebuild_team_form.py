@@ -0,0 +1,47 @@
+"""
+Rebuild materialized team form snapshots from the matches table
+Needed once for seasons imported before team_form_snapshots existed.
+Usage: python scripts/rebuild_team_form.py --seasons 2023-2024 2024-2025
+"""
+import argparse
+import sys
+from pathlib import Path
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session, select
+from app.core.pl_database import pl_engine, create_pl_db_and_tables
+from app.models.pl_data import Match
+from app.services.team_form_service import team_form_service
+
+
+def main():
+    """Main function to rebuild team form snapshots"""
+    parser = argparse.ArgumentParser(description="Rebuild team form snapshots")
+    parser.add_argument("--seasons", nargs="*", help="Seasons to rebuild (default: every season with matches)")
+    args = parser.parse_args()
+    
+    create_pl_db_and_tables()
+    
+    with Session(pl_engine) as session:
+        seasons = args.seasons or sorted(session.exec(select(Match.season).distinct()).all())
+        if not seasons:
+            print("Error: No matches found")
+            sys.exit(1)
+        
+        print(f"\n{'='*60}")
+        print(f"Rebuilding Team Form Snapshots: {', '.join(seasons)}")
+        print(f"{'='*60}\n")
+        
+        total = 0
+        for season in seasons:
+            total += team_form_service.rebuild_season(session, season)
+        
+        print(f"\n{'='*60}")
+        print(f"Snapshots written: {total}")
+        print(f"{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Backtest the match prediction model against finished matches
+Usage: python scripts/run_backtest.py --seasons 2023-2024 2024-2025 [--workers 4]
+       python scripts/run_backtest.py --resume <run_id>
+"""
+import argparse
+import sys
+from pathlib import Path
+from uuid import UUID
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.pl_database import create_pl_db_and_tables
+from app.services.backtest_service import BacktestService
+
+
+def main():
+    """Main function to run (or resume) a backtest"""
+    parser = argparse.ArgumentParser(description="Backtest match predictions against finished results")
+    parser.add_argument("--seasons", nargs="+", help="Seasons to evaluate (e.g., 2023-2024 2024-2025)")
+    parser.add_argument("--resume", help="Resume an interrupted run by ID (skips completed seasons)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: CPU count)")
+    args = parser.parse_args()
+    
+    if not args.seasons and not args.resume:
+        parser.error("either --seasons or --resume is required")
+    
+    create_pl_db_and_tables()
+    service = BacktestService(workers=args.workers)
+    
+    if args.resume:
+        try:
+            run_id = UUID(args.resume)
+        except ValueError:
+            print(f"Error: Invalid run ID: {args.resume}")
+            sys.exit(1)
+    else:
+        run_id = service.create_run(args.seasons).id
+    
+    print(f"\n{'='*60}")
+    print(f"Backtest Run: {run_id}")
+    print(f"{'='*60}\n")
+    
+    try:
+        metrics = service.run(run_id)
+    except Exception as e:
+        print(f"Error: {e}")
+        print(f"Resume with: python scripts/run_backtest.py --resume {run_id}")
+        sys.exit(1)
+    
+    # Print summary
+    print(f"\n{'='*60}")
+    print("Backtest Summary")
+    print(f"{'='*60}")
+    for season, season_metrics in sorted(metrics['seasons'].items()):
+        print(f"{season}: {season_metrics}")
+    print(f"Overall: {metrics['overall']}")
+    print(f"\n{'='*60}\n")
+
+
+if __name__ == "__main__":
+    main()
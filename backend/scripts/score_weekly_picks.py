@@ -0,0 +1,58 @@
+"""
+Score every weekly pick for a gameweek against FPL fixture and live data
+Usage: python scripts/score_weekly_picks.py [--gameweek 12] [--watch 120]
+"""
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Optional
+
+# Add parent directory to path to import app modules
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session
+from app.core.database import engine
+from app.services.fpl_service import fpl_service
+from app.services.weekly_picks_scoring import weekly_picks_scoring_service
+
+
+async def run(gameweek: Optional[int], watch: int):
+    # Resolved here so the whole run shares one event loop (and fpl_service's client)
+    if not gameweek:
+        snapshot = await fpl_service.get_bootstrap_snapshot()
+        gameweek = snapshot.current_gameweek
+        if not gameweek:
+            print("Error: No current gameweek")
+            sys.exit(1)
+    
+    print(f"\n{'='*60}")
+    print(f"Scoring Weekly Picks: Gameweek {gameweek}")
+    print(f"{'='*60}\n")
+    
+    while True:
+        with Session(engine) as session:
+            summary = await weekly_picks_scoring_service.score_gameweek(session, gameweek)
+        print(f"GW{gameweek}: {summary['picks']} picks, updated "
+              f"{summary['score_predictions']} score predictions, "
+              f"{summary['player_picks']} player picks, {summary['totals']} totals")
+        if not watch:
+            return
+        await asyncio.sleep(watch)
+
+
+def main():
+    """Main function to score a gameweek"""
+    parser = argparse.ArgumentParser(description="Score weekly picks for a gameweek")
+    parser.add_argument("--gameweek", type=int, help="Gameweek to score (default: current)")
+    parser.add_argument("--watch", type=int, default=0, help="Re-score every N seconds while live (0 = once)")
+    args = parser.parse_args()
+    
+    try:
+        asyncio.run(run(args.gameweek, args.watch))
+    except KeyboardInterrupt:
+        print("\nStopped")
+
+
+if __name__ == "__main__":
+    main()
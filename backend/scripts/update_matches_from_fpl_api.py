@@ -32,9 +32,10 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.services.fpl_service import fpl_service
 from app.services.match_import_service import MatchImportService
+from app.services.team_form_service import team_form_service
 from app.core.pl_database import pl_engine, create_pl_db_and_tables
 from sqlmodel import Session, select
-from app.models.pl_data import Match, Team
+from app.models.pl_data import Match, Team, get_utc_now
 
 
 def get_current_season() -> str:
@@ -283,7 +284,11 @@ async def update_matches_from_fpl(
                         existing_match.score_home = match_data["match_info"]["home_score"]
                         existing_match.score_away = match_data["match_info"]["away_score"]
                         existing_match.status = match_data["match_info"]["status"]
+                        # Bump updated_at so Elo ledgers in running workers see the change
+                        existing_match.updated_at = get_utc_now()
                         session.add(existing_match)
+                        # Append or rebuild the teams' form snapshots (no-op if unchanged)
+                        team_form_service.record_match(session, existing_match)
                         session.commit()
                         updated += 1
                         print(f"[{i}/{len(fixtures)}] ✓ Updated: {home_team_name} vs {away_team_name} ({match_date})")